@@ -1,17 +1,27 @@
-from src.juego.contador_pintas import ContadorPintas
+from src.juego.contador_pintas import ContadorPintas, leer_pintas
 
 
 class ArbitroRonda:
     def __init__(self):
         self.contador = ContadorPintas()
         self.usar_ases_comodin = True  # Por defecto, ases son comodines
+        self.indice = None  # IndicePintas de la mesa, si el gestor lo mantiene
 
     def set_ases_comodin(self, valor: bool):
         self.usar_ases_comodin = valor
 
+    def set_indice(self, indice):
+        """Usa un IndicePintas de la mesa para contar sin recorrer los cachos."""
+        self.indice = indice
+
+    def _contar(self, cachos, pinta):
+        if self.indice is not None:
+            return self.indice.contar(pinta, ases_comodin=self.usar_ases_comodin)
+        return self.contador.contar(cachos, pinta, ases_comodin=self.usar_ases_comodin)
+
     def resolver_duda(self, cachos, jugada):
         _, pinta, cantidad = jugada
-        total = self.contador.contar(cachos, pinta, ases_comodin=self.usar_ases_comodin)
+        total = self._contar(cachos, pinta)
         if total >= cantidad:
             return "pierde_dudador"
         else:
@@ -19,10 +29,14 @@ class ArbitroRonda:
 
     def resolver_calzar(self, cachos, jugada):
         jugador_idx, pinta, cantidad = jugada
-        total = self.contador.contar(cachos, pinta, ases_comodin=self.usar_ases_comodin)
-        dados_en_juego = sum(len(c.get_pintas_de_dados() or []) for c in cachos)
+        total = self._contar(cachos, pinta)
+        if self.indice is not None:
+            dados_en_juego = self.indice.total
+            jugador_dados = cachos[jugador_idx].get_cantidad_dados()
+        else:
+            dados_en_juego = sum(len(leer_pintas(c) or ()) for c in cachos)
+            jugador_dados = len(leer_pintas(cachos[jugador_idx]) or ())
         total_dados = dados_en_juego
-        jugador_dados = len(cachos[jugador_idx].get_pintas_de_dados() or [])
         if not self.puede_calzar(total_dados, dados_en_juego, jugador_dados):
             return "no_se_puede_calzar"
         if total == cantidad:
@@ -1,55 +1,414 @@
-from src.juego.dado import Dado
+from abc import ABC, abstractmethod
 
+from src.juego.dado import PINTAS, Dado, Pinta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
 
-class Cacho:
-    def __init__(self, cantidad_dados=5):
+# Observador que ve todos los dados (el árbitro, el diario), sin importar
+# la máscara de visibilidad
+ARBITRO = -1
+
+
+class VisibilidadCacho(ABC):
+    """
+    Visibilidad de un cacho: la visibilidad general (set_visible) y la
+    máscara de observadores que ven los dados aunque estén ocultos, con las
+    vistas por observador que no cambian la visibilidad del cacho. Las
+    subclases entregan las pintas y el conteo con _calcular_pintas y
+    _calcular_conteo, y llaman a _invalidar_vistas cuando cambian los dados.
+    """
+
+    __slots__ = ("_visibilidad", "_mascara", "_vista", "_vista_conteo")
+
+    def _iniciar_visibilidad(self):
+        self._visibilidad = False
+        self._mascara = 0
+        self._invalidar_vistas()
+
+    def _invalidar_vistas(self):
+        self._vista = self._vista_conteo = None
+
+    @abstractmethod
+    def _calcular_pintas(self):
+        """Retorna la tupla con las pintas de los dados."""
+
+    @abstractmethod
+    def _calcular_conteo(self):
+        """Retorna la tupla con la cantidad de dados de cada pinta."""
+
+    def set_visible(self):
+        """Hace visibles las pintas de los dados."""
+        self._visibilidad = True
+
+    def set_oculto(self):
+        """Oculta las pintas de los dados."""
+        self._visibilidad = False
+
+    def get_visibilidad(self):
+        """Retorna el estado de visibilidad de los dados."""
+        return self._visibilidad
+
+    def get_mascara_visibilidad(self):
+        """
+        Retorna la máscara de observadores que ven los dados: el bit i
+        indica que el jugador i puede verlos.
+        """
+        return self._mascara
+
+    def set_mascara_visibilidad(self, mascara):
+        """Reemplaza la máscara de observadores que ven los dados."""
+        self._mascara = mascara
+
+    def mostrar_a(self, observador):
+        """Permite que el jugador `observador` vea los dados."""
+        self.set_mascara_visibilidad(self.get_mascara_visibilidad() | 1 << observador)
+
+    def ocultar_a(self, observador):
+        """Impide que el jugador `observador` vea los dados."""
+        self.set_mascara_visibilidad(
+            self.get_mascara_visibilidad() & ~(1 << observador)
+        )
+
+    def puede_ver(self, observador):
+        """Indica si `observador` (un jugador o ARBITRO) ve los dados."""
+        return (
+            observador == ARBITRO
+            or self.get_visibilidad()
+            or bool(self.get_mascara_visibilidad() >> observador & 1)
+        )
+
+    def pintas_para(self, observador):
+        """
+        Retorna las pintas de los dados vistas por `observador`, o None si
+        no puede verlas. No cambia la visibilidad del cacho: la tupla es
+        inmutable y se comparte entre lecturas hasta que cambian los dados,
+        así que muchos lectores pueden consultarla sin copiar el estado.
+        """
+        if not self.puede_ver(observador):
+            return None
+        vista = self._vista
+        if vista is None:
+            vista = self._vista = self._calcular_pintas()
+        return vista
+
+    def conteo_para(self, observador):
+        """
+        Retorna la cantidad de dados de cada pinta vista por `observador`,
+        o None si no puede verlos. Igual que pintas_para, no cambia la
+        visibilidad y la tupla se comparte hasta que cambian los dados.
+        """
+        if not self.puede_ver(observador):
+            return None
+        vista = self._vista_conteo
+        if vista is None:
+            vista = self._vista_conteo = self._calcular_conteo()
+        return vista
+
+
+class Cacho(VisibilidadCacho):
+    __slots__ = (
+        "max_cantidad_dados",
+        "__generador",
+        "__dados",
+        "__cantidad_dados",
+        "__observador",
+    )
+
+    def __init__(self, cantidad_dados=5, generador: GeneradorAleatorio = None):
         """
         Inicializa un cacho con una lista de dados.
         Por defecto se crean 5 dados.
+        Todos los dados del cacho usan el generador entregado o, si no se
+        entrega, uno propio del cacho.
         """
         self.max_cantidad_dados = cantidad_dados
-        self.__dados = [Dado() for _ in range(cantidad_dados)]
+        self.__generador = generador if generador is not None else GeneradorAleatorio()
+        self.__dados = [self.__nuevo_dado() for _ in range(cantidad_dados)]
         self.__cantidad_dados = len(self.__dados)
-        self.__visibilidad = False
+        self._iniciar_visibilidad()
+        self.__observador = None
 
     def get_pintas_de_dados(self):
         """
         Retorna la lista de pintas de los dados si la visibilidad está activada.
         """
-        if self.__visibilidad:
+        if self._visibilidad:
             return [dado.show() for dado in self.__dados]
         return None
 
+    def conteo_por_pinta(self):
+        """
+        Retorna una tupla con la cantidad de dados de cada pinta (índice
+        pinta.value - 1) si la visibilidad está activada.
+        """
+        if not self._visibilidad:
+            return None
+        return self.__conteo()
+
+    def __conteo(self):
+        conteo = [0] * len(PINTAS)
+        for dado in self.__dados:
+            conteo[dado.show().value - 1] += 1
+        return tuple(conteo)
+
+    def _calcular_pintas(self):
+        return tuple(dado.show() for dado in self.__dados)
+
+    def _calcular_conteo(self):
+        return self.__conteo()
+
+    def set_observador(self, observador):
+        """
+        Registra un observador (por ejemplo un IndicePintas) que recibe los
+        cambios de pintas del cacho con sumar/restar y sumar_conteo/restar_conteo.
+        """
+        self.__observador = observador
+        if observador is not None:
+            observador.sumar_conteo(self.__conteo())
+
+    def __nuevo_dado(self):
+        return Dado(self.__generador)
+
     def agitar(self):
         """Regenera los valores de todos los dados."""
-        self.__dados = [Dado() for _ in range(self.__cantidad_dados)]
+        if self.__observador is not None:
+            self.__observador.restar_conteo(self.__conteo())
+        self.__dados = [self.__nuevo_dado() for _ in range(self.__cantidad_dados)]
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(self.__conteo())
 
-    def get_cantidad_dados(self):
-        """Retorna la cantidad de dados en el cacho."""
-        return self.__cantidad_dados
+    def cargar_caras(self, caras):
+        """
+        Reemplaza los dados por las caras entregadas (índices de 0 a 5),
+        por ejemplo generadas en bloque para toda la mesa.
+        """
+        if len(caras) > self.max_cantidad_dados:
+            raise ValueError("Hay más caras que el máximo de dados del cacho")
+        if self.__observador is not None:
+            self.__observador.restar_conteo(self.__conteo())
+        self.__dados = [Dado.desde_pinta(PINTAS[cara]) for cara in caras]
+        self.__cantidad_dados = len(self.__dados)
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(self.__conteo())
 
-    def set_visible(self):
-        """Hace visibles las pintas de los dados."""
-        self.__visibilidad = True
+    def estado(self):
+        """
+        Retorna un registro inmutable de los dados, la visibilidad y la
+        máscara de observadores para volver a él con restaurar. Los Dado no
+        cambian, así que se comparten.
+        """
+        return (tuple(self.__dados), self._visibilidad, self._mascara)
 
-    def set_oculto(self):
-        """Oculta las pintas de los dados."""
-        self.__visibilidad = False
+    def restaurar(self, estado):
+        """Vuelve al estado entregado por `estado`."""
+        dados, self._visibilidad, self._mascara = estado
+        dados = list(dados)
+        # Los Dado se comparan por identidad: si son los mismos no hay cambios
+        if dados == self.__dados:
+            return
+        if self.__observador is not None:
+            self.__observador.restar_conteo(self.__conteo())
+        self.__dados = dados
+        self.__cantidad_dados = len(dados)
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(self.__conteo())
 
-    def get_visibilidad(self):
-        """Retorna el estado de visibilidad de los dados."""
-        return self.__visibilidad
+    def clonar(self, generador: GeneradorAleatorio = None):
+        """
+        Retorna un Cacho independiente en el mismo estado que usa
+        `generador` para sus dados nuevos. El observador no se copia.
+        """
+        copia = Cacho(self.max_cantidad_dados, generador)
+        copia.restaurar(self.estado())
+        return copia
+
+    def get_cantidad_dados(self):
+        """Retorna la cantidad de dados en el cacho."""
+        return self.__cantidad_dados
 
     def agregar_dado(self, dado=None):
         """Agrega un dado al cacho."""
         if dado is None:
-            dado = Dado()
+            dado = self.__nuevo_dado()
         if self.__cantidad_dados < self.max_cantidad_dados:
             self.__dados.append(dado)
             self.__cantidad_dados = len(self.__dados)
+            self._invalidar_vistas()
+            if self.__observador is not None:
+                self.__observador.sumar(dado.show().value - 1)
 
     def eliminar_dado(self):
         """Elimina el último dado si hay al menos uno."""
         if self.__cantidad_dados > 0:
-            self.__dados.pop()
+            dado = self.__dados.pop()
             self.__cantidad_dados = len(self.__dados)
+            self._invalidar_vistas()
+            if self.__observador is not None:
+                self.__observador.restar(dado.show().value - 1)
+
+
+class CachoCompacto(VisibilidadCacho):
+    """
+    Cacho con la misma interfaz pública que Cacho, pero que guarda solo la
+    cantidad de dados de cada pinta en un bytearray de 6 posiciones.
+    El orden de los dados no se conserva: get_pintas_de_dados los entrega
+    ordenados por pinta y eliminar_dado quita un dado de la pinta más alta.
+    """
+
+    __slots__ = (
+        "max_cantidad_dados",
+        "__generador",
+        "__conteo",
+        "__cantidad_dados",
+        "__observador",
+    )
+
+    def __init__(self, cantidad_dados=5, generador: GeneradorAleatorio = None):
+        self.max_cantidad_dados = cantidad_dados
+        self.__generador = generador if generador is not None else GeneradorAleatorio()
+        self.__conteo = bytearray(len(PINTAS))
+        self.__cantidad_dados = cantidad_dados
+        self._iniciar_visibilidad()
+        self.__observador = None
+        self.agitar()
+
+    def __lanzar(self):
+        """Retorna el índice (0 a 5) de la pinta de un dado nuevo."""
+        valor = self.__generador.generar_entero(0, len(PINTAS) - 1)
+        return valor.value - 1 if isinstance(valor, Pinta) else valor
+
+    def get_pintas_de_dados(self):
+        """
+        Retorna la lista de pintas de los dados si la visibilidad está activada.
+        """
+        if not self._visibilidad:
+            return None
+        return list(self.__pintas())
+
+    def __pintas(self):
+        pintas = []
+        for indice, cantidad in enumerate(self.__conteo):
+            pintas.extend([PINTAS[indice]] * cantidad)
+        return tuple(pintas)
+
+    def conteo_por_pinta(self):
+        """
+        Retorna una tupla con la cantidad de dados de cada pinta (índice
+        pinta.value - 1) si la visibilidad está activada.
+        """
+        if not self._visibilidad:
+            return None
+        return tuple(self.__conteo)
+
+    def _calcular_pintas(self):
+        return self.__pintas()
+
+    def _calcular_conteo(self):
+        return tuple(self.__conteo)
+
+    def set_observador(self, observador):
+        """
+        Registra un observador (por ejemplo un IndicePintas) que recibe los
+        cambios de pintas del cacho con sumar/restar y sumar_conteo/restar_conteo.
+        """
+        self.__observador = observador
+        if observador is not None:
+            observador.sumar_conteo(self.__conteo)
+
+    def agitar(self):
+        """Regenera los valores de todos los dados."""
+        conteo = self.__conteo
+        if self.__observador is not None:
+            self.__observador.restar_conteo(conteo)
+        conteo[:] = bytes(len(PINTAS))
+        for _ in range(self.__cantidad_dados):
+            conteo[self.__lanzar()] += 1
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(conteo)
+
+    def cargar_caras(self, caras):
+        """
+        Reemplaza los dados por las caras entregadas (índices de 0 a 5),
+        por ejemplo generadas en bloque para toda la mesa.
+        """
+        if len(caras) > self.max_cantidad_dados:
+            raise ValueError("Hay más caras que el máximo de dados del cacho")
+        conteo = self.__conteo
+        if self.__observador is not None:
+            self.__observador.restar_conteo(conteo)
+        conteo[:] = bytes(len(PINTAS))
+        for cara in caras:
+            conteo[cara] += 1
+        self.__cantidad_dados = len(caras)
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(conteo)
+
+    def estado(self):
+        """
+        Retorna un registro inmutable del conteo por pinta, la visibilidad
+        y la máscara de observadores para volver a él con restaurar.
+        """
+        return (
+            bytes(self.__conteo),
+            self.__cantidad_dados,
+            self._visibilidad,
+            self._mascara,
+        )
+
+    def restaurar(self, estado):
+        """Vuelve al estado entregado por `estado`."""
+        (
+            conteo_guardado,
+            self.__cantidad_dados,
+            self._visibilidad,
+            self._mascara,
+        ) = estado
+        conteo = self.__conteo
+        if conteo == conteo_guardado:
+            return
+        self._invalidar_vistas()
+        if self.__observador is not None:
+            self.__observador.restar_conteo(conteo)
+        conteo[:] = conteo_guardado
+        if self.__observador is not None:
+            self.__observador.sumar_conteo(conteo)
+
+    def clonar(self, generador: GeneradorAleatorio = None):
+        """
+        Retorna un CachoCompacto independiente en el mismo estado que usa
+        `generador` para sus dados nuevos. El observador no se copia.
+        """
+        copia = CachoCompacto(self.max_cantidad_dados, generador)
+        copia.restaurar(self.estado())
+        return copia
+
+    def get_cantidad_dados(self):
+        """Retorna la cantidad de dados en el cacho."""
+        return self.__cantidad_dados
+
+    def agregar_dado(self, dado=None):
+        """Agrega un dado al cacho."""
+        indice = self.__lanzar() if dado is None else dado.show().value - 1
+        if self.__cantidad_dados < self.max_cantidad_dados:
+            self.__conteo[indice] += 1
+            self.__cantidad_dados += 1
+            self._invalidar_vistas()
+            if self.__observador is not None:
+                self.__observador.sumar(indice)
+
+    def eliminar_dado(self):
+        """Elimina un dado de la pinta más alta si hay al menos uno."""
+        if self.__cantidad_dados > 0:
+            conteo = self.__conteo
+            indice = len(conteo) - 1
+            while conteo[indice] == 0:
+                indice -= 1
+            conteo[indice] -= 1
+            self.__cantidad_dados -= 1
+            self._invalidar_vistas()
+            if self.__observador is not None:
+                self.__observador.restar(indice)
@@ -1,15 +1,24 @@
+from src.juego.cacho import ARBITRO
 from src.juego.dado import Pinta
 
 
+def leer_pintas(cacho, observador=ARBITRO):
+    """
+    Retorna las pintas del cacho vistas por `observador` (por defecto el
+    árbitro, que ve todo) sin cambiar su visibilidad. Los cachos sin vistas
+    por observador se leen con get_pintas_de_dados.
+    """
+    pintas_para = getattr(type(cacho), "pintas_para", None)
+    if pintas_para is None:
+        return cacho.get_pintas_de_dados()
+    return pintas_para(cacho, observador)
+
+
 class ContadorPintas:
     def contar(self, cachos, pinta_objetivo, ases_comodin=True):
         dados = []
         for cacho in cachos:
-            pintas = cacho.get_pintas_de_dados()
-            if pintas is None:
-                if hasattr(cacho, "set_visible"):
-                    cacho.set_visible()
-                    pintas = cacho.get_pintas_de_dados()
+            pintas = leer_pintas(cacho)
             if pintas:
                 dados.extend(pintas)
         # Contar pintas
@@ -17,3 +26,47 @@ class ContadorPintas:
             return sum(1 for p in dados if p == pinta_objetivo or p == Pinta.AS)
         else:
             return sum(1 for p in dados if p == pinta_objetivo)
+
+
+class IndicePintas:
+    """
+    Histograma de pintas de toda la mesa. Los cachos registrados lo
+    mantienen al día al agitarse y al ganar o perder dados, por lo que
+    contar una pinta cuesta O(1) en lugar de recorrer todos los dados.
+    """
+
+    __slots__ = ("conteo", "total")
+
+    def __init__(self, cachos=()):
+        self.conteo = [0] * len(Pinta)
+        self.total = 0
+        for cacho in cachos:
+            self.registrar(cacho)
+
+    def registrar(self, cacho):
+        """Suma los dados del cacho y se suscribe a sus cambios."""
+        cacho.set_observador(self)
+
+    def sumar(self, indice):
+        self.conteo[indice] += 1
+        self.total += 1
+
+    def restar(self, indice):
+        self.conteo[indice] -= 1
+        self.total -= 1
+
+    def sumar_conteo(self, conteo):
+        for indice, cantidad in enumerate(conteo):
+            self.conteo[indice] += cantidad
+            self.total += cantidad
+
+    def restar_conteo(self, conteo):
+        for indice, cantidad in enumerate(conteo):
+            self.conteo[indice] -= cantidad
+            self.total -= cantidad
+
+    def contar(self, pinta_objetivo, ases_comodin=True):
+        cantidad = self.conteo[pinta_objetivo.value - 1]
+        if ases_comodin and pinta_objetivo != Pinta.AS:
+            cantidad += self.conteo[Pinta.AS.value - 1]
+        return cantidad
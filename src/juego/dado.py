@@ -2,6 +2,7 @@
 Módulo que contiene las clases Dado y Pinta para el juego Dudo Chileno.
 """
 
+import os
 from enum import Enum
 
 from src.servicios.generador_aleatorio import GeneradorAleatorio
@@ -21,16 +22,50 @@ class Pinta(Enum):
     SEXTO = 6
 
 
+# Tupla precalculada para convertir índices en pintas sin reconstruir list(Pinta)
+PINTAS = tuple(Pinta)
+
+# Generador de los Dado creados sin uno; se crea al primer uso y cada proceso
+# hijo crea el suyo, para que no repitan los dados del proceso padre
+_generador_por_defecto = None
+
+
+def _generador_compartido():
+    global _generador_por_defecto
+    if _generador_por_defecto is None:
+        _generador_por_defecto = GeneradorAleatorio()
+    return _generador_por_defecto
+
+
+def _olvidar_generador():
+    global _generador_por_defecto
+    _generador_por_defecto = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_olvidar_generador)
+
+
 class Dado:
-    def __init__(self, generador: GeneradorAleatorio = GeneradorAleatorio()):
+    def __init__(self, generador: GeneradorAleatorio = None):
         """
         Inicializa un dado con una pinta aleatoria.
         Usa generar_entero para elegir un índice en Pinta.
+        Sin generador se usa uno compartido por el módulo, que no tiene
+        semilla: para partidas reproducibles hay que entregar uno.
         """
-        pintas = list(Pinta)
-        valor = generador.generar_entero(0, len(pintas) - 1)
+        if generador is None:
+            generador = _generador_compartido()
+        valor = generador.generar_entero(0, len(PINTAS) - 1)
         # si valor es un Enum, lo usamos; si es int, lo convertimos a Pinta
-        self.__pinta = valor if isinstance(valor, Pinta) else pintas[valor]
+        self.__pinta = valor if isinstance(valor, Pinta) else PINTAS[valor]
+
+    @classmethod
+    def desde_pinta(cls, pinta: Pinta):
+        """Crea un dado con una pinta ya conocida, sin usar el generador."""
+        dado = cls.__new__(cls)
+        dado.__pinta = pinta
+        return dado
 
     def show(self):
         """
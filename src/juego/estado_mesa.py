@@ -0,0 +1,87 @@
+"""
+Módulo con el estado de la mesa guardado en arreglos planos por asiento.
+
+En lugar de recorrer los jugadores después de cada acción, GestorPartida
+mantiene aquí la cantidad de dados de cada asiento, sus dados a favor, una
+máscara de bits con los asientos activos y cuántos asientos tienen un solo
+dado, de modo que sus consultas cuestan O(1) sin importar cuántos jugadores
+haya en la mesa.
+"""
+
+
+class EstadoMesa:
+    __slots__ = ("dados", "dados_a_favor", "activos", "con_un_dado")
+
+    def __init__(self, dados):
+        """Sienta a un jugador activo por cada cantidad de dados entregada."""
+        self.dados = list(dados)
+        self.dados_a_favor = [0] * len(self.dados)
+        self.activos = (1 << len(self.dados)) - 1  # bit i: el asiento i juega
+        self.con_un_dado = sum(1 for cantidad in self.dados if cantidad == 1)
+
+    def cambiar_dados(self, asiento, diferencia):
+        """Suma `diferencia` a los dados del asiento."""
+        antes = self.dados[asiento]
+        despues = antes + diferencia
+        self.dados[asiento] = despues
+        self.con_un_dado += (despues == 1) - (antes == 1)
+
+    def set_dados(self, asiento, cantidad):
+        self.cambiar_dados(asiento, cantidad - self.dados[asiento])
+
+    def es_activo(self, asiento):
+        return bool(self.activos >> asiento & 1)
+
+    def set_activo(self, asiento, activo):
+        if activo:
+            self.activos |= 1 << asiento
+        else:
+            self.activos &= ~(1 << asiento)
+
+    def cantidad_activos(self):
+        return bin(self.activos).count("1")
+
+    def asientos_activos(self):
+        """Retorna la lista de asientos activos, en orden."""
+        activos = self.activos
+        return [i for i in range(len(self.dados)) if activos >> i & 1]
+
+    def primer_activo(self):
+        """Retorna el asiento activo más bajo, o None si no hay ninguno."""
+        activos = self.activos
+        return (activos & -activos).bit_length() - 1 if activos else None
+
+
+class ObservadorAsiento:
+    """
+    Observador de un cacho (ver Cacho.set_observador) que mantiene al día
+    la cantidad de dados de su asiento en un EstadoMesa y reenvía los
+    cambios de pintas al observador siguiente (por ejemplo IndicePintas).
+    """
+
+    __slots__ = ("estado", "asiento", "siguiente")
+
+    def __init__(self, estado, asiento, siguiente=None):
+        self.estado = estado
+        self.asiento = asiento
+        self.siguiente = siguiente
+
+    def sumar(self, indice):
+        self.estado.cambiar_dados(self.asiento, 1)
+        if self.siguiente is not None:
+            self.siguiente.sumar(indice)
+
+    def restar(self, indice):
+        self.estado.cambiar_dados(self.asiento, -1)
+        if self.siguiente is not None:
+            self.siguiente.restar(indice)
+
+    def sumar_conteo(self, conteo):
+        self.estado.cambiar_dados(self.asiento, sum(conteo))
+        if self.siguiente is not None:
+            self.siguiente.sumar_conteo(conteo)
+
+    def restar_conteo(self, conteo):
+        self.estado.cambiar_dados(self.asiento, -sum(conteo))
+        if self.siguiente is not None:
+            self.siguiente.restar_conteo(conteo)
@@ -1,62 +1,283 @@
 from src.juego.arbitro_ronda import ArbitroRonda
-from src.juego.cacho import Cacho
+from src.juego.cacho import ARBITRO, Cacho, CachoCompacto
+from src.juego.contador_pintas import IndicePintas, leer_pintas
 from src.juego.dado import Pinta
+from src.juego.estado_mesa import EstadoMesa, ObservadorAsiento
+from src.juego.observacion import construir_observacion
+from src.juego.turnos import HORARIO, AnilloTurnos
 from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.servicios import diario as eventos
+from src.servicios import metricas as medicion
 from src.servicios.generador_aleatorio import GeneradorAleatorio
 
 
 class Jugador:
-    def __init__(self, nombre):
+    """
+    Asiento de la mesa. Los dados a favor y si sigue activo se guardan en
+    el EstadoMesa del gestor; estas propiedades solo los leen y escriben.
+    """
+
+    def __init__(self, nombre, cacho=None, generador=None, estado=None, asiento=0):
         self.nombre = nombre
-        self.cacho = Cacho()
-        self.dados_a_favor = 0
-        self.activo = True
+        self.cacho = cacho if cacho is not None else Cacho(generador=generador)
+        if estado is None:
+            estado = EstadoMesa([self.cacho.get_cantidad_dados()])
+        self._estado = estado
+        self._asiento = asiento
+
+    @property
+    def dados_a_favor(self):
+        return self._estado.dados_a_favor[self._asiento]
+
+    @dados_a_favor.setter
+    def dados_a_favor(self, valor):
+        self._estado.dados_a_favor[self._asiento] = valor
+
+    @property
+    def activo(self):
+        return self._estado.es_activo(self._asiento)
+
+    @activo.setter
+    def activo(self, valor):
+        self._estado.set_activo(self._asiento, valor)
 
 
 class GestorPartida:
-    def __init__(self, num_jugadores=3, dados_por_jugador=5):
-        self.jugadores = [Jugador(f"Jugador {i + 1}") for i in range(num_jugadores)]
+    def __init__(
+        self,
+        num_jugadores=3,
+        dados_por_jugador=5,
+        cachos=None,
+        generador=None,
+        compacto=False,
+    ):
+        # Con un generador con semilla toda la partida es reproducible
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        # Se pueden entregar cachos ya creados (por ejemplo vistas de MesaDados)
+        if cachos is None and compacto:
+            cachos = [
+                CachoCompacto(generador=self.generador) for _ in range(num_jugadores)
+            ]
+        elif cachos is None:
+            cachos = [Cacho(generador=self.generador) for _ in range(num_jugadores)]
+        self._cachos = list(cachos[:num_jugadores])
         # Ajustar la cantidad de dados si es diferente a 5
         if dados_por_jugador != 5:
-            for jugador in self.jugadores:
+            for cacho in self._cachos:
                 # Quitar dados extras o agregar dados faltantes
-                while jugador.cacho.get_cantidad_dados() > dados_por_jugador:
-                    jugador.cacho.eliminar_dado()
-                while jugador.cacho.get_cantidad_dados() < dados_por_jugador:
-                    jugador.cacho.agregar_dado()
+                while cacho.get_cantidad_dados() > dados_por_jugador:
+                    cacho.eliminar_dado()
+                while cacho.get_cantidad_dados() < dados_por_jugador:
+                    cacho.agregar_dado()
+        # Si los cachos notifican sus cambios, los observadores de cada
+        # asiento mantienen el estado de la mesa y el histograma de pintas;
+        # si no, quitar_dado y agregar_dado leen la cantidad del cacho. Se
+        # revisa el tipo, como en leer_pintas, para que un Mock no pase
+        self._cachos_observados = all(
+            getattr(type(cacho), "set_observador", None) is not None
+            for cacho in self._cachos
+        )
+        self.estado_mesa = EstadoMesa(
+            [cacho.get_cantidad_dados() for cacho in self._cachos]
+        )
+        # Dados con que empieza cada jugador, para el inicio del diario
+        self.dados_por_jugador = self.estado_mesa.dados[0] if self._cachos else 0
+        self.jugadores = [
+            Jugador(f"Jugador {i + 1}", cacho, estado=self.estado_mesa, asiento=i)
+            for i, cacho in enumerate(self._cachos)
+        ]
         self.arbitro = ArbitroRonda()
+        self.indice_pintas = None
+        if self._cachos_observados:
+            self.indice_pintas = IndicePintas()
+            for i, cacho in enumerate(self._cachos):
+                cacho.set_observador(
+                    ObservadorAsiento(self.estado_mesa, i, self.indice_pintas)
+                )
+                # set_observador vuelve a sumar los dados que ya tiene el cacho
+                self.estado_mesa.set_dados(i, cacho.get_cantidad_dados())
+            self.arbitro.set_indice(self.indice_pintas)
         self.ultima_apuesta = None
         self.num_jugadores = num_jugadores
-        self.jugador_actual = 0
-        self.generador = GeneradorAleatorio()
+        self.turnos = AnilloTurnos(self.estado_mesa)
+        self.jugador_ultima_apuesta = None
+        self.historial_apuestas = []  # (jugador, apuesta) de la ronda actual
+        self.agentes = None
         self.ronda_actual = 0
+        self.diario = None
+        self.metricas = None
+        self._instrumentacion = None
+        # Ronda especial "obligar" (reglas.txt): (jugador, abierta) o None
+        self.ronda_obligada = None
+        self.pueden_obligar = set()
+        # Quienes ya quedaron con un dado alguna vez no pueden volver a obligar
+        self._tuvieron_un_dado = set(self.jugadores_con_un_dado())
+        self._mostrar_dados_propios()
+
+    def set_diario(self, diario):
+        """
+        Registra desde ahora los eventos de la partida en un EscritorDiario
+        (ver src.servicios.diario). Se anota el inicio de la partida y los
+        dados de la ronda en curso.
+        """
+        self.diario = diario
+        if diario is not None:
+            diario.iniciar_partida(self.num_jugadores, self.dados_por_jugador)
+            self._registrar_ronda()
+
+    def set_metricas(self, metricas):
+        """
+        Registra desde ahora conteos y tiempos de las acciones en un
+        Metricas (ver src.servicios.metricas), reemplazando métodos de esta
+        instancia por versiones medidas. Con None se restauran los métodos
+        originales, así que un gestor sin métricas no paga ningún costo.
+        """
+        if self._instrumentacion is not None:
+            medicion.quitar(self._instrumentacion)
+            self._instrumentacion = None
+        self.metricas = metricas
+        if metricas is not None:
+            self._instrumentacion = medicion.instrumentar(self, metricas)
+
+    def _registrar_ronda(self):
+        diario = self.diario
+        ronda = self.ronda_actual
+        activos = self.jugadores_activos()
+        diario.registrar(eventos.INICIO_RONDA, ronda, cantidad=len(activos))
+        for i in activos:
+            # El diario registra todos los dados, aunque estén ocultos
+            pintas = leer_pintas(self.jugadores[i].cacho, ARBITRO)
+            caras = [pinta.value - 1 for pinta in pintas]
+            diario.registrar(
+                eventos.DADOS,
+                ronda,
+                i,
+                cantidad=len(caras),
+                datos=eventos.empaquetar_caras(caras),
+            )
+
+    def snapshot(self):
+        """
+        Retorna un registro inmutable y compacto del estado de la partida
+        (dados y su visibilidad, dados a favor, jugadores activos, apuestas
+        de la ronda, turno, regla de ases y estado de "obligar") para volver
+        a él con restore.
+        """
+        return (
+            tuple(cacho.estado() for cacho in self._cachos),
+            tuple(self.estado_mesa.dados_a_favor),
+            self.estado_mesa.activos,
+            self.ultima_apuesta,
+            self.jugador_ultima_apuesta,
+            tuple(self.historial_apuestas),
+            self.jugador_actual,
+            self.turnos.sentido,
+            self.ronda_actual,
+            self.arbitro.usar_ases_comodin,
+            self.ronda_obligada,
+            frozenset(self.pueden_obligar),
+            frozenset(self._tuvieron_un_dado),
+        )
+
+    def restore(self, estado):
+        """Vuelve al estado entregado por snapshot."""
+        (
+            cachos,
+            dados_a_favor,
+            activos,
+            self.ultima_apuesta,
+            self.jugador_ultima_apuesta,
+            historial,
+            self.jugador_actual,
+            self.turnos.sentido,
+            self.ronda_actual,
+            ases_comodin,
+            self.ronda_obligada,
+            pueden_obligar,
+            tuvieron_un_dado,
+        ) = estado
+        for cacho, guardado in zip(self._cachos, cachos):
+            cacho.restaurar(guardado)
+        if not self._cachos_observados:
+            # Sin observadores la cantidad de dados se lee de cada cacho
+            for i, cacho in enumerate(self._cachos):
+                self.estado_mesa.set_dados(i, cacho.get_cantidad_dados())
+        self.estado_mesa.dados_a_favor[:] = dados_a_favor
+        # El anillo de turnos se ajusta solo a los cambios de activos
+        self.estado_mesa.activos = activos
+        self.historial_apuestas = list(historial)
+        self.arbitro.set_ases_comodin(ases_comodin)
+        self.pueden_obligar = set(pueden_obligar)
+        self._tuvieron_un_dado = set(tuvieron_un_dado)
+
+    def clone(self):
+        """
+        Retorna un gestor independiente en el mismo estado, con copias de
+        los cachos (ver Cacho.clonar) y un generador hijo del actual. Los
+        agentes se comparten y ni el diario ni las métricas se copian.
+        """
+        generador = self.generador.spawn(1)[0]
+        copia = GestorPartida(
+            num_jugadores=self.num_jugadores,
+            cachos=[cacho.clonar(generador) for cacho in self.cachos],
+            generador=generador,
+        )
+        for original, jugador in zip(self.jugadores, copia.jugadores):
+            jugador.nombre = original.nombre
+        copia.agentes = self.agentes
+        copia.dados_por_jugador = self.dados_por_jugador
+        copia.restore(self.snapshot())
+        return copia
 
     @property
     def cachos(self):
-        """Retorna una lista de los cachos de todos los jugadores"""
-        return [jugador.cacho for jugador in self.jugadores]
+        """Retorna la lista (compartida, no modificar) de los cachos de la mesa"""
+        return self._cachos
 
     def elegir_accion(self, jugador, accion):
         tipo = accion.get("tipo")
         resultado = {}
         if tipo == "apuesta":
             apuesta = accion["apuesta"]
-            valida = ValidadorApuesta.es_valida(
-                self.ultima_apuesta,
-                apuesta,
-                self.jugadores[jugador].cacho.get_cantidad_dados(),
-            )
+            cantidad_dados = self.estado_mesa.dados[jugador]
+            if self.ronda_obligada is None:
+                valida = ValidadorApuesta.es_valida(
+                    self.ultima_apuesta, apuesta, cantidad_dados
+                )
+            else:
+                valida = self._es_valida_obligada(apuesta, cantidad_dados)
             if valida:
                 self.ultima_apuesta = apuesta
+                self.jugador_ultima_apuesta = jugador
+                self.historial_apuestas.append((jugador, apuesta))
             resultado["valida"] = valida
+            if self.diario is not None:
+                self.diario.registrar(
+                    eventos.APUESTA,
+                    self.ronda_actual,
+                    jugador,
+                    apuesta.get_cantidad(),
+                    apuesta.get_pinta().value,
+                    int(valida),
+                )
         elif tipo == "dudar":
-            idx_apostador = (jugador - 1) % self.num_jugadores
+            idx_apostador = self.jugador_ultima_apuesta
+            if idx_apostador is None:
+                idx_apostador = (jugador - 1) % self.num_jugadores
             pinta = self.ultima_apuesta.get_pinta()
             cantidad = self.ultima_apuesta.get_cantidad()
             res = self.arbitro.resolver_duda(
                 self.cachos, (idx_apostador, pinta, cantidad)
             )
             resultado["resultado"] = res
+            if self.diario is not None:
+                self.diario.registrar(
+                    eventos.DUDA,
+                    self.ronda_actual,
+                    jugador,
+                    detalle=eventos.CODIGO_RESULTADO[res],
+                    datos=idx_apostador,
+                )
             if res == "pierde_dudador":
                 self.quitar_dado(jugador)
             else:
@@ -68,6 +289,13 @@ class GestorPartida:
             cantidad = self.ultima_apuesta.get_cantidad()
             res = self.arbitro.resolver_calzar(self.cachos, (jugador, pinta, cantidad))
             resultado["resultado"] = res
+            if self.diario is not None:
+                self.diario.registrar(
+                    eventos.CALZAR,
+                    self.ronda_actual,
+                    jugador,
+                    detalle=eventos.CODIGO_RESULTADO[res],
+                )
             if res == "gana_calzador":
                 self.agregar_dado(jugador)
             elif res == "pierde_calzador":
@@ -79,46 +307,115 @@ class GestorPartida:
             self._actualizar_regla_especial()
         return resultado
 
+    def _es_valida_obligada(self, apuesta, cantidad_dados):
+        """
+        Validación de apuestas en una ronda "obligada": los ases son una
+        pinta más (se puede partir con ellos) y la pinta de la apertura no
+        cambia, salvo que quien apuesta también tenga un solo dado, en cuyo
+        caso puede cambiarla subiendo la cantidad.
+        """
+        anterior = self.ultima_apuesta
+        if cantidad_dados < 1:
+            return False
+        if anterior is None:
+            return True
+        if apuesta.get_cantidad() <= anterior.get_cantidad():
+            return False
+        return apuesta.get_pinta() == anterior.get_pinta() or cantidad_dados == 1
+
+    def puede_obligar(self, jugador):
+        """
+        Indica si el jugador puede "obligar" (reglas.txt): acaba de quedar
+        por primera vez con un dado y la ronda todavía no tiene apuestas.
+        """
+        return (
+            jugador in self.pueden_obligar
+            and self.ultima_apuesta is None
+            and self.ronda_obligada is None
+        )
+
+    def obligar(self, jugador, abierta):
+        """
+        Inicia la ronda especial de un dado. En una ronda abierta cada
+        jugador ve los dados de los demás pero no los suyos; en una cerrada
+        solo quien obliga ve su dado. Los ases no son comodines porque el
+        jugador tiene un solo dado. Retorna False si no se puede obligar.
+        """
+        if not self.puede_obligar(jugador):
+            return False
+        self.pueden_obligar.discard(jugador)
+        self.ronda_obligada = (jugador, abierta)
+        self.arbitro.set_ases_comodin(False)
+        todos = (1 << self.num_jugadores) - 1
+        for i, cacho in enumerate(self.cachos):
+            if abierta:
+                mascara = todos & ~(1 << i)
+            else:
+                mascara = 1 << i if i == jugador else 0
+            cacho.set_mascara_visibilidad(mascara)
+        if self.diario is not None:
+            self.diario.registrar(
+                eventos.OBLIGAR, self.ronda_actual, jugador, detalle=int(abierta)
+            )
+        return True
+
+    def _mostrar_dados_propios(self):
+        # Visibilidad normal: cada jugador ve solo sus propios dados
+        for i, cacho in enumerate(self.cachos):
+            if hasattr(cacho, "set_mascara_visibilidad"):
+                cacho.set_mascara_visibilidad(1 << i)
+
     def _debe_actualizar_regla_especial(self):
-        # Solo actualiza si hay cambio en la cantidad de dados de algún jugador
-        # o si la condición de tener un dado cambia
-        jugadores_con_un_dado = [
-            cacho.get_cantidad_dados() == 1 for cacho in self.cachos
-        ]
-        return any(jugadores_con_un_dado) != (self.arbitro.usar_ases_comodin is False)
+        # Solo actualiza si la condición de que alguien tenga un dado cambia
+        hay_un_dado = self.estado_mesa.con_un_dado > 0
+        return hay_un_dado != (self.arbitro.usar_ases_comodin is False)
 
     def _actualizar_regla_especial(self):
         # Si algún jugador tiene solo un dado, ases dejan de ser comodines
-        for cacho in self.cachos:
-            if cacho.get_cantidad_dados() == 1:
-                self.arbitro.set_ases_comodin(False)
-                return
-        self.arbitro.set_ases_comodin(True)
+        self.arbitro.set_ases_comodin(self.estado_mesa.con_un_dado == 0)
 
     def quitar_dado(self, jugador):
+        estado = self.estado_mesa
         # Si tiene dados a favor, usa uno de ellos en lugar de perder un dado del cacho
-        if self.jugadores[jugador].dados_a_favor > 0:
-            self.jugadores[jugador].dados_a_favor -= 1
+        if estado.dados_a_favor[jugador] > 0:
+            estado.dados_a_favor[jugador] -= 1
         else:
-            self.jugadores[jugador].cacho.eliminar_dado()
+            cacho = self._cachos[jugador]
+            cacho.eliminar_dado()
+            if not self._cachos_observados:
+                estado.set_dados(jugador, cacho.get_cantidad_dados())
             # Si se queda sin dados, el jugador sale del juego
-            if self.jugadores[jugador].cacho.get_cantidad_dados() == 0:
-                self.jugadores[jugador].activo = False
+            if estado.dados[jugador] == 0:
+                estado.set_activo(jugador, False)
+                self.turnos.quitar(jugador)
+        if self.diario is not None:
+            self._registrar_cambio_dados(eventos.PIERDE_DADO, jugador)
+
+    def _registrar_cambio_dados(self, tipo, jugador):
+        self.diario.registrar(
+            tipo,
+            self.ronda_actual,
+            jugador,
+            self.estado_mesa.dados[jugador],
+            self.estado_mesa.dados_a_favor[jugador],
+        )
 
     def agregar_dado(self, jugador):
         # Si ya tiene 5 dados en juego, guarda el dado extra como "a favor"
-        if self.jugadores[jugador].cacho.get_cantidad_dados() < 5:
-            self.jugadores[jugador].cacho.agregar_dado()
+        estado = self.estado_mesa
+        if estado.dados[jugador] < 5:
+            cacho = self._cachos[jugador]
+            cacho.agregar_dado()
+            if not self._cachos_observados:
+                estado.set_dados(jugador, cacho.get_cantidad_dados())
         else:
-            self.jugadores[jugador].dados_a_favor += 1
+            estado.dados_a_favor[jugador] += 1
+        if self.diario is not None:
+            self._registrar_cambio_dados(eventos.GANA_DADO, jugador)
 
     def activar_regla_especial(self):
         # Si algún jugador tiene solo un dado, ases dejan de ser comodines
-        for cacho in self.cachos:
-            if cacho.get_cantidad_dados() == 1:
-                self.arbitro.set_ases_comodin(False)
-                return
-        self.arbitro.set_ases_comodin(True)
+        self.arbitro.set_ases_comodin(self.estado_mesa.con_un_dado == 0)
 
     def desactivar_regla_especial(self):
         self.arbitro.set_ases_comodin(True)
@@ -129,51 +426,101 @@ class GestorPartida:
     def set_jugador_inicial(self, jugador):
         self.jugador_actual = jugador
 
+    @property
+    def jugador_actual(self):
+        return self.turnos.actual
+
+    @jugador_actual.setter
+    def jugador_actual(self, jugador):
+        self.turnos.actual = jugador
+
+    def set_sentido(self, sentido=HORARIO):
+        """Sentido de juego que elige quien parte (ver src.juego.turnos)."""
+        self.turnos.set_sentido(sentido)
+
     def siguiente_jugador(self):
-        jugador = (self.jugador_actual + 1) % self.num_jugadores
-        self.jugador_actual = jugador
-        return jugador
+        """Pasa el turno al siguiente jugador activo en el sentido de juego."""
+        return self.turnos.avanzar()
+
+    def iniciar_ronda_con(self, jugador):
+        """
+        Da el primer turno de la ronda a quien perdió o recogió un dado, o al
+        siguiente activo si quedó eliminado.
+        """
+        return self.turnos.iniciar_ronda(jugador)
+
+    def asignar_agentes(self, agentes):
+        """Asigna un agente (ver src.simulacion.agente.Agente) a cada asiento."""
+        self.agentes = list(agentes)
 
     def preguntar_jugada(self, jugador):
-        # Método placeholder para la interfaz
-        pass
+        """
+        Pide la acción al agente del jugador, entregándole su observación.
+        Sin agentes asignados retorna None (la interfaz decide la jugada).
+        """
+        if self.agentes is None:
+            return None
+        return self.agentes[jugador].actuar(construir_observacion(self, jugador))
 
     def jugadores_con_un_dado(self):
-        return [
-            i
-            for i, jugador in enumerate(self.jugadores)
-            if jugador.cacho.get_cantidad_dados() == 1
-        ]
+        if self.estado_mesa.con_un_dado == 0:
+            return []
+        return [i for i, cantidad in enumerate(self.estado_mesa.dados) if cantidad == 1]
 
     def agitar_cachos(self):
-        """Agita todos los cachos de los jugadores activos"""
-        for jugador in self.jugadores:
-            if jugador.activo:
-                jugador.cacho.agitar()
+        """
+        Agita todos los cachos de los jugadores activos. Si los cachos
+        aceptan caras cargadas, se genera toda la mesa con una sola llamada.
+        """
+        activos = self.estado_mesa.activos
+        cachos = [c for i, c in enumerate(self._cachos) if activos >> i & 1]
+        if not all(hasattr(cacho, "cargar_caras") for cacho in cachos):
+            for cacho in cachos:
+                cacho.agitar()
+            return
+        cantidades = [cacho.get_cantidad_dados() for cacho in cachos]
+        caras = self.generador.generar_caras(sum(cantidades))
+        inicio = 0
+        for cacho, cantidad in zip(cachos, cantidades):
+            cacho.cargar_caras(caras[inicio : inicio + cantidad])
+            inicio += cantidad
 
     def nueva_ronda(self):
         """Inicia una nueva ronda agitando todos los cachos"""
         self.ronda_actual += 1
         self.agitar_cachos()
         self.ultima_apuesta = None
+        self.jugador_ultima_apuesta = None
+        self.historial_apuestas = []
+        if self.ronda_obligada is not None:
+            self.ronda_obligada = None
+            self._mostrar_dados_propios()
+        if self.estado_mesa.con_un_dado or self.pueden_obligar:
+            con_un_dado = set(self.jugadores_con_un_dado())
+            self.pueden_obligar = con_un_dado - self._tuvieron_un_dado
+            self._tuvieron_un_dado |= con_un_dado
+        if self.diario is not None:
+            self._registrar_ronda()
 
     def _finalizar_ronda(self):
         """Finaliza la ronda actual y prepara la siguiente"""
         if not self.hay_ganador():
             self.nueva_ronda()
+        elif self.diario is not None:
+            self.diario.registrar(
+                eventos.FIN_PARTIDA, self.ronda_actual, self.estado_mesa.primer_activo()
+            )
 
     def jugadores_activos(self):
         """Retorna la lista de jugadores que aún están en el juego"""
-        return [i for i, jugador in enumerate(self.jugadores) if jugador.activo]
+        return self.estado_mesa.asientos_activos()
 
     def hay_ganador(self):
         """Verifica si hay un ganador (solo un jugador activo)"""
-        activos = self.jugadores_activos()
-        return len(activos) == 1
+        return self.estado_mesa.cantidad_activos() == 1
 
     def obtener_ganador(self):
         """Retorna el nombre del ganador si lo hay"""
         if self.hay_ganador():
-            activos = self.jugadores_activos()
-            return self.jugadores[activos[0]].nombre
+            return self.jugadores[self.estado_mesa.primer_activo()].nombre
         return None
@@ -0,0 +1,217 @@
+"""
+Módulo que contiene el motor de dados por lotes para simular muchas mesas a la vez.
+
+Los dados de N mesas x P jugadores x D dados se guardan en un único arreglo
+contiguo de NumPy, de modo que agitar todas las mesas cuesta una sola llamada
+al generador en lugar de crear miles de objetos Dado.
+"""
+
+import numpy as np
+
+from src.juego.cacho import VisibilidadCacho
+from src.juego.dado import PINTAS
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+class MesaDados:
+    def __init__(
+        self,
+        num_mesas,
+        jugadores_por_mesa,
+        dados_por_jugador=5,
+        generador: GeneradorAleatorio = None,
+    ):
+        """
+        Inicializa el arreglo de dados de todas las mesas y los agita.
+        Si se entrega un generador con backend numpy se usa directamente;
+        con otro generador la semilla de NumPy se deriva de él, para que las
+        corridas con semilla sean reproducibles.
+        """
+        self.num_mesas = num_mesas
+        self.jugadores_por_mesa = jugadores_por_mesa
+        self.max_dados = dados_por_jugador
+        forma = (num_mesas, jugadores_por_mesa, dados_por_jugador)
+        # valores 1..6 de cada dado; solo los primeros `cantidades` de cada
+        # jugador están en juego
+        self.valores = np.zeros(forma, dtype=np.uint8)
+        self.cantidades = np.full(forma[:2], dados_por_jugador, dtype=np.uint8)
+        self.visibles = np.zeros(forma[:2], dtype=bool)
+        # bit i: el jugador i de la mesa puede ver el cacho (ver Cacho)
+        self.mascaras = np.zeros(forma[:2], dtype=np.uint64)
+        if generador is not None and generador.generador_numpy is not None:
+            self._rng = generador.generador_numpy
+        else:
+            semilla = None
+            if generador is not None:
+                semilla = generador.generar_entero(0, 2**63 - 1)
+            self._rng = np.random.default_rng(semilla)
+        self.agitar()
+
+    def agitar(self):
+        """Regenera los dados de todas las mesas con una sola llamada."""
+        self.valores[...] = self._rng.integers(
+            1, 7, size=self.valores.shape, dtype=np.uint8
+        )
+
+    def agitar_mesa(self, mesa):
+        """Regenera solo los dados de una mesa."""
+        self.valores[mesa] = self._rng.integers(
+            1, 7, size=self.valores.shape[1:], dtype=np.uint8
+        )
+
+    def agitar_cacho(self, mesa, jugador):
+        """Regenera solo los dados de un jugador de una mesa."""
+        self.valores[mesa, jugador] = self._rng.integers(
+            1, 7, size=self.max_dados, dtype=np.uint8
+        )
+
+    def mascara_en_juego(self):
+        """Retorna un arreglo booleano con los dados que están en juego."""
+        return np.arange(self.max_dados) < self.cantidades[..., np.newaxis]
+
+    def conteos(self):
+        """
+        Retorna un arreglo (mesas, jugadores, 6) con la cantidad de dados de
+        cada pinta, contando solo los dados en juego.
+        """
+        caras = np.arange(1, 7, dtype=np.uint8)
+        coincide = self.valores[..., np.newaxis] == caras
+        coincide &= self.mascara_en_juego()[..., np.newaxis]
+        return coincide.sum(axis=2, dtype=np.int32)
+
+    def cacho(self, mesa, jugador):
+        """Retorna una vista tipo Cacho sobre los dados de un jugador."""
+        return VistaCacho(self, mesa, jugador)
+
+    def cachos(self, mesa):
+        """Retorna las vistas de los cachos de todos los jugadores de una mesa."""
+        return [self.cacho(mesa, j) for j in range(self.jugadores_por_mesa)]
+
+
+class VistaCacho(VisibilidadCacho):
+    """
+    Vista con la misma interfaz de Cacho sobre una fila de MesaDados.
+    No guarda dados propios: lee y escribe directamente en el arreglo, así
+    que la visibilidad y la máscara de VisibilidadCacho se guardan en
+    MesaDados y las vistas por observador no se guardan entre lecturas.
+    """
+
+    __slots__ = ("_mesa_dados", "_mesa", "_jugador")
+
+    def __init__(self, mesa_dados: MesaDados, mesa, jugador):
+        self._mesa_dados = mesa_dados
+        self._mesa = mesa
+        self._jugador = jugador
+
+    @property
+    def max_cantidad_dados(self):
+        return self._mesa_dados.max_dados
+
+    def estado(self):
+        """
+        Retorna un registro inmutable de los valores de los dados, su
+        cantidad, la visibilidad y la máscara de observadores para volver a
+        él con restaurar.
+        """
+        mesa_dados, mesa, jugador = self._mesa_dados, self._mesa, self._jugador
+        return (
+            mesa_dados.valores[mesa, jugador].tobytes(),
+            int(mesa_dados.cantidades[mesa, jugador]),
+            bool(mesa_dados.visibles[mesa, jugador]),
+            int(mesa_dados.mascaras[mesa, jugador]),
+        )
+
+    def restaurar(self, estado):
+        """Vuelve al estado entregado por `estado`."""
+        valores, cantidad, visible, mascara = estado
+        mesa_dados, mesa, jugador = self._mesa_dados, self._mesa, self._jugador
+        mesa_dados.valores[mesa, jugador] = np.frombuffer(valores, dtype=np.uint8)
+        mesa_dados.cantidades[mesa, jugador] = cantidad
+        mesa_dados.visibles[mesa, jugador] = visible
+        mesa_dados.mascaras[mesa, jugador] = mascara
+
+    def clonar(self, generador: GeneradorAleatorio = None):
+        """
+        Retorna una vista en el mismo estado sobre una MesaDados propia de
+        una mesa y un jugador, que agita sus dados con `generador`.
+        """
+        copia = MesaDados(1, 1, self.max_cantidad_dados, generador).cacho(0, 0)
+        copia.restaurar(self.estado())
+        return copia
+
+    def get_pintas_de_dados(self):
+        """
+        Retorna la lista de pintas de los dados si la visibilidad está activada.
+        """
+        if not self.get_visibilidad():
+            return None
+        return list(self._calcular_pintas())
+
+    def agitar(self):
+        """Regenera los valores de todos los dados del cacho."""
+        self._mesa_dados.agitar_cacho(self._mesa, self._jugador)
+
+    def get_cantidad_dados(self):
+        """Retorna la cantidad de dados en el cacho."""
+        return int(self._mesa_dados.cantidades[self._mesa, self._jugador])
+
+    def set_visible(self):
+        """Hace visibles las pintas de los dados."""
+        self._mesa_dados.visibles[self._mesa, self._jugador] = True
+
+    def set_oculto(self):
+        """Oculta las pintas de los dados."""
+        self._mesa_dados.visibles[self._mesa, self._jugador] = False
+
+    def get_visibilidad(self):
+        """Retorna el estado de visibilidad de los dados."""
+        return bool(self._mesa_dados.visibles[self._mesa, self._jugador])
+
+    def get_mascara_visibilidad(self):
+        """Retorna la máscara de observadores que ven los dados."""
+        return int(self._mesa_dados.mascaras[self._mesa, self._jugador])
+
+    def set_mascara_visibilidad(self, mascara):
+        """Reemplaza la máscara de observadores que ven los dados."""
+        self._mesa_dados.mascaras[self._mesa, self._jugador] = mascara
+
+    def _calcular_pintas(self):
+        cantidad = self.get_cantidad_dados()
+        fila = self._mesa_dados.valores[self._mesa, self._jugador, :cantidad]
+        return tuple(PINTAS[valor - 1] for valor in fila.tolist())
+
+    def _calcular_conteo(self):
+        conteo = [0] * len(PINTAS)
+        for pinta in self._calcular_pintas():
+            conteo[pinta.value - 1] += 1
+        return tuple(conteo)
+
+    def pintas_para(self, observador):
+        """
+        Retorna la tupla de pintas vista por `observador`, o None si no
+        puede verlas, sin cambiar la visibilidad. Se lee del arreglo en
+        cada llamada, ya que la vista no sabe cuándo cambian los dados.
+        """
+        return self._calcular_pintas() if self.puede_ver(observador) else None
+
+    def conteo_para(self, observador):
+        """Cantidad de dados de cada pinta vista por `observador`, o None."""
+        return self._calcular_conteo() if self.puede_ver(observador) else None
+
+    def agregar_dado(self, dado=None):
+        """Agrega un dado al cacho; si no se entrega uno, se lanza uno nuevo."""
+        cantidad = self.get_cantidad_dados()
+        if cantidad >= self.max_cantidad_dados:
+            return
+        if dado is not None:
+            valor = dado.show().value
+        else:
+            valor = self._mesa_dados._rng.integers(1, 7)
+        self._mesa_dados.valores[self._mesa, self._jugador, cantidad] = valor
+        self._mesa_dados.cantidades[self._mesa, self._jugador] = cantidad + 1
+
+    def eliminar_dado(self):
+        """Elimina el último dado si hay al menos uno."""
+        cantidad = self.get_cantidad_dados()
+        if cantidad > 0:
+            self._mesa_dados.cantidades[self._mesa, self._jugador] = cantidad - 1
@@ -0,0 +1,92 @@
+"""
+Módulo con la observación que recibe un jugador automático en su turno.
+
+La observación contiene solo lo que el jugador puede saber: los dados que
+ve (normalmente solo los propios), la cantidad de dados de cada asiento y
+las apuestas de la ronda.
+"""
+
+from src.juego.contador_pintas import leer_pintas
+from src.juego.turnos import HORARIO
+
+
+class Observacion:
+    __slots__ = (
+        "jugador",
+        "pintas_propias",
+        "dados_por_jugador",
+        "dados_a_favor",
+        "activos",
+        "ultima_apuesta",
+        "jugador_ultima_apuesta",
+        "historial",
+        "ases_comodin",
+        "ronda",
+        "pintas_visibles",
+        "sentido",
+    )
+
+    def __init__(
+        self,
+        jugador,
+        pintas_propias,
+        dados_por_jugador,
+        dados_a_favor,
+        activos,
+        ultima_apuesta,
+        jugador_ultima_apuesta,
+        historial,
+        ases_comodin,
+        ronda,
+        pintas_visibles=(),
+        sentido=HORARIO,
+    ):
+        self.jugador = jugador
+        self.pintas_propias = pintas_propias
+        self.dados_por_jugador = dados_por_jugador
+        self.dados_a_favor = dados_a_favor
+        self.activos = activos
+        self.ultima_apuesta = ultima_apuesta
+        self.jugador_ultima_apuesta = jugador_ultima_apuesta
+        self.historial = historial
+        self.ases_comodin = ases_comodin
+        self.ronda = ronda
+        # Pintas de cada asiento que el jugador ve (None si no las ve)
+        self.pintas_visibles = pintas_visibles
+        self.sentido = sentido  # sentido de juego, ver src.juego.turnos
+
+    @property
+    def cantidad_dados(self):
+        """Cantidad de dados en juego del propio jugador."""
+        return self.dados_por_jugador[self.jugador]
+
+    @property
+    def total_dados(self):
+        """Cantidad de dados en juego en toda la mesa."""
+        return sum(self.dados_por_jugador)
+
+    @property
+    def dados_ocultos(self):
+        """Cantidad de dados en juego que el jugador no puede ver."""
+        return self.total_dados - self.cantidad_dados
+
+
+def construir_observacion(gestor, jugador):
+    """Arma la observación del `jugador` a partir del estado del gestor."""
+    estado = gestor.estado_mesa
+    # Se lee con la visibilidad del jugador, sin cambiar la de los cachos
+    pintas_visibles = tuple(leer_pintas(cacho, jugador) for cacho in gestor.cachos)
+    return Observacion(
+        jugador=jugador,
+        pintas_propias=tuple(pintas_visibles[jugador] or ()),
+        dados_por_jugador=tuple(estado.dados),
+        dados_a_favor=tuple(estado.dados_a_favor),
+        activos=tuple(estado.es_activo(i) for i in range(len(estado.dados))),
+        ultima_apuesta=gestor.ultima_apuesta,
+        jugador_ultima_apuesta=gestor.jugador_ultima_apuesta,
+        historial=tuple(gestor.historial_apuestas),
+        ases_comodin=gestor.arbitro.usar_ases_comodin,
+        ronda=gestor.ronda_actual,
+        pintas_visibles=pintas_visibles,
+        sentido=gestor.turnos.sentido,
+    )
@@ -0,0 +1,125 @@
+"""
+Módulo que calcula de forma exacta las probabilidades de una apuesta.
+
+Para una apuesta se necesita P(cantidad >= k) (la apuesta resiste una duda)
+y P(cantidad == k) (se puede calzar). Los dados ocultos siguen una
+distribución binomial, cuyas tablas se precalculan y memorizan en un caché
+acotado por (dados ocultos, probabilidad de éxito).
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+from src.juego.dado import Pinta
+
+TAMANO_CACHE = 1024
+
+PROB_PINTA = Fraction(1, 6)
+PROB_PINTA_CON_COMODIN = Fraction(2, 6)
+
+
+def probabilidad_exito(pinta: Pinta, ases_comodin=True):
+    """Probabilidad de que un dado oculto cuente para la pinta apostada."""
+    if ases_comodin and pinta != Pinta.AS:
+        return PROB_PINTA_CON_COMODIN
+    return PROB_PINTA
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def tabla_binomial(ocultos, probabilidad):
+    """Tupla con P(X == i) para i = 0..ocultos."""
+    p = float(probabilidad)
+    q = 1.0 - p
+    return tuple(
+        comb(ocultos, i) * p**i * q ** (ocultos - i) for i in range(ocultos + 1)
+    )
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def tabla_acumulada(ocultos, probabilidad):
+    """Tupla con P(X >= i) para i = 0..ocultos + 1."""
+    binomial = tabla_binomial(ocultos, probabilidad)
+    acumulada = [0.0] * (ocultos + 2)
+    for i in range(ocultos, -1, -1):
+        acumulada[i] = acumulada[i + 1] + binomial[i]
+    # Evita que el redondeo deje P(X >= 0) apenas distinto de 1
+    acumulada[0] = 1.0
+    return tuple(acumulada)
+
+
+def prob_al_menos(k, ocultos, probabilidad):
+    """P(X >= k) con X ~ Binomial(ocultos, probabilidad)."""
+    if k <= 0:
+        return 1.0
+    if k > ocultos:
+        return 0.0
+    return tabla_acumulada(ocultos, probabilidad)[k]
+
+
+def prob_exacta(k, ocultos, probabilidad):
+    """P(X == k) con X ~ Binomial(ocultos, probabilidad)."""
+    if k < 0 or k > ocultos:
+        return 0.0
+    return tabla_binomial(ocultos, probabilidad)[k]
+
+
+def contar_propias(pintas_propias, pinta: Pinta, ases_comodin=True):
+    """Cantidad de dados propios que cuentan para la pinta apostada."""
+    if ases_comodin and pinta != Pinta.AS:
+        return sum(1 for p in pintas_propias if p == pinta or p == Pinta.AS)
+    return sum(1 for p in pintas_propias if p == pinta)
+
+
+class CalculadoraProbabilidades:
+    def __init__(self, arbitro=None):
+        """
+        Si se entrega un ArbitroRonda, la regla de ases comodines se toma
+        de él en cada consulta.
+        """
+        self.arbitro = arbitro
+
+    def _ases_comodin(self, ases_comodin):
+        if ases_comodin is not None:
+            return ases_comodin
+        if self.arbitro is not None:
+            return self.arbitro.usar_ases_comodin
+        return True
+
+    def prob_al_menos(
+        self, pintas_propias, ocultos, pinta, cantidad, ases_comodin=None
+    ):
+        """Probabilidad de que en la mesa haya al menos `cantidad` de la pinta."""
+        comodin = self._ases_comodin(ases_comodin)
+        vistos = contar_propias(pintas_propias, pinta, comodin)
+        return prob_al_menos(
+            cantidad - vistos, ocultos, probabilidad_exito(pinta, comodin)
+        )
+
+    def prob_exacta(self, pintas_propias, ocultos, pinta, cantidad, ases_comodin=None):
+        """Probabilidad de que en la mesa haya exactamente `cantidad` de la pinta."""
+        comodin = self._ases_comodin(ases_comodin)
+        vistos = contar_propias(pintas_propias, pinta, comodin)
+        return prob_exacta(
+            cantidad - vistos, ocultos, probabilidad_exito(pinta, comodin)
+        )
+
+    def prob_duda_exitosa(self, pintas_propias, ocultos, apuesta, ases_comodin=None):
+        """Probabilidad de ganar al dudar la apuesta."""
+        return 1.0 - self.prob_al_menos(
+            pintas_propias,
+            ocultos,
+            apuesta.get_pinta(),
+            apuesta.get_cantidad(),
+            ases_comodin,
+        )
+
+    def prob_calzar_exitoso(self, pintas_propias, ocultos, apuesta, ases_comodin=None):
+        """Probabilidad de ganar al calzar la apuesta."""
+        return self.prob_exacta(
+            pintas_propias,
+            ocultos,
+            apuesta.get_pinta(),
+            apuesta.get_cantidad(),
+            ases_comodin,
+        )
@@ -0,0 +1,103 @@
+"""
+Módulo con el orden de los turnos de una mesa.
+
+Los asientos activos forman un anillo doblemente enlazado guardado en dos
+listas planas (siguiente y anterior de cada asiento). Avanzar el turno en
+cualquiera de los dos sentidos y sacar a un jugador eliminado cuestan O(1),
+así que en una mesa grande al final de la partida no se recorren asientos
+vacíos.
+"""
+
+# Sentidos de juego que elige quien parte (reglas.txt): hacia su izquierda,
+# como las manecillas del reloj (asientos crecientes), o hacia su derecha
+HORARIO = 1
+ANTIHORARIO = -1
+
+
+class AnilloTurnos:
+    __slots__ = (
+        "estado",
+        "sentido",
+        "actual",
+        "_siguientes",
+        "_anteriores",
+        "_enlazados",
+    )
+
+    def __init__(self, estado, sentido=HORARIO):
+        """
+        Arma el anillo con los asientos activos de `estado` (un EstadoMesa),
+        que sigue siendo la fuente de verdad de quién está activo.
+        """
+        self.estado = estado
+        self.sentido = sentido
+        self.actual = 0
+        self._siguientes = []
+        self._anteriores = []
+        self._enlazados = 0  # bit i: el asiento i está en el anillo
+        self.reconstruir()
+
+    def reconstruir(self):
+        """Vuelve a enlazar todos los asientos activos, en orden."""
+        cantidad = len(self.estado.dados)
+        self._siguientes = list(range(1, cantidad)) + [0]
+        self._anteriores = [cantidad - 1] + list(range(cantidad - 1))
+        self._enlazados = (1 << cantidad) - 1
+        activos = self.estado.activos
+        for asiento in range(cantidad):
+            if not activos >> asiento & 1:
+                self.quitar(asiento)
+
+    def quitar(self, asiento):
+        """
+        Saca un asiento del anillo en O(1). El asiento conserva sus enlaces,
+        así que desde él todavía se puede llegar al siguiente activo.
+        """
+        if not self._enlazados >> asiento & 1:
+            return
+        siguiente = self._siguientes[asiento]
+        anterior = self._anteriores[asiento]
+        self._siguientes[anterior] = siguiente
+        self._anteriores[siguiente] = anterior
+        self._enlazados &= ~(1 << asiento)
+
+    def set_sentido(self, sentido):
+        if sentido not in (HORARIO, ANTIHORARIO):
+            raise ValueError("El sentido debe ser HORARIO o ANTIHORARIO")
+        self.sentido = sentido
+
+    def siguiente(self, asiento):
+        """
+        Retorna el asiento activo que juega después de `asiento` en el
+        sentido de juego, o el mismo asiento si no queda otro. Los asientos
+        que dejaron de estar activos sin pasar por quitar se sacan al
+        encontrarlos, y los que volvieron a estar activos rearman el anillo.
+        """
+        activos = self.estado.activos
+        if not activos:
+            return asiento
+        if activos & ~self._enlazados:
+            self.reconstruir()
+        enlaces = self._siguientes if self.sentido == HORARIO else self._anteriores
+        candidato = enlaces[asiento]
+        while not activos >> candidato & 1:
+            if candidato == asiento:
+                return asiento
+            self.quitar(candidato)
+            candidato = enlaces[candidato]
+        return candidato
+
+    def avanzar(self):
+        """Pasa el turno al siguiente asiento activo y lo retorna."""
+        self.actual = self.siguiente(self.actual)
+        return self.actual
+
+    def iniciar_ronda(self, asiento):
+        """
+        Da el primer turno de la ronda a `asiento` (quien perdió o recogió
+        un dado) o, si quedó eliminado, al siguiente activo desde él.
+        """
+        if not self.estado.activos >> asiento & 1:
+            asiento = self.siguiente(asiento)
+        self.actual = asiento
+        return asiento
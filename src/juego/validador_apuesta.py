@@ -1,12 +1,40 @@
-from src.juego.dado import Pinta
+from functools import lru_cache, total_ordering
 
+from src.juego.dado import PINTAS, Pinta
 
+NUM_PINTAS = len(PINTAS)
+
+
+@total_ordering
 class Apuesta:
+    """
+    Apuesta inmutable (cantidad, pinta). Se puede usar como llave de
+    diccionarios y se ordena por cantidad y luego por pinta, igual que su
+    ordinal. Apuesta.obtener retorna instancias compartidas.
+    """
+
+    __slots__ = ("__cantidad_pintas", "__pinta")
+
+    # Instancias compartidas por (cantidad, pinta), ver Apuesta.obtener
+    _internadas = {}
+    MAX_CANTIDAD_INTERNADA = 256
+
     def __init__(self, cantidad_pintas: int, pinta: Pinta):
         if cantidad_pintas <= 0:
             raise ValueError("La cantidad de pintas debe ser mayor que 0")
-        self.__cantidad_pintas = cantidad_pintas
-        self.__pinta = pinta
+        object.__setattr__(self, "_Apuesta__cantidad_pintas", cantidad_pintas)
+        object.__setattr__(self, "_Apuesta__pinta", pinta)
+
+    @classmethod
+    def obtener(cls, cantidad_pintas: int, pinta: Pinta):
+        """Retorna la instancia compartida de la apuesta (cantidad, pinta)."""
+        llave = (cantidad_pintas, pinta)
+        apuesta = cls._internadas.get(llave)
+        if apuesta is None:
+            apuesta = cls(cantidad_pintas, pinta)
+            if cantidad_pintas <= cls.MAX_CANTIDAD_INTERNADA:
+                cls._internadas[llave] = apuesta
+        return apuesta
 
     def get_cantidad(self):
         return self.__cantidad_pintas
@@ -14,6 +42,89 @@ class Apuesta:
     def get_pinta(self):
         return self.__pinta
 
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Apuesta es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Apuesta es inmutable")
+
+    def __eq__(self, otra):
+        if not isinstance(otra, Apuesta):
+            return NotImplemented
+        return (
+            self.__cantidad_pintas == otra.__cantidad_pintas
+            and self.__pinta == otra.__pinta
+        )
+
+    def __lt__(self, otra):
+        if not isinstance(otra, Apuesta):
+            return NotImplemented
+        return (self.__cantidad_pintas, self.__pinta.value) < (
+            otra.__cantidad_pintas,
+            otra.__pinta.value,
+        )
+
+    def __hash__(self):
+        return hash((self.__cantidad_pintas, self.__pinta))
+
+    def __reduce__(self):
+        return (Apuesta.obtener, (self.__cantidad_pintas, self.__pinta))
+
+    def __repr__(self):
+        return f"Apuesta({self.__cantidad_pintas}, Pinta.{self.__pinta.name})"
+
+
+def ordinal(apuesta: Apuesta):
+    """
+    Codifica una apuesta como un entero: (cantidad - 1) * 6 + (pinta - 1).
+    El ordinal ordena primero por cantidad y luego por pinta.
+    """
+    return (apuesta.get_cantidad() - 1) * NUM_PINTAS + apuesta.get_pinta().value - 1
+
+
+def apuesta_desde_ordinal(valor: int):
+    """Decodifica un ordinal creado con `ordinal`."""
+    cantidad, pinta = divmod(valor, NUM_PINTAS)
+    return Apuesta.obtener(cantidad + 1, PINTAS[pinta])
+
+
+@lru_cache(maxsize=64)
+def tabla_transiciones(total_dados: int):
+    """
+    Precalcula, para cada apuesta con cantidad hasta `total_dados`, la
+    máscara de bits de las apuestas siguientes válidas y la tupla con sus
+    ordinales. Aplica las mismas reglas que ValidadorApuesta.es_valida,
+    incluidas las de bajar a ases y subir desde ases.
+    """
+    as_ = Pinta.AS.value - 1
+    mascaras = []
+    siguientes = []
+    for anterior in range(total_dados * NUM_PINTAS):
+        cantidad, pinta = divmod(anterior, NUM_PINTAS)
+        cantidad += 1
+        validos = set()
+        # Regla normal: mayor cantidad misma pinta
+        for nueva_cantidad in range(cantidad + 1, total_dados + 1):
+            validos.add((nueva_cantidad - 1) * NUM_PINTAS + pinta)
+        # Regla normal: misma cantidad pero pinta mayor
+        for nueva_pinta in range(pinta + 1, NUM_PINTAS):
+            validos.add((cantidad - 1) * NUM_PINTAS + nueva_pinta)
+        if pinta != as_:
+            # Cambiar a ases: la mitad (redondeada hacia abajo) más uno
+            validos.add((cantidad // 2) * NUM_PINTAS + as_)
+        else:
+            # Cambiar desde ases: el doble más uno o más
+            for nueva_cantidad in range(cantidad * 2 + 1, total_dados + 1):
+                for nueva_pinta in range(NUM_PINTAS):
+                    if nueva_pinta != as_:
+                        validos.add((nueva_cantidad - 1) * NUM_PINTAS + nueva_pinta)
+        mascara = 0
+        for valor in validos:
+            mascara |= 1 << valor
+        mascaras.append(mascara)
+        siguientes.append(tuple(sorted(validos)))
+    return tuple(mascaras), tuple(siguientes)
+
 
 class ValidadorApuesta:
     @staticmethod
@@ -25,51 +136,89 @@ class ValidadorApuesta:
         """
         if cantidad_dados < 1:
             return False
+        nueva_pinta = nueva_apuesta.get_pinta()
         """Para la primera apuesta"""
         if apuesta_anterior is None:
-            if nueva_apuesta.get_pinta() == Pinta.AS and cantidad_dados > 1:
+            if nueva_pinta == Pinta.AS and cantidad_dados > 1:
                 return False
             return True
 
+        nueva_cantidad = nueva_apuesta.get_cantidad()
+        cantidad_anterior = apuesta_anterior.get_cantidad()
+        pinta_anterior = apuesta_anterior.get_pinta()
+
         """Regla normal: mayor cantidad misma pinta"""
-        if (
-            nueva_apuesta.get_cantidad() > apuesta_anterior.get_cantidad()
-            and nueva_apuesta.get_pinta().value == apuesta_anterior.get_pinta().value
-        ):
+        if nueva_cantidad > cantidad_anterior and nueva_pinta == pinta_anterior:
             return True
 
         """Regla normal: misma cantidad pero pinta mayor"""
         if (
-            nueva_apuesta.get_cantidad() == apuesta_anterior.get_cantidad()
-            and nueva_apuesta.get_pinta().value > apuesta_anterior.get_pinta().value
+            nueva_cantidad == cantidad_anterior
+            and nueva_pinta.value > pinta_anterior.value
         ):
             return True
 
         """Reglas de los ases: Cambiar de cualquier pinta a ASES"""
-        if (nueva_apuesta.get_pinta() == Pinta.AS) and (
-            apuesta_anterior.get_pinta() != Pinta.AS
-        ):
-            if (
-                apuesta_anterior.get_cantidad() % 2 == 0
-                and nueva_apuesta.get_cantidad()
-                == (apuesta_anterior.get_cantidad() / 2) + 1
-            ):
-                return True
-            elif (
-                apuesta_anterior.get_cantidad() % 2 == 1
-                and nueva_apuesta.get_cantidad()
-                == (apuesta_anterior.get_cantidad() // 2) + 1
-            ):
-                return True
+        if nueva_pinta == Pinta.AS and pinta_anterior != Pinta.AS:
+            # Par: la mitad más uno; impar: la mitad redondeada hacia arriba
+            return nueva_cantidad == cantidad_anterior // 2 + 1
 
         """Reglas de los ases: Cambiar de ASES a pinta mayor"""
-        if (nueva_apuesta.get_pinta() != Pinta.AS) and (
-            apuesta_anterior.get_pinta() == Pinta.AS
-        ):
-            if (
-                nueva_apuesta.get_cantidad()
-                >= (apuesta_anterior.get_cantidad() * 2) + 1
-            ):
-                return True
+        if nueva_pinta != Pinta.AS and pinta_anterior == Pinta.AS:
+            return nueva_cantidad >= cantidad_anterior * 2 + 1
 
         return False
+
+    @staticmethod
+    def es_valida_ordinal(
+        ordinal_anterior, ordinal_nuevo, total_dados: int, cantidad_dados: int = 5
+    ):
+        """
+        Versión O(1) de es_valida sobre ordinales, para apuestas con cantidad
+        hasta `total_dados`. `ordinal_anterior` es None en la primera apuesta.
+        """
+        if cantidad_dados < 1 or not 0 <= ordinal_nuevo < total_dados * NUM_PINTAS:
+            return False
+        if ordinal_anterior is None:
+            return ordinal_nuevo % NUM_PINTAS != 0 or cantidad_dados == 1
+        if ordinal_anterior < 0:
+            raise ValueError("El ordinal anterior no puede ser negativo")
+        if ordinal_anterior >= total_dados * NUM_PINTAS:
+            # Fuera de la tabla: solo queda bajar a ases, se valida directo
+            return ValidadorApuesta.es_valida(
+                apuesta_desde_ordinal(ordinal_anterior),
+                apuesta_desde_ordinal(ordinal_nuevo),
+                cantidad_dados,
+            )
+        mascaras, _ = tabla_transiciones(total_dados)
+        return bool(mascaras[ordinal_anterior] >> ordinal_nuevo & 1)
+
+    @staticmethod
+    def siguientes_validas(
+        apuesta_anterior: Apuesta, total_dados: int, cantidad_dados: int = 5
+    ):
+        """
+        Genera en orden de ordinal las apuestas válidas después de
+        `apuesta_anterior` (o las aperturas si es None), con cantidad
+        hasta `total_dados`.
+        """
+        if cantidad_dados < 1:
+            return
+        if apuesta_anterior is None:
+            for valor in range(total_dados * NUM_PINTAS):
+                if valor % NUM_PINTAS != 0 or cantidad_dados == 1:
+                    yield apuesta_desde_ordinal(valor)
+            return
+        anterior = ordinal(apuesta_anterior)
+        if anterior >= total_dados * NUM_PINTAS:
+            # Sobre la cota solo se puede bajar a ases
+            for cantidad in range(1, total_dados + 1):
+                candidata = Apuesta.obtener(cantidad, Pinta.AS)
+                if ValidadorApuesta.es_valida(
+                    apuesta_anterior, candidata, cantidad_dados
+                ):
+                    yield candidata
+            return
+        _, siguientes = tabla_transiciones(total_dados)
+        for valor in siguientes[anterior]:
+            yield apuesta_desde_ordinal(valor)
@@ -0,0 +1,285 @@
+"""
+Benchmarks de los caminos críticos del juego, con una línea base guardada
+en JSON y una comparación que falla si algún caso empeora.
+
+Uso:
+    python -m src.rendimiento --guardar rendimiento_base.json
+    python -m src.rendimiento --comparar rendimiento_base.json --umbral 0.2
+
+Por cada caso se reportan las operaciones por segundo (la mejor de varias
+repeticiones), los bytes que quedan asignados por operación si se
+conservan sus resultados y el pico de memoria (con tracemalloc) de una
+tanda de operaciones. Los números dependen de la máquina: la línea base
+se debe generar en la misma máquina donde se compara.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from src.juego.arbitro_ronda import ArbitroRonda
+from src.juego.cacho import Cacho, CachoCompacto
+from src.juego.contador_pintas import ContadorPintas
+from src.juego.dado import PINTAS, Dado, Pinta
+from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import jugar_partida
+from src.simulacion.motor_lotes import PoliticaEsperanzaLotes, jugar_lotes
+from src.simulacion.motor_rapido import jugar_partida_rapida, politica_esperanza
+from src.simulacion.politicas import PoliticaEsperanza
+
+
+def _mesa(num_cachos, clase=Cacho, semilla=0):
+    generador = GeneradorAleatorio(semilla)
+    cachos = [clase(generador=generador) for _ in range(num_cachos)]
+    for cacho in cachos:
+        cacho.set_visible()
+    return cachos
+
+
+def _caso_dado():
+    return Dado
+
+
+def _caso_agitar():
+    return _mesa(1)[0].agitar
+
+
+def _caso_agitar_compacto():
+    return _mesa(1, CachoCompacto)[0].agitar
+
+
+def _caso_pintas():
+    return _mesa(1)[0].get_pintas_de_dados
+
+
+def _caso_contar():
+    contador = ContadorPintas()
+    cachos = _mesa(6)
+    return lambda: contador.contar(cachos, Pinta.TREN)
+
+
+def _caso_es_valida():
+    apuestas = [Apuesta.obtener(c, p) for c in range(1, 11) for p in PINTAS]
+    pares = [(a, b) for a in apuestas[::7] for b in apuestas[::5]]
+
+    def es_valida():
+        for anterior, nueva in pares:
+            ValidadorApuesta.es_valida(anterior, nueva)
+
+    # Una operación es una validación: se divide por la cantidad de pares
+    es_valida.operaciones = len(pares)
+    return es_valida
+
+
+def _caso_duda():
+    arbitro = ArbitroRonda()
+    cachos = _mesa(6)
+    return lambda: arbitro.resolver_duda(cachos, (0, Pinta.CUADRA, 8))
+
+
+def _caso_calzar():
+    arbitro = ArbitroRonda()
+    cachos = _mesa(6)
+    return lambda: arbitro.resolver_calzar(cachos, (0, Pinta.CUADRA, 8))
+
+
+def _caso_partida(num_jugadores):
+    def preparar():
+        generador = GeneradorAleatorio(num_jugadores)
+
+        def partida():
+            dados, politicas = generador.spawn(2)
+            jugar_partida(
+                [PoliticaEsperanza(politicas) for _ in range(num_jugadores)], dados
+            )
+
+        return partida
+
+    return preparar
+
+
+def _caso_partida_rapida(num_jugadores):
+    def preparar():
+        generador = GeneradorAleatorio(num_jugadores)
+        return lambda: jugar_partida_rapida(
+            [politica_esperanza] * num_jugadores, generador
+        )
+
+    return preparar
+
+
+def _caso_partida_lotes(num_jugadores, num_partidas=1000):
+    def preparar():
+        generador = GeneradorAleatorio(num_jugadores)
+
+        def partidas():
+            jugar_lotes(
+                [PoliticaEsperanzaLotes()] * num_jugadores, num_partidas, generador
+            )
+
+        # Una operación es una partida del lote
+        partidas.operaciones = num_partidas
+        return partidas
+
+    return preparar
+
+
+# Cada caso prepara su estado y retorna la función que se mide
+CASOS = {
+    "dado.crear": _caso_dado,
+    "cacho.agitar": _caso_agitar,
+    "cacho_compacto.agitar": _caso_agitar_compacto,
+    "cacho.get_pintas_de_dados": _caso_pintas,
+    "contador_pintas.contar": _caso_contar,
+    "validador_apuesta.es_valida": _caso_es_valida,
+    "arbitro_ronda.resolver_duda": _caso_duda,
+    "arbitro_ronda.resolver_calzar": _caso_calzar,
+    "partida.2_jugadores": _caso_partida(2),
+    "partida.6_jugadores": _caso_partida(6),
+    "partida.10_jugadores": _caso_partida(10),
+    "partida_rapida.6_jugadores": _caso_partida_rapida(6),
+    "partida_lotes.6_jugadores": _caso_partida_lotes(6),
+}
+
+
+def _calibrar(funcion, tiempo_minimo):
+    """Cantidad de llamadas que toma al menos `tiempo_minimo` segundos."""
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        if time.perf_counter() - inicio >= tiempo_minimo or llamadas >= 1 << 24:
+            return llamadas
+        llamadas *= 2
+
+
+def _memoria(funcion, llamadas):
+    """Bytes que quedan asignados por llamada y pico de una tanda."""
+    llamadas = max(1, min(llamadas, 1000))
+    resultados = []
+    tracemalloc.start()
+    try:
+        inicial, _ = tracemalloc.get_traced_memory()
+        for _ in range(llamadas):
+            resultados.append(funcion())
+        final, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # La lista de resultados también ocupa memoria: se descuenta
+    lista = sys.getsizeof(resultados)
+    return max(0.0, (final - inicial - lista) / llamadas), pico - inicial
+
+
+def medir(funcion, tiempo_minimo=0.2, repeticiones=5):
+    """Mide una función sin argumentos y retorna un dict con sus métricas."""
+    operaciones = getattr(funcion, "operaciones", 1)
+    llamadas = _calibrar(funcion, tiempo_minimo / repeticiones)
+    mejor = 0.0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = max(mejor, llamadas * operaciones / duracion)
+    asignado, pico = _memoria(funcion, llamadas)
+    return {
+        "ops_por_segundo": mejor,
+        "bytes_por_op": asignado / operaciones,
+        "pico_bytes": pico,
+    }
+
+
+def ejecutar(casos=None, tiempo_minimo=0.2, repeticiones=5):
+    """Ejecuta los casos (todos por defecto) y retorna sus métricas por nombre."""
+    nombres = list(CASOS) if casos is None else list(casos)
+    return {
+        nombre: medir(CASOS[nombre](), tiempo_minimo, repeticiones)
+        for nombre in nombres
+    }
+
+
+def guardar(resultados, ruta):
+    datos = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "casos": resultados,
+    }
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, indent=2, sort_keys=True)
+        archivo.write("\n")
+
+
+def cargar(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)["casos"]
+
+
+def comparar(base, actual, umbral=0.2, umbral_memoria_bytes=64):
+    """
+    Retorna la lista de regresiones (mensajes) de `actual` respecto a
+    `base`: casos que hacen una fracción `umbral` menos operaciones por
+    segundo, o que retienen más de `umbral` de memoria adicional por
+    operación (ignorando diferencias menores a `umbral_memoria_bytes`).
+    Los casos que no están en ambos se omiten.
+    """
+    regresiones = []
+    for nombre in sorted(set(base) & set(actual)):
+        antes, ahora = base[nombre], actual[nombre]
+        minimo = antes["ops_por_segundo"] * (1 - umbral)
+        if ahora["ops_por_segundo"] < minimo:
+            regresiones.append(
+                f"{nombre}: {ahora['ops_por_segundo']:.0f} ops/s, "
+                f"antes {antes['ops_por_segundo']:.0f} ops/s"
+            )
+        extra = ahora["bytes_por_op"] - antes["bytes_por_op"]
+        if extra > umbral_memoria_bytes and extra > antes["bytes_por_op"] * umbral:
+            regresiones.append(
+                f"{nombre}: {ahora['bytes_por_op']:.0f} bytes/op, "
+                f"antes {antes['bytes_por_op']:.0f} bytes/op"
+            )
+    return regresiones
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks del Dudo")
+    parser.add_argument(
+        "--casos",
+        default=None,
+        help=f"Casos separados por coma ({', '.join(CASOS)})",
+    )
+    parser.add_argument("--tiempo", type=float, default=0.2)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--guardar", default=None, help="Ruta de la línea base")
+    parser.add_argument("--comparar", default=None, help="Línea base a comparar")
+    parser.add_argument("--umbral", type=float, default=0.2)
+    return parser
+
+
+def main(argumentos=None):
+    args = crear_parser().parse_args(argumentos)
+    casos = args.casos.split(",") if args.casos else None
+    resultados = ejecutar(casos, args.tiempo, args.repeticiones)
+    for nombre, metricas in resultados.items():
+        print(
+            f"{nombre:32} {metricas['ops_por_segundo']:>14,.0f} ops/s "
+            f"{metricas['bytes_por_op']:>10,.1f} B/op "
+            f"{metricas['pico_bytes'] / 1024:>10,.1f} KiB pico"
+        )
+    if args.guardar:
+        guardar(resultados, args.guardar)
+    if args.comparar:
+        regresiones = comparar(cargar(args.comparar), resultados, args.umbral)
+        for regresion in regresiones:
+            print(f"REGRESIÓN {regresion}")
+        if regresiones:
+            sys.exit(1)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Diario binario de eventos de partidas.
+
+Cada evento es un registro de ancho fijo empaquetado con struct:
+(tipo, jugador, cantidad, detalle, partida, ronda, datos). Los registros
+se acumulan en un buffer y se escriben en bloque; los archivos rotan al
+superar un tamaño, siempre entre partidas, de modo que cada archivo
+contiene partidas completas y se puede procesar por separado.
+
+El significado de los campos según el tipo es:
+
+- INICIO_PARTIDA: cantidad = jugadores, detalle = dados por jugador.
+- INICIO_RONDA: cantidad = jugadores activos.
+- DADOS: cantidad = dados del jugador, datos = caras (3 bits por dado).
+- APUESTA: cantidad = cantidad apostada, detalle = pinta.value,
+  datos = 1 si fue válida.
+- DUDA: detalle = código de resultado, datos = jugador que apostó.
+- CALZAR: detalle = código de resultado.
+- PIERDE_DADO / GANA_DADO: cantidad = dados en el cacho después del
+  cambio, detalle = dados a favor después del cambio.
+- FIN_PARTIDA: jugador = ganador.
+- OBLIGAR: jugador = quien obliga, detalle = 1 si la ronda es abierta.
+"""
+
+import glob
+import struct
+from collections import namedtuple
+
+INICIO_PARTIDA = 1
+INICIO_RONDA = 2
+DADOS = 3
+APUESTA = 4
+DUDA = 5
+CALZAR = 6
+PIERDE_DADO = 7
+GANA_DADO = 8
+FIN_PARTIDA = 9
+OBLIGAR = 10
+
+RESULTADOS = (
+    "pierde_dudador",
+    "pierde_apostador",
+    "gana_calzador",
+    "pierde_calzador",
+    "no_se_puede_calzar",
+)
+CODIGO_RESULTADO = {resultado: i for i, resultado in enumerate(RESULTADOS)}
+
+# tipo (B), jugador, cantidad y detalle (H), partida, ronda y datos (I)
+FORMATO_REGISTRO = struct.Struct("<BHHHIII")
+_CABECERA = struct.Struct("<6sH")
+_MAGIA = b"DUDODI"
+_BITS_CARA = 3
+MAX_DADOS_REGISTRO = 32 // _BITS_CARA
+
+Registro = namedtuple("Registro", "tipo jugador cantidad detalle partida ronda datos")
+
+
+def empaquetar_caras(caras):
+    """Empaqueta caras (índices de 0 a 5) en un entero de 3 bits por dado."""
+    if len(caras) > MAX_DADOS_REGISTRO:
+        raise ValueError("Demasiados dados para un registro")
+    datos = 0
+    for i, cara in enumerate(caras):
+        datos |= cara << (_BITS_CARA * i)
+    return datos
+
+
+def desempaquetar_caras(datos, cantidad):
+    """Inverso de empaquetar_caras."""
+    return [(datos >> (_BITS_CARA * i)) & 0b111 for i in range(cantidad)]
+
+
+_PATRON_NUMERO = ".[0-9][0-9][0-9][0-9][0-9]"
+
+
+def ruta_archivo(ruta_base, numero):
+    return f"{ruta_base}.{numero:05d}"
+
+
+def archivos_diario(ruta_base):
+    """Retorna los archivos rotados de un diario, en orden."""
+    return sorted(glob.glob(glob.escape(str(ruta_base)) + _PATRON_NUMERO))
+
+
+class EscritorDiario:
+    def __init__(
+        self, ruta_base, registros_por_bloque=4096, max_bytes_archivo=64 * 2**20
+    ):
+        """
+        Escribe en `ruta_base`.00000, `ruta_base`.00001, ... Cada archivo
+        rota al superar `max_bytes_archivo`, pero solo al iniciar una partida.
+        """
+        self.ruta_base = ruta_base
+        self.max_bytes_archivo = max_bytes_archivo
+        self._buffer = bytearray(FORMATO_REGISTRO.size * registros_por_bloque)
+        self._posicion = 0
+        self._numero_archivo = -1
+        self._archivo = None
+        self._bytes_archivo = 0
+        self.partida = 0
+        self._partidas_iniciadas = 0
+        self._abrir_siguiente()
+
+    def _abrir_siguiente(self):
+        if self._archivo is not None:
+            self._archivo.close()
+        self._numero_archivo += 1
+        ruta = ruta_archivo(self.ruta_base, self._numero_archivo)
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(_CABECERA.pack(_MAGIA, FORMATO_REGISTRO.size))
+        self._bytes_archivo = _CABECERA.size
+
+    def registrar(self, tipo, ronda=0, jugador=0, cantidad=0, detalle=0, datos=0):
+        """
+        Agrega un registro de la partida actual al buffer. Lanza ValueError,
+        sin escribir nada, si un campo no cabe en su ancho.
+        """
+        if self._posicion == len(self._buffer):
+            self.vaciar()
+        try:
+            FORMATO_REGISTRO.pack_into(
+                self._buffer,
+                self._posicion,
+                tipo,
+                jugador,
+                cantidad,
+                detalle,
+                self.partida,
+                ronda,
+                datos,
+            )
+        except struct.error as error:
+            raise ValueError(f"Registro fuera de rango: {error}") from error
+        self._posicion += FORMATO_REGISTRO.size
+
+    def iniciar_partida(self, num_jugadores, dados_por_jugador):
+        """Comienza una partida nueva, rotando el archivo si corresponde."""
+        if self._bytes_archivo + self._posicion >= self.max_bytes_archivo:
+            self.vaciar()
+            self._abrir_siguiente()
+        self.partida = self._partidas_iniciadas
+        self._partidas_iniciadas += 1
+        self.registrar(
+            INICIO_PARTIDA, cantidad=num_jugadores, detalle=dados_por_jugador
+        )
+        return self.partida
+
+    def vaciar(self):
+        """Escribe en el archivo los registros acumulados en el buffer."""
+        if self._posicion:
+            self._archivo.write(memoryview(self._buffer)[: self._posicion])
+            self._bytes_archivo += self._posicion
+            self._posicion = 0
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self.vaciar()
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+def leer_archivo(ruta, registros_por_bloque=4096):
+    """Itera los registros de un archivo de diario leyéndolo por bloques."""
+    tamano = FORMATO_REGISTRO.size
+    with open(ruta, "rb") as archivo:
+        magia, ancho = _CABECERA.unpack(archivo.read(_CABECERA.size))
+        if magia != _MAGIA or ancho != tamano:
+            raise ValueError(f"{ruta} no es un diario de partidas")
+        while True:
+            bloque = archivo.read(tamano * registros_por_bloque)
+            if not bloque:
+                return
+            util = len(bloque) - len(bloque) % tamano
+            for campos in FORMATO_REGISTRO.iter_unpack(bloque[:util]):
+                yield Registro._make(campos)
+
+
+def leer_diario(ruta_base, registros_por_bloque=4096):
+    """Itera de forma perezosa todos los registros de un diario rotado."""
+    for ruta in archivos_diario(ruta_base):
+        yield from leer_archivo(ruta, registros_por_bloque)
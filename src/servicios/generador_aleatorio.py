@@ -1,12 +1,153 @@
 # src/servicios/generador_aleatorio.py
+import hashlib
 import random
 
+# Caras de un dado (índices 0 a 5) que se obtienen de un bloque de 13 bits:
+# 6**5 = 7776 de 8192 valores son aceptados (~95%), el resto se rechaza
+# para que la distribución no tenga sesgo.
+_CARAS = 6
+_CARAS_POR_BLOQUE = 5
+_BITS_POR_BLOQUE = 13
+_LIMITE_BLOQUE = _CARAS**_CARAS_POR_BLOQUE
+_BLOQUES_POR_RELLENO = 64
+
+
+def _tabla_bloques():
+    """Las caras de cada bloque aceptado, en el orden en que se agregan."""
+    tabla = []
+    for valor in range(_LIMITE_BLOQUE):
+        caras = []
+        for _ in range(_CARAS_POR_BLOQUE):
+            valor, cara = divmod(valor, _CARAS)
+            caras.append(cara)
+        tabla.append(tuple(caras))
+    return tuple(tabla)
+
+
+# Decodificar un bloque es una búsqueda en vez de cinco divmod
+_CARAS_DE_BLOQUE = _tabla_bloques()
+
+BACKENDS = ("random", "numpy")
+
+
+def _semilla_derivada(entropia, clave):
+    """Mezcla la entropía y la clave de un hijo en una semilla de 128 bits."""
+    datos = f"{entropia}:{':'.join(map(str, clave))}".encode()
+    return int.from_bytes(hashlib.blake2b(datos, digest_size=16).digest(), "big")
+
 
 class GeneradorAleatorio:
-    def __init__(self, semilla: int = None):
+    def __init__(
+        self, semilla: int = None, backend: str = "random", _clave: tuple = ()
+    ):
+        """
+        Crea un generador independiente. Con backend="numpy" se usa un
+        numpy.random.Generator en vez de random.Random.
+        Sin semilla se toma entropía del sistema, que queda guardada para
+        poder derivar generadores hijos con spawn.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend}")
+        if semilla is None:
+            semilla = random.SystemRandom().getrandbits(128)
+        self.backend = backend
+        self._entropia = semilla
+        self._clave = _clave
+        self._hijos_creados = 0
         # cada instancia tiene su propio generador independiente
-        self._random = random.Random(semilla)
+        self._numpy = None
+        if backend == "numpy":
+            import numpy as np
+
+            semillas = np.random.SeedSequence(semilla, spawn_key=_clave)
+            self._numpy = np.random.default_rng(semillas)
+        # el generador raíz usa la semilla tal cual, para que
+        # GeneradorAleatorio(semilla) siga dando la misma secuencia
+        if _clave:
+            self._random = random.Random(_semilla_derivada(semilla, _clave))
+        else:
+            self._random = random.Random(semilla)
+        self._caras = []
+
+    def spawn(self, n: int):
+        """
+        Retorna n generadores hijos con flujos estadísticamente
+        independientes, al estilo de numpy.random.SeedSequence.spawn.
+        Cada hijo queda determinado por la semilla del padre y su posición,
+        así que llamadas sucesivas a spawn entregan hijos nuevos y una misma
+        semilla reproduce siempre los mismos hijos.
+        """
+        hijos = [
+            GeneradorAleatorio(
+                self._entropia,
+                backend=self.backend,
+                _clave=self._clave + (self._hijos_creados + i,),
+            )
+            for i in range(n)
+        ]
+        self._hijos_creados += n
+        return hijos
+
+    @property
+    def generador_numpy(self):
+        """El numpy.random.Generator interno, o None con el backend random."""
+        return self._numpy
 
     def generar_entero(self, minimo: int, maximo: int):
         """Devuelve un número entero aleatorio dentro del intervalo definido."""
+        if self._numpy is not None:
+            return int(self._numpy.integers(minimo, maximo + 1))
         return self._random.randint(minimo, maximo)
+
+    def generar_enteros(self, minimo: int, maximo: int, n: int):
+        """
+        Devuelve una lista de n enteros aleatorios dentro del intervalo,
+        sacando los bits de muchos valores en una sola llamada a getrandbits
+        y rechazando los que quedan fuera del rango. Como random.randint,
+        lanza ValueError si el intervalo está vacío.
+        """
+        if maximo < minimo:
+            raise ValueError(f"Intervalo vacío: [{minimo}, {maximo}]")
+        if self._numpy is not None:
+            return self._numpy.integers(minimo, maximo + 1, size=n).tolist()
+        rango = maximo - minimo + 1
+        bits = (rango - 1).bit_length()
+        if bits == 0:
+            return [minimo] * n
+        mascara = (1 << bits) - 1
+        valores = []
+        while len(valores) < n:
+            faltan = n - len(valores)
+            bloque = self._random.getrandbits(bits * faltan)
+            for _ in range(faltan):
+                valor = bloque & mascara
+                bloque >>= bits
+                if valor < rango:
+                    valores.append(minimo + valor)
+        return valores
+
+    def generar_caras(self, n: int):
+        """
+        Devuelve una lista de n caras de dado como índices de 0 a 5
+        (el mismo rango que usa Dado con generar_entero(0, 5)).
+        Las caras se sacan de un buffer que se rellena de a muchos dados.
+        """
+        if self._numpy is not None:
+            return self._numpy.integers(0, _CARAS, size=n).tolist()
+        caras = self._caras
+        while len(caras) < n:
+            self._rellenar_caras()
+        resultado = caras[len(caras) - n :]
+        del caras[len(caras) - n :]
+        return resultado
+
+    def _rellenar_caras(self):
+        mascara = (1 << _BITS_POR_BLOQUE) - 1
+        bloque = self._random.getrandbits(_BITS_POR_BLOQUE * _BLOQUES_POR_RELLENO)
+        caras = self._caras
+        tabla = _CARAS_DE_BLOQUE
+        for _ in range(_BLOQUES_POR_RELLENO):
+            valor = bloque & mascara
+            bloque >>= _BITS_POR_BLOQUE
+            if valor < _LIMITE_BLOQUE:
+                caras.extend(tabla[valor])
@@ -0,0 +1,235 @@
+"""
+Métricas opcionales de GestorPartida: contadores por tipo de acción e
+histogramas de latencia, exportables como JSON o texto de Prometheus.
+
+La instrumentación reemplaza métodos de una instancia de GestorPartida
+(y de su ArbitroRonda) por versiones que miden el tiempo, sin tocar las
+clases: un gestor sin métricas ejecuta exactamente el mismo código que
+antes. Los tiempos de cada histograma incluyen a los métodos que llama
+(elegir_accion incluye _finalizar_ronda, que incluye nueva_ronda, etc.).
+"""
+
+import bisect
+import json
+import time
+
+# Límites superiores de los buckets de latencia, en segundos
+LIMITES_SEGUNDOS = (
+    1e-6,
+    2.5e-6,
+    5e-6,
+    1e-5,
+    2.5e-5,
+    5e-5,
+    1e-4,
+    2.5e-4,
+    5e-4,
+    1e-3,
+    2.5e-3,
+    5e-3,
+    1e-2,
+    2.5e-2,
+    5e-2,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+class Histograma:
+    __slots__ = ("limites", "buckets", "suma", "cantidad")
+
+    def __init__(self, limites=LIMITES_SEGUNDOS):
+        self.limites = tuple(limites)
+        self.buckets = [0] * (len(self.limites) + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.cantidad = 0
+
+    def observar(self, valor):
+        self.buckets[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cantidad += 1
+
+    def percentil(self, fraccion):
+        """Límite del bucket donde cae el percentil (inf si excede el último)."""
+        objetivo = fraccion * self.cantidad
+        acumulado = 0
+        for limite, cantidad in zip(self.limites + (float("inf"),), self.buckets):
+            acumulado += cantidad
+            if acumulado >= objetivo and acumulado > 0:
+                return limite
+        return 0.0
+
+
+def _etiquetas(etiquetas):
+    return tuple(sorted(etiquetas.items()))
+
+
+def _formato_etiquetas(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pares) + "}"
+
+
+def _nombre_json(nombre, etiquetas):
+    return nombre + _formato_etiquetas(etiquetas)
+
+
+class Metricas:
+    """Registro de contadores e histogramas identificados por nombre y etiquetas."""
+
+    def __init__(self, limites=LIMITES_SEGUNDOS):
+        self.limites = limites
+        self.contadores = {}  # (nombre, etiquetas) -> int
+        self.histogramas = {}  # (nombre, etiquetas) -> Histograma
+
+    def incrementar(self, nombre, cantidad=1, **etiquetas):
+        llave = (nombre, _etiquetas(etiquetas))
+        self.contadores[llave] = self.contadores.get(llave, 0) + cantidad
+
+    def histograma(self, nombre, **etiquetas):
+        """Retorna (creándolo si no existe) el histograma con esas etiquetas."""
+        llave = (nombre, _etiquetas(etiquetas))
+        histograma = self.histogramas.get(llave)
+        if histograma is None:
+            histograma = self.histogramas[llave] = Histograma(self.limites)
+        return histograma
+
+    def observar(self, nombre, valor, **etiquetas):
+        self.histograma(nombre, **etiquetas).observar(valor)
+
+    def instantanea(self):
+        """Retorna un dict con todos los valores, listo para json.dumps."""
+        return {
+            "contadores": {
+                _nombre_json(nombre, etiquetas): valor
+                for (nombre, etiquetas), valor in sorted(self.contadores.items())
+            },
+            "histogramas": {
+                _nombre_json(nombre, etiquetas): {
+                    "cantidad": h.cantidad,
+                    "suma": h.suma,
+                    "p50": h.percentil(0.5),
+                    "p99": h.percentil(0.99),
+                    "limites": list(h.limites),
+                    "buckets": list(h.buckets),
+                }
+                for (nombre, etiquetas), h in sorted(self.histogramas.items())
+            },
+        }
+
+    def exportar_json(self):
+        return json.dumps(self.instantanea())
+
+    def exportar_prometheus(self, prefijo="dudo"):
+        """Retorna las métricas en el formato de texto de Prometheus."""
+        lineas = []
+        tipos_escritos = set()
+        for (nombre, etiquetas), valor in sorted(self.contadores.items()):
+            completo = f"{prefijo}_{nombre}"
+            if completo not in tipos_escritos:
+                tipos_escritos.add(completo)
+                lineas.append(f"# TYPE {completo} counter")
+            lineas.append(f"{completo}{_formato_etiquetas(etiquetas)} {valor}")
+        for (nombre, etiquetas), h in sorted(self.histogramas.items()):
+            completo = f"{prefijo}_{nombre}"
+            if completo not in tipos_escritos:
+                tipos_escritos.add(completo)
+                lineas.append(f"# TYPE {completo} histogram")
+            acumulado = 0
+            for limite, cantidad in zip(h.limites + ("+Inf",), h.buckets):
+                acumulado += cantidad
+                le = _formato_etiquetas(etiquetas, (("le", limite),))
+                lineas.append(f"{completo}_bucket{le} {acumulado}")
+            sufijo = _formato_etiquetas(etiquetas)
+            lineas.append(f"{completo}_sum{sufijo} {h.suma}")
+            lineas.append(f"{completo}_count{sufijo} {h.cantidad}")
+        return "\n".join(lineas) + "\n"
+
+
+def _medir_elegir_accion(metricas, original):
+    reloj = time.perf_counter
+    histogramas = {}
+
+    def elegir_accion(jugador, accion):
+        inicio = reloj()
+        resultado = original(jugador, accion)
+        duracion = reloj() - inicio
+        tipo = accion.get("tipo")
+        histograma = histogramas.get(tipo)
+        if histograma is None:
+            histograma = histogramas[tipo] = metricas.histograma(
+                "elegir_accion_segundos", tipo=tipo
+            )
+        histograma.observar(duracion)
+        metricas.incrementar("acciones_total", tipo=tipo)
+        if "resultado" in resultado:
+            metricas.incrementar("resultados_total", resultado=resultado["resultado"])
+        elif not resultado.get("valida", True):
+            metricas.incrementar("apuestas_invalidas_total")
+        return resultado
+
+    return elegir_accion
+
+
+def _medir(histograma, original):
+    reloj = time.perf_counter
+
+    def medido(*argumentos):
+        inicio = reloj()
+        resultado = original(*argumentos)
+        histograma.observar(reloj() - inicio)
+        return resultado
+
+    return medido
+
+
+# Métodos de GestorPartida (y de su árbitro) que se miden, con su histograma
+MEDIDOS_GESTOR = {
+    "_finalizar_ronda": "finalizar_ronda_segundos",
+    "nueva_ronda": "nueva_ronda_segundos",
+    "agitar_cachos": "agitar_cachos_segundos",
+    "_debe_actualizar_regla_especial": "regla_especial_segundos",
+}
+MEDIDOS_ARBITRO = {"_contar": "contar_segundos"}
+
+
+def _reemplazar(objeto, nombre, nuevo, originales):
+    # Se guarda lo que había en la instancia (por ejemplo un agitar_cachos
+    # ya reemplazado) para restaurarlo al quitar la instrumentación
+    originales.append((objeto, nombre, objeto.__dict__.get(nombre)))
+    setattr(objeto, nombre, nuevo)
+
+
+def instrumentar(gestor, metricas):
+    """
+    Reemplaza en `gestor` los métodos medidos por versiones que registran
+    en `metricas`. Retorna la lista de originales para `quitar`.
+    """
+    originales = []
+    _reemplazar(
+        gestor,
+        "elegir_accion",
+        _medir_elegir_accion(metricas, gestor.elegir_accion),
+        originales,
+    )
+    for nombre, histograma in MEDIDOS_GESTOR.items():
+        original = getattr(gestor, nombre)
+        nuevo = _medir(metricas.histograma(histograma), original)
+        _reemplazar(gestor, nombre, nuevo, originales)
+    for nombre, histograma in MEDIDOS_ARBITRO.items():
+        original = getattr(gestor.arbitro, nombre)
+        nuevo = _medir(metricas.histograma(histograma), original)
+        _reemplazar(gestor.arbitro, nombre, nuevo, originales)
+    return originales
+
+
+def quitar(originales):
+    """Deshace `instrumentar` dejando los métodos como estaban."""
+    for objeto, nombre, anterior in reversed(originales):
+        if anterior is None:
+            del objeto.__dict__[nombre]
+        else:
+            setattr(objeto, nombre, anterior)
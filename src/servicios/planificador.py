@@ -0,0 +1,365 @@
+"""
+Planificador que reparte mesas de Dudo entre procesos trabajadores.
+
+Cada mesa se asigna a un trabajador con hashing consistente sobre su
+nombre, así que agregar o quitar un trabajador solo mueve una fracción de
+las mesas. Cada trabajador es dueño de los GestorPartida de sus mesas y
+juega en ellas los turnos de los bots (lo que más CPU consume), de modo
+que la capacidad crece con la cantidad de núcleos.
+
+Las acciones de los jugadores llegan a los trabajadores por pipes, en
+lotes: `ejecutar` agrupa los comandos por trabajador, envía todos los
+lotes y recién después espera las respuestas, así los trabajadores
+procesan en paralelo. Una mesa se migra serializando su GestorPartida
+completo (con su generador), por lo que la partida sigue exactamente
+igual en el trabajador de destino.
+"""
+
+import bisect
+import hashlib
+import multiprocessing
+import os
+import pickle
+
+from src.juego.gestor_partida import GestorPartida
+from src.juego.observacion import construir_observacion
+from src.juego.validador_apuesta import Apuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import avanzar_turno
+from src.simulacion.politicas import crear_politica
+
+
+def _hash(llave):
+    digesto = hashlib.blake2b(str(llave).encode(), digest_size=8).digest()
+    return int.from_bytes(digesto, "big")
+
+
+class AnilloConsistente:
+    """
+    Anillo de hashing consistente: cada nodo ocupa `replicas` puntos del
+    anillo y una llave pertenece al primer punto que la sigue.
+    """
+
+    def __init__(self, nodos=(), replicas=64):
+        self.replicas = replicas
+        self._puntos = []
+        self._nodos = []
+        for nodo in nodos:
+            self.agregar(nodo)
+
+    def agregar(self, nodo):
+        for replica in range(self.replicas):
+            punto = _hash(f"{nodo}#{replica}")
+            i = bisect.bisect(self._puntos, punto)
+            self._puntos.insert(i, punto)
+            self._nodos.insert(i, nodo)
+
+    def quitar(self, nodo):
+        conservar = [i for i, n in enumerate(self._nodos) if n != nodo]
+        self._puntos = [self._puntos[i] for i in conservar]
+        self._nodos = [self._nodos[i] for i in conservar]
+
+    def nodo_de(self, llave):
+        if not self._puntos:
+            raise ValueError("El anillo no tiene nodos")
+        i = bisect.bisect(self._puntos, _hash(llave)) % len(self._puntos)
+        return self._nodos[i]
+
+
+class _Mesa:
+    __slots__ = ("gestor", "politicas")
+
+    def __init__(self, gestor, politicas):
+        self.gestor = gestor
+        self.politicas = politicas  # None en los asientos de jugadores remotos
+
+
+def _accion_valida(accion):
+    """Indica si la acción tiene la forma que espera GestorPartida."""
+    if not isinstance(accion, dict):
+        return False
+    tipo = accion.get("tipo")
+    if tipo == "apuesta":
+        return isinstance(accion.get("apuesta"), Apuesta)
+    return tipo in ("dudar", "calzar")
+
+
+def _jugar(mesa, jugador, accion, jugadas):
+    """Aplica la acción y la anota en `jugadas`; retorna False si es inválida."""
+    gestor = mesa.gestor
+    if accion.get("tipo") != "apuesta" and gestor.ultima_apuesta is None:
+        return False
+    apostador = gestor.jugador_ultima_apuesta
+    resultado = gestor.elegir_accion(jugador, accion)
+    if accion["tipo"] == "apuesta" and not resultado["valida"]:
+        return False
+    avanzar_turno(gestor, jugador, apostador, accion, resultado)
+    jugadas.append((jugador, accion, resultado))
+    return True
+
+
+def _jugar_bots(mesa, jugadas):
+    """Juega los turnos de los bots hasta que le toque a un jugador remoto."""
+    gestor = mesa.gestor
+    while not gestor.hay_ganador():
+        jugador = gestor.jugador_actual
+        politica = mesa.politicas[jugador]
+        if politica is None:
+            return
+        if not _jugar(mesa, jugador, politica(gestor, jugador), jugadas):
+            raise ValueError(f"El bot del asiento {jugador} hizo una acción inválida")
+
+
+def _estado(mesas, nombre, mesa, jugadas):
+    gestor = mesa.gestor
+    respuesta = {"jugadas": jugadas, "turno": gestor.jugador_actual}
+    if gestor.hay_ganador():
+        respuesta["ganador"] = gestor.jugadores_activos()[0]
+        del mesas[nombre]
+    return respuesta
+
+
+def _ejecutar(mesas, comando):
+    operacion, nombre, *argumentos = comando
+    if operacion == "crear":
+        num_jugadores, dados, politicas, generador = argumentos
+        gestor = GestorPartida(
+            num_jugadores=num_jugadores,
+            dados_por_jugador=dados,
+            generador=generador,
+            compacto=True,
+        )
+        gestor.set_jugador_inicial(gestor.determinar_jugador_inicial())
+        bots = generador.spawn(1)[0]
+        mesa = _Mesa(
+            gestor,
+            [None if p is None else crear_politica(p, bots) for p in politicas],
+        )
+        mesas[nombre] = mesa
+        jugadas = []
+        try:
+            _jugar_bots(mesa, jugadas)
+        except Exception:
+            del mesas[nombre]
+            raise
+        return _estado(mesas, nombre, mesa, jugadas)
+    if operacion == "importar":
+        mesas[nombre] = pickle.loads(argumentos[0])
+        return {}
+    mesa = mesas.get(nombre)
+    if mesa is None:
+        return {"error": f"No existe la mesa {nombre}"}
+    if operacion == "accion":
+        jugador, accion = argumentos
+        if jugador != mesa.gestor.jugador_actual:
+            return {"error": "No es el turno del jugador"}
+        if not _accion_valida(accion):
+            return {"error": "Acción mal formada"}
+        jugadas = []
+        estado = mesa.gestor.snapshot()
+        try:
+            if not _jugar(mesa, jugador, accion, jugadas):
+                return {"error": "Acción inválida"}
+            _jugar_bots(mesa, jugadas)
+        except Exception:
+            # Una mesa a medio avanzar quedaría trabada en el turno de un bot
+            mesa.gestor.restore(estado)
+            raise
+        return _estado(mesas, nombre, mesa, jugadas)
+    if operacion == "observar":
+        return {"observacion": construir_observacion(mesa.gestor, argumentos[0])}
+    if operacion == "exportar":
+        return {"estado": pickle.dumps(mesas.pop(nombre))}
+    return {"error": f"Operación desconocida: {operacion}"}
+
+
+def _trabajador(conexion):
+    """Ciclo de un proceso trabajador: recibe lotes y responde en orden."""
+    mesas = {}
+    while True:
+        lote = conexion.recv()
+        if lote is None:
+            break
+        respuestas = []
+        for comando in lote:
+            try:
+                respuestas.append(_ejecutar(mesas, comando))
+            except Exception as error:
+                # Un comando con errores no debe detener al trabajador
+                respuestas.append({"error": str(error) or type(error).__name__})
+        conexion.send(respuestas)
+    conexion.close()
+
+
+class Planificador:
+    def __init__(
+        self,
+        num_trabajadores=None,
+        generador: GeneradorAleatorio = None,
+        replicas=64,
+        max_mesas_por_trabajador=None,
+    ):
+        """
+        Inicia `num_trabajadores` procesos (por defecto uno por núcleo).
+        Cada mesa recibe un generador hijo del generador del planificador
+        en el orden en que se crea, así que las partidas no dependen de la
+        cantidad de trabajadores. Hay que llamar a cerrar() al terminar.
+        """
+        if num_trabajadores is None:
+            num_trabajadores = os.cpu_count() or 1
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        self.max_mesas_por_trabajador = max_mesas_por_trabajador
+        self.anillo = AnilloConsistente(range(num_trabajadores), replicas)
+        self.ubicacion = {}  # mesa -> trabajador
+        self.cargas = [0] * num_trabajadores
+        self._conexiones = []
+        self._procesos = []
+        for _ in range(num_trabajadores):
+            propia, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_trabajador, args=(remota,), daemon=True
+            )
+            proceso.start()
+            remota.close()
+            self._conexiones.append(propia)
+            self._procesos.append(proceso)
+
+    @property
+    def num_trabajadores(self):
+        return len(self._conexiones)
+
+    def trabajador_de(self, mesa):
+        """Trabajador que tiene la mesa, o al que el anillo la asignaría."""
+        trabajador = self.ubicacion.get(mesa)
+        if trabajador is None:
+            trabajador = self.anillo.nodo_de(mesa)
+        return trabajador
+
+    def _ubicar(self, mesa, pendientes):
+        """
+        Elige el trabajador de una mesa nueva: el del anillo, salvo que ya
+        tenga el máximo de mesas, en cuyo caso el menos cargado. Las cargas
+        cuentan también las mesas `pendientes` de confirmar en este lote.
+        """
+        cargas = [c + p for c, p in zip(self.cargas, pendientes)]
+        trabajador = self.anillo.nodo_de(mesa)
+        maximo = self.max_mesas_por_trabajador
+        if maximo is not None and cargas[trabajador] >= maximo:
+            trabajador = min(range(self.num_trabajadores), key=cargas.__getitem__)
+        return trabajador
+
+    def ejecutar(self, comandos):
+        """
+        Ejecuta una lista de comandos y retorna sus respuestas en el mismo
+        orden. Los comandos son tuplas (operación, mesa, argumentos...):
+            ("crear", mesa, num_jugadores, dados, politicas)
+            ("accion", mesa, jugador, accion)
+            ("observar", mesa, jugador)
+        `politicas` tiene un nombre de crear_politica por asiento de bot y
+        None por asiento de jugador remoto. Cada respuesta es un dict con
+        las jugadas hechas, el turno siguiente y el ganador si terminó la
+        partida, o con "error". Una mesa nueva solo queda registrada cuando
+        su trabajador confirma que la creó.
+        """
+        lotes = [[] for _ in range(self.num_trabajadores)]
+        posiciones = [[] for _ in range(self.num_trabajadores)]
+        nuevas = {}  # mesa -> trabajador, hasta que el trabajador la confirme
+        pendientes = [0] * self.num_trabajadores
+        for posicion, comando in enumerate(comandos):
+            mesa = comando[1]
+            if comando[0] == "crear":
+                if mesa in self.ubicacion or mesa in nuevas:
+                    raise ValueError(f"La mesa {mesa} ya existe")
+                trabajador = self._ubicar(mesa, pendientes)
+                nuevas[mesa] = trabajador
+                pendientes[trabajador] += 1
+                comando = tuple(comando) + (self.generador.spawn(1)[0],)
+            else:
+                trabajador = nuevas.get(mesa)
+                if trabajador is None:
+                    trabajador = self.trabajador_de(mesa)
+            lotes[trabajador].append(comando)
+            posiciones[trabajador].append(posicion)
+        for conexion, lote in zip(self._conexiones, lotes):
+            if lote:
+                conexion.send(lote)
+        respuestas = [None] * len(comandos)
+        for trabajador, (conexion, lote) in enumerate(zip(self._conexiones, lotes)):
+            if not lote:
+                continue
+            for posicion, respuesta in zip(posiciones[trabajador], conexion.recv()):
+                respuestas[posicion] = respuesta
+                operacion, mesa = comandos[posicion][:2]
+                if operacion == "crear" and "error" not in respuesta:
+                    self.ubicacion[mesa] = trabajador
+                    self.cargas[trabajador] += 1
+                if "ganador" in respuesta:
+                    self._liberar(comandos[posicion][1])
+        return respuestas
+
+    def _liberar(self, mesa):
+        trabajador = self.ubicacion.pop(mesa, None)
+        if trabajador is not None:
+            self.cargas[trabajador] -= 1
+
+    def crear_mesa(self, mesa, num_jugadores=2, dados=5, politicas=None):
+        if politicas is None:
+            politicas = [None] * num_jugadores
+        return self.ejecutar([("crear", mesa, num_jugadores, dados, politicas)])[0]
+
+    def accion(self, mesa, jugador, accion):
+        return self.ejecutar([("accion", mesa, jugador, accion)])[0]
+
+    def observar(self, mesa, jugador):
+        return self.ejecutar([("observar", mesa, jugador)])[0]["observacion"]
+
+    def migrar(self, mesa, destino):
+        """Mueve la mesa, con todo su estado, al trabajador `destino`."""
+        origen = self.ubicacion[mesa]
+        if origen == destino:
+            return
+        self._conexiones[origen].send([("exportar", mesa)])
+        estado = self._conexiones[origen].recv()[0]["estado"]
+        self._conexiones[destino].send([("importar", mesa, estado)])
+        self._conexiones[destino].recv()
+        self.ubicacion[mesa] = destino
+        self.cargas[origen] -= 1
+        self.cargas[destino] += 1
+
+    def rebalancear(self, umbral=1):
+        """
+        Migra mesas del trabajador más cargado al menos cargado hasta que
+        la diferencia de mesas entre ellos sea a lo más `umbral`.
+        Retorna la cantidad de mesas migradas.
+        """
+        migradas = 0
+        por_trabajador = [[] for _ in range(self.num_trabajadores)]
+        for mesa, trabajador in self.ubicacion.items():
+            por_trabajador[trabajador].append(mesa)
+        while True:
+            cargado = max(range(self.num_trabajadores), key=self.cargas.__getitem__)
+            libre = min(range(self.num_trabajadores), key=self.cargas.__getitem__)
+            if self.cargas[cargado] - self.cargas[libre] <= umbral:
+                return migradas
+            mesa = por_trabajador[cargado].pop()
+            self.migrar(mesa, libre)
+            por_trabajador[libre].append(mesa)
+            migradas += 1
+
+    def cerrar(self):
+        for conexion in self._conexiones:
+            try:
+                conexion.send(None)
+            except OSError:
+                pass  # el trabajador ya terminó
+            conexion.close()
+        for proceso in self._procesos:
+            proceso.join()
+        self._conexiones = []
+        self._procesos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
@@ -0,0 +1,397 @@
+"""
+Servidor asyncio con muchas mesas de Dudo independientes sobre TCP local.
+
+Protocolo: cada mensaje es un objeto JSON en una línea (UTF-8, terminada
+en "\\n"). Cada conexión ocupa un asiento de una mesa.
+
+Del cliente al servidor, con el mismo "tipo" que las acciones de
+GestorPartida.elegir_accion:
+    {"tipo": "unirse", "mesa": "m1", "jugadores": 3, "dados": 5}
+    {"tipo": "apuesta", "cantidad": 3, "pinta": 4}   (pinta de 1 a 6)
+    {"tipo": "dudar"}
+    {"tipo": "calzar"}
+
+Del servidor al cliente:
+    {"evento": "sentado", "mesa": "m1", "asiento": 0, "jugadores": 3}
+    {"evento": "inicio", "mesa": "m1"}
+    {"evento": "turno", "jugador": 0, "dados": [...], ...}  (solo al que juega)
+    {"evento": "accion", "jugador": 0, "tipo": "dudar", "resultado": ...}
+    {"evento": "fin", "ganador": 1}
+    {"evento": "error", "mensaje": "..."}
+
+Si el jugador no actúa dentro de `tiempo_turno` segundos (o se desconectó)
+el servidor juega por él: duda si hay apuesta y si no abre con 1 TONTO.
+Resolver una acción toma microsegundos, así que se hace dentro del loop;
+los envíos no esperan a `drain` y un cliente que no lee se desconecta
+cuando su buffer de salida supera `max_buffer`. Una mesa sin partida no
+crea su GestorPartida, y las partidas usan cachos compactos.
+"""
+
+import asyncio
+import json
+
+from src.juego.contador_pintas import leer_pintas
+from src.juego.dado import PINTAS, Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import avanzar_turno
+
+APERTURA_POR_TIEMPO = Apuesta.obtener(1, Pinta.TONTO)
+
+
+class ErrorProtocolo(Exception):
+    """Mensaje de un cliente que no se puede procesar."""
+
+
+class _Conexion:
+    __slots__ = ("writer", "tarea", "mesa", "asiento")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.tarea = asyncio.current_task()
+        self.mesa = None
+        self.asiento = None
+
+
+class Mesa:
+    __slots__ = (
+        "nombre",
+        "num_jugadores",
+        "dados_por_jugador",
+        "conexiones",
+        "gestor",
+        "temporizador",
+    )
+
+    def __init__(self, nombre, num_jugadores, dados_por_jugador):
+        self.nombre = nombre
+        self.num_jugadores = num_jugadores
+        self.dados_por_jugador = dados_por_jugador
+        self.conexiones = [None] * num_jugadores
+        self.gestor = None  # se crea al completarse la mesa
+        self.temporizador = None
+
+    def asiento_libre(self):
+        for asiento, conexion in enumerate(self.conexiones):
+            if conexion is None:
+                return asiento
+        return None
+
+    def vacia(self):
+        return all(conexion is None for conexion in self.conexiones)
+
+
+def _codificar(mensaje):
+    return json.dumps(mensaje, separators=(",", ":")).encode() + b"\n"
+
+
+def _mensaje_turno(mesa, jugador, tiempo_turno):
+    gestor = mesa.gestor
+    # Solo los dados que el jugador ve, sin cambiar la visibilidad del cacho
+    pintas = leer_pintas(gestor.jugadores[jugador].cacho, jugador) or ()
+    apuesta = gestor.ultima_apuesta
+    return {
+        "evento": "turno",
+        "mesa": mesa.nombre,
+        "jugador": jugador,
+        "dados": [pinta.value for pinta in pintas],
+        "dados_por_jugador": [c.get_cantidad_dados() for c in gestor.cachos],
+        "ultima_apuesta": (
+            None
+            if apuesta is None
+            else [apuesta.get_cantidad(), apuesta.get_pinta().value]
+        ),
+        "jugador_ultima_apuesta": gestor.jugador_ultima_apuesta,
+        "ases_comodin": gestor.arbitro.usar_ases_comodin,
+        "ronda": gestor.ronda_actual,
+        "plazo": tiempo_turno,
+    }
+
+
+class ServidorDudo:
+    def __init__(
+        self,
+        tiempo_turno=30.0,
+        generador: GeneradorAleatorio = None,
+        max_jugadores=8,
+        max_dados=5,
+        max_linea=4096,
+        max_buffer=64 * 1024,
+        backlog=4096,
+    ):
+        """
+        Cada mesa usa un generador hijo del generador del servidor, así que
+        con una semilla las partidas son reproducibles para las mismas
+        acciones.
+        """
+        self.tiempo_turno = tiempo_turno
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        self.max_jugadores = max_jugadores
+        self.max_dados = max_dados
+        self.max_linea = max_linea
+        self.max_buffer = max_buffer
+        self.backlog = backlog
+        self.mesas = {}
+        self.conexiones = set()
+        self.acciones = 0
+        self.partidas_terminadas = 0
+        self._servidor = None
+        self._loop = None
+
+    @property
+    def puerto(self):
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def iniciar(self, host="127.0.0.1", puerto=0):
+        """Empieza a escuchar; con puerto=0 se elige un puerto libre."""
+        self._loop = asyncio.get_running_loop()
+        self._servidor = await asyncio.start_server(
+            self._atender, host, puerto, limit=self.max_linea, backlog=self.backlog
+        )
+        return self
+
+    async def servir_siempre(self):
+        await self._servidor.serve_forever()
+
+    async def cerrar(self):
+        for mesa in list(self.mesas.values()):
+            self._cerrar_mesa(mesa)
+        conexiones = list(self.conexiones)
+        for conexion in conexiones:
+            conexion.writer.close()
+        # Al cerrar el writer cada conexión lee fin de archivo y termina
+        await asyncio.gather(
+            *(conexion.tarea for conexion in conexiones), return_exceptions=True
+        )
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+
+    async def __aenter__(self):
+        if self._servidor is None:
+            await self.iniciar()
+        return self
+
+    async def __aexit__(self, tipo, valor, traza):
+        await self.cerrar()
+
+    async def _atender(self, reader, writer):
+        conexion = _Conexion(writer)
+        self.conexiones.add(conexion)
+        try:
+            while not writer.is_closing():
+                try:
+                    linea = await reader.readline()
+                except (ValueError, ConnectionError):
+                    # Línea más larga que max_linea o conexión cortada
+                    break
+                if not linea:
+                    break
+                try:
+                    self._procesar(conexion, linea)
+                except ErrorProtocolo as error:
+                    self._enviar(conexion, {"evento": "error", "mensaje": str(error)})
+        finally:
+            self.conexiones.discard(conexion)
+            self._desconectar(conexion)
+            writer.close()
+
+    def _escribir(self, conexion, datos):
+        if conexion is None or conexion.writer.is_closing():
+            return
+        conexion.writer.write(datos)
+        # Un cliente que no lee no puede acumular memoria sin límite
+        if conexion.writer.transport.get_write_buffer_size() > self.max_buffer:
+            conexion.writer.close()
+
+    def _enviar(self, conexion, mensaje):
+        self._escribir(conexion, _codificar(mensaje))
+
+    def _difundir(self, mesa, mensaje):
+        datos = _codificar(mensaje)
+        for conexion in mesa.conexiones:
+            self._escribir(conexion, datos)
+
+    def _procesar(self, conexion, linea):
+        try:
+            mensaje = json.loads(linea)
+        except ValueError:
+            raise ErrorProtocolo("JSON inválido")
+        if not isinstance(mensaje, dict):
+            raise ErrorProtocolo("Se esperaba un objeto JSON")
+        tipo = mensaje.get("tipo")
+        if tipo == "unirse":
+            self._unirse(conexion, mensaje)
+        elif tipo in ("apuesta", "dudar", "calzar"):
+            self._accion_cliente(conexion, tipo, mensaje)
+        else:
+            raise ErrorProtocolo(f"Tipo de mensaje desconocido: {tipo}")
+
+    def _unirse(self, conexion, mensaje):
+        if conexion.mesa is not None:
+            raise ErrorProtocolo("La conexión ya está en una mesa")
+        nombre = str(mensaje.get("mesa", ""))
+        num_jugadores = mensaje.get("jugadores", 2)
+        dados = mensaje.get("dados", self.max_dados)
+        if not (isinstance(num_jugadores, int) and 2 <= num_jugadores):
+            raise ErrorProtocolo("La mesa debe tener al menos 2 jugadores")
+        if num_jugadores > self.max_jugadores:
+            raise ErrorProtocolo(f"Máximo {self.max_jugadores} jugadores por mesa")
+        if not (isinstance(dados, int) and 1 <= dados <= self.max_dados):
+            raise ErrorProtocolo(f"Los dados deben estar entre 1 y {self.max_dados}")
+        mesa = self.mesas.get(nombre)
+        if mesa is None:
+            mesa = Mesa(nombre, num_jugadores, dados)
+            self.mesas[nombre] = mesa
+        elif mesa.gestor is not None:
+            raise ErrorProtocolo(f"La mesa {nombre} ya está jugando")
+        elif (mesa.num_jugadores, mesa.dados_por_jugador) != (num_jugadores, dados):
+            raise ErrorProtocolo(f"La mesa {nombre} tiene otra configuración")
+        asiento = mesa.asiento_libre()
+        mesa.conexiones[asiento] = conexion
+        conexion.mesa = mesa
+        conexion.asiento = asiento
+        self._enviar(
+            conexion,
+            {
+                "evento": "sentado",
+                "mesa": nombre,
+                "asiento": asiento,
+                "jugadores": num_jugadores,
+            },
+        )
+        if mesa.asiento_libre() is None:
+            self._comenzar(mesa)
+
+    def _comenzar(self, mesa):
+        gestor = GestorPartida(
+            num_jugadores=mesa.num_jugadores,
+            dados_por_jugador=mesa.dados_por_jugador,
+            generador=self.generador.spawn(1)[0],
+            compacto=True,
+        )
+        gestor.set_jugador_inicial(gestor.determinar_jugador_inicial())
+        mesa.gestor = gestor
+        self._difundir(mesa, {"evento": "inicio", "mesa": mesa.nombre})
+        self._pedir_turno(mesa)
+
+    def _pedir_turno(self, mesa):
+        jugador = mesa.gestor.jugador_actual
+        conexion = mesa.conexiones[jugador]
+        if conexion is None:
+            # Sin cliente se juega por tiempo en la siguiente vuelta del loop
+            mesa.temporizador = self._loop.call_soon(self._vencer_turno, mesa)
+            return
+        self._enviar(conexion, _mensaje_turno(mesa, jugador, self.tiempo_turno))
+        mesa.temporizador = self._loop.call_later(
+            self.tiempo_turno, self._vencer_turno, mesa
+        )
+
+    def _vencer_turno(self, mesa):
+        mesa.temporizador = None
+        gestor = mesa.gestor
+        if gestor.ultima_apuesta is None:
+            accion = {"tipo": "apuesta", "apuesta": APERTURA_POR_TIEMPO}
+        else:
+            accion = {"tipo": "dudar"}
+        self._resolver(mesa, gestor.jugador_actual, accion, por_tiempo=True)
+
+    def _accion_cliente(self, conexion, tipo, mensaje):
+        mesa = conexion.mesa
+        if mesa is None or mesa.gestor is None:
+            raise ErrorProtocolo("La partida no ha comenzado")
+        gestor = mesa.gestor
+        if conexion.asiento != gestor.jugador_actual:
+            raise ErrorProtocolo("No es tu turno")
+        if tipo == "apuesta":
+            cantidad = mensaje.get("cantidad")
+            pinta = mensaje.get("pinta")
+            total = gestor.indice_pintas.total
+            if not (isinstance(cantidad, int) and 1 <= cantidad <= total):
+                raise ErrorProtocolo(f"La cantidad debe estar entre 1 y {total}")
+            if not (isinstance(pinta, int) and 1 <= pinta <= len(PINTAS)):
+                raise ErrorProtocolo("La pinta debe estar entre 1 y 6")
+            accion = {
+                "tipo": tipo,
+                "apuesta": Apuesta.obtener(cantidad, PINTAS[pinta - 1]),
+            }
+        elif gestor.ultima_apuesta is None:
+            raise ErrorProtocolo(f"No se puede {tipo} sin una apuesta previa")
+        else:
+            accion = {"tipo": tipo}
+        if not self._resolver(mesa, conexion.asiento, accion):
+            raise ErrorProtocolo("Apuesta inválida")
+
+    def _resolver(self, mesa, jugador, accion, por_tiempo=False):
+        """
+        Aplica la acción en el gestor de la mesa. Retorna False si era una
+        apuesta inválida: el turno y su plazo siguen corriendo.
+        """
+        gestor = mesa.gestor
+        apostador = gestor.jugador_ultima_apuesta
+        resultado = gestor.elegir_accion(jugador, accion)
+        tipo = accion["tipo"]
+        if tipo == "apuesta" and not resultado["valida"]:
+            return False
+        self.acciones += 1
+        if mesa.temporizador is not None:
+            mesa.temporizador.cancel()
+            mesa.temporizador = None
+        evento = {"evento": "accion", "jugador": jugador, "tipo": tipo}
+        if tipo == "apuesta":
+            evento["cantidad"] = accion["apuesta"].get_cantidad()
+            evento["pinta"] = accion["apuesta"].get_pinta().value
+        else:
+            evento["resultado"] = resultado["resultado"]
+        avanzar_turno(gestor, jugador, apostador, accion, resultado)
+        if por_tiempo:
+            evento["por_tiempo"] = True
+        self._difundir(mesa, evento)
+        if gestor.hay_ganador():
+            self._difundir(
+                mesa, {"evento": "fin", "ganador": gestor.jugadores_activos()[0]}
+            )
+            self.partidas_terminadas += 1
+            self._cerrar_mesa(mesa)
+        else:
+            self._pedir_turno(mesa)
+        return True
+
+    def _cerrar_mesa(self, mesa):
+        """Libera la mesa; las conexiones quedan abiertas para otra mesa."""
+        if mesa.temporizador is not None:
+            mesa.temporizador.cancel()
+            mesa.temporizador = None
+        for conexion in mesa.conexiones:
+            if conexion is not None:
+                conexion.mesa = None
+                conexion.asiento = None
+        mesa.conexiones = [None] * mesa.num_jugadores
+        if self.mesas.get(mesa.nombre) is mesa:
+            del self.mesas[mesa.nombre]
+
+    def _desconectar(self, conexion):
+        mesa = conexion.mesa
+        if mesa is None:
+            return
+        mesa.conexiones[conexion.asiento] = None
+        conexion.mesa = None
+        if mesa.vacia():
+            self._cerrar_mesa(mesa)
+        elif mesa.gestor is not None and mesa.gestor.jugador_actual == conexion.asiento:
+            # No se espera el plazo de alguien que ya no está
+            if mesa.temporizador is not None:
+                mesa.temporizador.cancel()
+            mesa.temporizador = self._loop.call_soon(self._vencer_turno, mesa)
+
+
+async def servir(host="127.0.0.1", puerto=7777, **opciones):
+    """Ejecuta un ServidorDudo hasta que se cancele la tarea."""
+    servidor = ServidorDudo(**opciones)
+    await servidor.iniciar(host, puerto)
+    try:
+        await servidor.servir_siempre()
+    finally:
+        await servidor.cerrar()
@@ -0,0 +1,40 @@
+"""
+Punto de entrada para el servidor de mesas de Dudo sobre TCP local.
+
+Uso:
+    python -m src.servir --puerto 7777 --tiempo-turno 30
+"""
+
+import argparse
+import asyncio
+
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.servicios.servidor import servir
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Servidor de mesas de Dudo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=7777)
+    parser.add_argument("--tiempo-turno", type=float, default=30.0)
+    parser.add_argument("--semilla", type=int, default=None)
+    return parser
+
+
+def main(argumentos=None):
+    args = crear_parser().parse_args(argumentos)
+    try:
+        asyncio.run(
+            servir(
+                args.host,
+                args.puerto,
+                tiempo_turno=args.tiempo_turno,
+                generador=GeneradorAleatorio(args.semilla),
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
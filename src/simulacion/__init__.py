@@ -0,0 +1 @@
+# Módulo de simulación - Partidas automáticas del Dudo
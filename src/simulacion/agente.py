@@ -0,0 +1,16 @@
+"""
+Interfaz de los jugadores automáticos (agentes).
+
+Un agente recibe la Observacion de su turno y retorna una acción con el
+formato que acepta GestorPartida.elegir_accion, por ejemplo
+{"tipo": "apuesta", "apuesta": Apuesta(2, Pinta.TREN)} o {"tipo": "dudar"}.
+"""
+
+from typing import Protocol
+
+from src.juego.observacion import Observacion
+
+
+class Agente(Protocol):
+    def actuar(self, observacion: Observacion) -> dict:
+        """Retorna la acción que el agente elige para esta observación."""
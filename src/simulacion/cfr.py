@@ -0,0 +1,424 @@
+"""
+Solver de minimización de arrepentimiento contrafactual (MCCFR con muestreo
+externo) para finales de partida de dos jugadores con pocos dados.
+
+El juego resuelto es una ronda: el jugador 0 abre, se alternan apuestas
+legales según ValidadorApuesta y la ronda termina con dudar o calzar, que
+se resuelven con ArbitroRonda. Como el validador permite ciclos (por
+ejemplo 1 TONTO, 1 AS, 1 TONTO) el solver no repite apuestas dentro de la
+ronda y limita la cantidad de apuestas a `max_apuestas`; al llegar al
+límite solo se puede dudar o calzar. La utilidad es +1 para quien hace
+perder un dado a su rival (o recupera uno al calzar) y -1 para quien lo
+pierde.
+
+La estrategia promedio se exporta a un archivo binario de registros de
+ancho fijo ordenados por llave, que EstrategiaMmap consulta con mmap y
+búsqueda binaria sin cargarlo en memoria.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from src.juego.arbitro_ronda import ArbitroRonda
+from src.juego.cacho import CachoCompacto
+from src.juego.contador_pintas import IndicePintas
+from src.juego.dado import PINTAS
+from src.juego.validador_apuesta import (
+    NUM_PINTAS,
+    apuesta_desde_ordinal,
+    ordinal,
+    tabla_transiciones,
+)
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+DUDAR = -1
+CALZAR = -2
+
+_MAGIA = b"DUDOCFR1"
+_CABECERA = struct.Struct("<8sBBBBHI")
+_BYTES_LLAVE = 8
+_ESCALA = 65535
+
+
+def acciones_legales(historial, cantidad_dados, total_dados, max_apuestas):
+    """
+    Acciones legales después de `historial` (tupla de ordinales de apuestas)
+    para un jugador con `cantidad_dados`: apuestas hasta `total_dados` que
+    no se hayan hecho en la ronda y, si ya hay una apuesta, dudar y calzar.
+    """
+    if not historial:
+        return tuple(
+            valor
+            for valor in range(total_dados * NUM_PINTAS)
+            if valor % NUM_PINTAS != 0 or cantidad_dados == 1
+        )
+    if len(historial) >= max_apuestas:
+        return (DUDAR, CALZAR)
+    _, siguientes = tabla_transiciones(total_dados)
+    apuestas = tuple(v for v in siguientes[historial[-1]] if v not in historial)
+    return apuestas + (DUDAR, CALZAR)
+
+
+def llave_conjunto(jugador, mano, historial):
+    """
+    Llave canónica de un conjunto de información: el jugador, sus caras
+    ordenadas (el orden de los dados no importa) y las acciones previas.
+    """
+    return (jugador, tuple(sorted(mano)), tuple(historial))
+
+
+def _hash_llave(llave):
+    jugador, mano, historial = llave
+    datos = bytes([jugador]) + bytes(mano) + b"\xff" + bytes(a + 2 for a in historial)
+    return hashlib.blake2b(datos, digest_size=_BYTES_LLAVE).digest()
+
+
+def _regret_matching(arrepentimientos):
+    positivos = [r if r > 0 else 0.0 for r in arrepentimientos]
+    total = sum(positivos)
+    if total > 0:
+        return [p / total for p in positivos]
+    return [1.0 / len(arrepentimientos)] * len(arrepentimientos)
+
+
+class SolverCFR:
+    def __init__(self, dados=(1, 1), ases_comodin=None, generador=None, max_apuestas=4):
+        """
+        `dados` es la cantidad de dados de (jugador que abre, rival).
+        Si `ases_comodin` es None se aplica la regla del gestor: los ases
+        dejan de ser comodines cuando algún jugador tiene un solo dado.
+        """
+        self.dados = tuple(dados)
+        self.total_dados = sum(self.dados)
+        if ases_comodin is None:
+            ases_comodin = 1 not in self.dados
+        self.ases_comodin = ases_comodin
+        self.max_apuestas = max_apuestas
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        # llave -> [arrepentimientos, suma de estrategias]
+        self.nodos = {}
+        self.iteraciones = 0
+        self._cachos = [CachoCompacto(d, self.generador) for d in self.dados]
+        self._arbitro = ArbitroRonda()
+        self._arbitro.set_indice(IndicePintas(self._cachos))
+        self._arbitro.set_ases_comodin(ases_comodin)
+
+    def _nodo(self, llave, num_acciones):
+        nodo = self.nodos.get(llave)
+        if nodo is None:
+            nodo = [[0.0] * num_acciones, [0.0] * num_acciones]
+            self.nodos[llave] = nodo
+        return nodo
+
+    def _utilidad(self, historial, jugador):
+        """Utilidad terminal para el jugador 0 de la ronda ya terminada."""
+        apuesta = apuesta_desde_ordinal(historial[-2])
+        jugada = (jugador, apuesta.get_pinta(), apuesta.get_cantidad())
+        if historial[-1] == DUDAR:
+            resultado = self._arbitro.resolver_duda(self._cachos, jugada)
+            perdedor = jugador if resultado == "pierde_dudador" else 1 - jugador
+        else:
+            resultado = self._arbitro.resolver_calzar(self._cachos, jugada)
+            perdedor = 1 - jugador if resultado == "gana_calzador" else jugador
+        return -1.0 if perdedor == 0 else 1.0
+
+    def _recorrer(self, manos, historial, traversor):
+        jugador = len(historial) % 2
+        if historial and historial[-1] < 0:
+            utilidad = self._utilidad(historial, 1 - jugador)
+            return utilidad if traversor == 0 else -utilidad
+        acciones = acciones_legales(
+            historial, self.dados[jugador], self.total_dados, self.max_apuestas
+        )
+        llave = llave_conjunto(jugador, manos[jugador], historial)
+        arrepentimientos, suma_estrategia = self._nodo(llave, len(acciones))
+        estrategia = _regret_matching(arrepentimientos)
+        if jugador == traversor:
+            utilidades = [
+                self._recorrer(manos, historial + (accion,), traversor)
+                for accion in acciones
+            ]
+            valor = sum(p * u for p, u in zip(estrategia, utilidades))
+            for i, utilidad in enumerate(utilidades):
+                arrepentimientos[i] += utilidad - valor
+            return valor
+        for i, p in enumerate(estrategia):
+            suma_estrategia[i] += p
+        elegida = self._muestrear(estrategia)
+        return self._recorrer(manos, historial + (acciones[elegida],), traversor)
+
+    def _muestrear(self, estrategia):
+        tirada = self.generador.generar_entero(0, 10**9 - 1) / 10**9
+        acumulada = 0.0
+        for i, p in enumerate(estrategia):
+            acumulada += p
+            if tirada < acumulada:
+                return i
+        return len(estrategia) - 1
+
+    def iterar(self, iteraciones):
+        """Ejecuta iteraciones de MCCFR con muestreo externo."""
+        for _ in range(iteraciones):
+            caras = self.generador.generar_caras(self.total_dados)
+            manos = (caras[: self.dados[0]], caras[self.dados[0] :])
+            for cacho, mano in zip(self._cachos, manos):
+                cacho.cargar_caras(mano)
+            for traversor in (0, 1):
+                self._recorrer(manos, (), traversor)
+            self.iteraciones += 1
+
+    def estrategia_actual(self, llave):
+        """Estrategia por regret matching del conjunto, o None si no existe."""
+        nodo = self.nodos.get(llave)
+        if nodo is None:
+            return None
+        return _regret_matching(nodo[0])
+
+    def estrategia_promedio(self, llave):
+        """Estrategia promedio del conjunto de información, o None si no existe."""
+        nodo = self.nodos.get(llave)
+        if nodo is None:
+            return None
+        suma = sum(nodo[1])
+        if suma <= 0:
+            return [1.0 / len(nodo[1])] * len(nodo[1])
+        return [s / suma for s in nodo[1]]
+
+    def combinar(self, base, otros):
+        """
+        Suma a los nodos del solver lo que cada tabla de `otros` avanzó
+        desde `base`, la copia de la que partieron todos los trabajadores.
+        """
+        for tabla, iteraciones in otros:
+            for llave, (arrepentimientos, suma) in tabla.items():
+                previo = base.get(llave)
+                nodo = self._nodo(llave, len(arrepentimientos))
+                for i in range(len(arrepentimientos)):
+                    delta_r = arrepentimientos[i] - (previo[0][i] if previo else 0.0)
+                    delta_s = suma[i] - (previo[1][i] if previo else 0.0)
+                    nodo[0][i] += delta_r
+                    nodo[1][i] += delta_s
+            self.iteraciones += iteraciones
+
+    def entrenar(
+        self,
+        iteraciones,
+        num_procesos=1,
+        iteraciones_por_epoca=1000,
+        ruta_checkpoint=None,
+    ):
+        """
+        Entrena en épocas. En cada época las iteraciones se reparten entre
+        procesos que parten de la misma tabla y se combinan al final; luego
+        se guarda un checkpoint si se entregó una ruta.
+        """
+        restantes = iteraciones
+        while restantes > 0:
+            epoca = min(iteraciones_por_epoca, restantes)
+            restantes -= epoca
+            if num_procesos == 1:
+                self.iterar(epoca)
+            else:
+                self._epoca_paralela(epoca, num_procesos)
+            if ruta_checkpoint is not None:
+                self.guardar_checkpoint(ruta_checkpoint)
+
+    def _epoca_paralela(self, iteraciones, num_procesos):
+        base = {llave: [list(r), list(s)] for llave, (r, s) in self.nodos.items()}
+        partes = [iteraciones // num_procesos] * num_procesos
+        partes[0] += iteraciones - sum(partes)
+        generadores = self.generador.spawn(num_procesos)
+        argumentos = [
+            (self.dados, self.ases_comodin, self.max_apuestas, base, parte, generador)
+            for parte, generador in zip(partes, generadores)
+        ]
+        with ProcessPoolExecutor(max_workers=num_procesos) as pool:
+            tablas = list(pool.map(_iterar_trabajador, *zip(*argumentos)))
+        self.combinar(base, tablas)
+
+    def guardar_checkpoint(self, ruta):
+        """Guarda la tabla completa de forma atómica para poder retomar."""
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "wb") as archivo:
+            pickle.dump(
+                {
+                    "dados": self.dados,
+                    "ases_comodin": self.ases_comodin,
+                    "max_apuestas": self.max_apuestas,
+                    "iteraciones": self.iteraciones,
+                    "nodos": self.nodos,
+                },
+                archivo,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar_checkpoint(cls, ruta, generador=None):
+        with open(ruta, "rb") as archivo:
+            datos = pickle.load(archivo)
+        solver = cls(
+            datos["dados"], datos["ases_comodin"], generador, datos["max_apuestas"]
+        )
+        solver.nodos = datos["nodos"]
+        solver.iteraciones = datos["iteraciones"]
+        return solver
+
+    def exportar_estrategia(self, ruta):
+        """
+        Escribe la estrategia promedio en un archivo binario: una cabecera y
+        registros ordenados de (hash de 8 bytes de la llave, probabilidades
+        cuantizadas a uint16), todos del mismo ancho.
+        """
+        max_acciones = self.total_dados * NUM_PINTAS + 2
+        registro = struct.Struct(f"<{_BYTES_LLAVE}s{max_acciones}H")
+        filas = []
+        for llave in self.nodos:
+            probabilidades = self.estrategia_promedio(llave)
+            cuantizadas = [round(p * _ESCALA) for p in probabilidades]
+            cuantizadas += [0] * (max_acciones - len(cuantizadas))
+            filas.append((_hash_llave(llave), cuantizadas))
+        filas.sort(key=lambda fila: fila[0])
+        with open(ruta, "wb") as archivo:
+            archivo.write(
+                _CABECERA.pack(
+                    _MAGIA,
+                    self.dados[0],
+                    self.dados[1],
+                    int(self.ases_comodin),
+                    self.max_apuestas,
+                    max_acciones,
+                    len(filas),
+                )
+            )
+            for llave, cuantizadas in filas:
+                archivo.write(registro.pack(llave, *cuantizadas))
+
+
+def _iterar_trabajador(
+    dados, ases_comodin, max_apuestas, nodos, iteraciones, generador
+):
+    solver = SolverCFR(dados, ases_comodin, generador, max_apuestas)
+    solver.nodos = nodos
+    solver.iterar(iteraciones)
+    return solver.nodos, iteraciones
+
+
+class EstrategiaMmap:
+    """Lectura de una estrategia exportada, mapeada en memoria."""
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, "rb")
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magia,
+            d0,
+            d1,
+            ases,
+            self.max_apuestas,
+            max_acciones,
+            cantidad,
+        ) = _CABECERA.unpack_from(self._mapa, 0)
+        if magia != _MAGIA:
+            raise ValueError("El archivo no es una estrategia CFR")
+        self.dados = (d0, d1)
+        self.total_dados = d0 + d1
+        self.ases_comodin = bool(ases)
+        self.cantidad = cantidad
+        self._registro = struct.Struct(f"<{_BYTES_LLAVE}s{max_acciones}H")
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+    def _buscar(self, hash_llave):
+        inicio, fin = 0, self.cantidad
+        tamano = self._registro.size
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            posicion = _CABECERA.size + medio * tamano
+            actual = self._mapa[posicion : posicion + _BYTES_LLAVE]
+            if actual < hash_llave:
+                inicio = medio + 1
+            elif actual > hash_llave:
+                fin = medio
+            else:
+                return self._registro.unpack_from(self._mapa, posicion)[1:]
+        return None
+
+    def probabilidades(self, jugador, mano, historial):
+        """
+        Retorna las acciones legales y sus probabilidades para el conjunto
+        de información, o None si la estrategia no lo cubre.
+        """
+        llave = llave_conjunto(jugador, mano, historial)
+        cuantizadas = self._buscar(_hash_llave(llave))
+        if cuantizadas is None:
+            return None
+        acciones = acciones_legales(
+            historial, self.dados[jugador], self.total_dados, self.max_apuestas
+        )
+        pesos = cuantizadas[: len(acciones)]
+        total = sum(pesos)
+        if total == 0:
+            return acciones, [1.0 / len(acciones)] * len(acciones)
+        return acciones, [p / total for p in pesos]
+
+
+class AgenteCFR:
+    """
+    Agente que juega con una estrategia exportada cuando la mesa coincide
+    con la configuración resuelta (dos jugadores activos con esos dados) y
+    delega en un agente de respaldo en cualquier otro caso.
+    """
+
+    def __init__(self, estrategia: EstrategiaMmap, respaldo, generador=None):
+        self.estrategia = estrategia
+        self.respaldo = respaldo
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+
+    def actuar(self, observacion):
+        consulta = self._consulta(observacion)
+        if consulta is None:
+            return self.respaldo.actuar(observacion)
+        acciones, probabilidades = consulta
+        tirada = self.generador.generar_entero(0, 10**9 - 1) / 10**9
+        elegida = acciones[-1]
+        acumulada = 0.0
+        for accion, p in zip(acciones, probabilidades):
+            acumulada += p
+            if tirada < acumulada:
+                elegida = accion
+                break
+        if elegida == DUDAR:
+            return {"tipo": "dudar"}
+        if elegida == CALZAR:
+            return {"tipo": "calzar"}
+        return {"tipo": "apuesta", "apuesta": apuesta_desde_ordinal(elegida)}
+
+    def _consulta(self, observacion):
+        activos = [i for i, activo in enumerate(observacion.activos) if activo]
+        if (
+            len(activos) != 2
+            or observacion.ases_comodin != self.estrategia.ases_comodin
+        ):
+            return None
+        rival = activos[0] if activos[1] == observacion.jugador else activos[1]
+        historial = observacion.historial
+        # El jugador 0 del solver es quien abrió la ronda
+        abre = historial[0][0] if historial else observacion.jugador
+        jugador = 0 if abre == observacion.jugador else 1
+        dados = [0, 0]
+        dados[jugador] = observacion.cantidad_dados
+        dados[1 - jugador] = observacion.dados_por_jugador[rival]
+        if tuple(dados) != self.estrategia.dados:
+            return None
+        mano = [PINTAS.index(p) for p in observacion.pintas_propias]
+        ordinales = tuple(ordinal(apuesta) for _, apuesta in historial)
+        if any(o >= self.estrategia.total_dados * NUM_PINTAS for o in ordinales):
+            return None
+        return self.estrategia.probabilidades(jugador, mano, ordinales)
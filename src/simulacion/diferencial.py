@@ -0,0 +1,200 @@
+"""
+Pruebas diferenciales entre GestorPartida y PartidaRapida.
+
+Ambos motores reciben la misma semilla y la misma secuencia aleatoria de
+acciones: apuestas válidas e inválidas, dudas y calces de cualquier asiento
+activo. Después de cada acción se compara el resultado y el estado completo
+(dados de cada asiento, dados a favor, jugadores activos, apuesta vigente,
+turno, ronda y regla de ases). También se comparan partidas completas entre
+PoliticaEsperanza y su versión entera.
+
+Uso:
+    python -m src.simulacion.diferencial --partidas 1000 --semilla 0
+"""
+
+import argparse
+import random
+import sys
+
+from src.juego.cacho import ARBITRO
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import apuesta_desde_ordinal, ordinal
+from src.servicios.diario import CODIGO_RESULTADO
+from src.servicios.generador_aleatorio import BACKENDS, GeneradorAleatorio
+from src.simulacion.motor import avanzar_turno, jugar_partida
+from src.simulacion.motor_rapido import (
+    CALZAR,
+    DUDAR,
+    NUM_PINTAS,
+    PartidaRapida,
+    jugar_partida_rapida,
+    politica_esperanza,
+    subidas_minimas,
+)
+from src.simulacion.politicas import PoliticaEsperanza
+
+
+def estado_gestor(gestor):
+    """Estado comparable de un GestorPartida."""
+    ultima = gestor.ultima_apuesta
+    return (
+        tuple(tuple(cacho.conteo_para(ARBITRO)) for cacho in gestor.cachos),
+        tuple(gestor.estado_mesa.dados_a_favor),
+        gestor.estado_mesa.activos,
+        None if ultima is None else ordinal(ultima),
+        gestor.jugador_ultima_apuesta,
+        gestor.jugador_actual,
+        gestor.ronda_actual,
+        gestor.arbitro.usar_ases_comodin,
+    )
+
+
+def estado_rapida(partida):
+    """Estado comparable de una PartidaRapida, en el formato de estado_gestor."""
+    return (
+        tuple(tuple(conteo) for conteo in partida.conteos),
+        tuple(partida.dados_a_favor),
+        partida.activos,
+        partida.ultima_apuesta,
+        partida.jugador_ultima_apuesta,
+        partida.jugador_actual,
+        partida.ronda_actual,
+        partida.ases_comodin,
+    )
+
+
+def _accion_aleatoria(azar, partida, jugador):
+    """Mezcla de apuestas mínimas, apuestas al azar (muchas inválidas) y jugadas."""
+    tirada = azar.random()
+    if partida.ultima_apuesta is not None:
+        if tirada < 0.15:
+            return DUDAR
+        if tirada < 0.25:
+            return CALZAR
+    if tirada < 0.7:
+        candidatas = subidas_minimas(partida.ultima_apuesta, partida.dados[jugador])
+        if candidatas:
+            return azar.choice(candidatas)
+    return azar.randrange((partida.total_dados + 2) * NUM_PINTAS)
+
+
+def _jugar_en_gestor(gestor, jugador, accion):
+    """Aplica una acción entera al gestor como lo haría el motor."""
+    apostador = gestor.jugador_ultima_apuesta
+    if accion >= 0:
+        accion_dict = {"tipo": "apuesta", "apuesta": apuesta_desde_ordinal(accion)}
+        resultado = gestor.elegir_accion(jugador, accion_dict)
+        if resultado["valida"]:
+            avanzar_turno(gestor, jugador, apostador, accion_dict, resultado)
+        return int(resultado["valida"])
+    accion_dict = {"tipo": "dudar" if accion == DUDAR else "calzar"}
+    resultado = gestor.elegir_accion(jugador, accion_dict)
+    avanzar_turno(gestor, jugador, apostador, accion_dict, resultado)
+    return CODIGO_RESULTADO[resultado["resultado"]]
+
+
+def comparar_acciones(
+    semilla, num_jugadores=3, dados_por_jugador=5, backend="random", max_acciones=5000
+):
+    """
+    Juega una partida con acciones aleatorias en ambos motores y retorna la
+    primera divergencia como texto, o None si coinciden en todo.
+    """
+    gestor = GestorPartida(
+        num_jugadores=num_jugadores,
+        dados_por_jugador=dados_por_jugador,
+        generador=GeneradorAleatorio(semilla, backend),
+        compacto=True,
+    )
+    partida = PartidaRapida(
+        num_jugadores, dados_por_jugador, GeneradorAleatorio(semilla, backend)
+    )
+    azar = random.Random(semilla)
+    if estado_gestor(gestor) != estado_rapida(partida):
+        return f"semilla {semilla}: estado inicial distinto"
+    for paso in range(max_acciones):
+        if partida.hay_ganador():
+            break
+        # Casi siempre juega quien tiene el turno, a veces otro asiento activo
+        jugador = partida.jugador_actual
+        if azar.random() < 0.2:
+            jugador = azar.choice(
+                [i for i in range(num_jugadores) if partida.activos >> i & 1]
+            )
+        accion = _accion_aleatoria(azar, partida, jugador)
+        esperado = _jugar_en_gestor(gestor, jugador, accion)
+        obtenido = partida.actuar(jugador, accion)
+        if esperado != obtenido:
+            return (
+                f"semilla {semilla}, paso {paso}: jugador {jugador} acción "
+                f"{accion} da {obtenido}, GestorPartida da {esperado}"
+            )
+        if estado_gestor(gestor) != estado_rapida(partida):
+            return (
+                f"semilla {semilla}, paso {paso}: estado distinto después de "
+                f"la acción {accion} del jugador {jugador}: "
+                f"{estado_rapida(partida)} != {estado_gestor(gestor)}"
+            )
+    if gestor.hay_ganador() != partida.hay_ganador():
+        return f"semilla {semilla}: solo un motor terminó la partida"
+    return None
+
+
+def comparar_politicas(semilla, num_jugadores=3, dados_por_jugador=5):
+    """
+    Juega la misma partida con PoliticaEsperanza en GestorPartida y con
+    politica_esperanza en PartidaRapida; retorna la divergencia o None.
+    """
+    esperado = jugar_partida(
+        [PoliticaEsperanza() for _ in range(num_jugadores)],
+        GeneradorAleatorio(semilla),
+        dados_por_jugador,
+    )
+    obtenido = jugar_partida_rapida(
+        [politica_esperanza] * num_jugadores,
+        GeneradorAleatorio(semilla),
+        dados_por_jugador,
+    )
+    esperado = (esperado.ganador, esperado.rondas, esperado.turnos)
+    if esperado != obtenido:
+        return f"semilla {semilla}: partida {obtenido}, GestorPartida {esperado}"
+    return None
+
+
+def fuzz(partidas, semilla=0):
+    """
+    Compara `partidas` partidas con acciones aleatorias y otras tantas con
+    políticas, variando jugadores, dados y backend. Retorna las divergencias.
+    """
+    azar = random.Random(semilla)
+    divergencias = []
+    for _ in range(partidas):
+        caso = azar.getrandbits(64)
+        num_jugadores = azar.randint(2, 8)
+        dados = azar.randint(1, 5)
+        for divergencia in (
+            comparar_acciones(caso, num_jugadores, dados, azar.choice(BACKENDS)),
+            comparar_politicas(caso, num_jugadores, dados),
+        ):
+            if divergencia is not None:
+                divergencias.append(divergencia)
+    return divergencias
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(
+        description="Compara GestorPartida con el motor rápido"
+    )
+    parser.add_argument("--partidas", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argumentos)
+    divergencias = fuzz(args.partidas, args.semilla)
+    for divergencia in divergencias:
+        print(divergencia)
+    print(f"{args.partidas} casos, {len(divergencias)} divergencias")
+    if divergencias:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,539 @@
+"""
+Entornos de aprendizaje por refuerzo al estilo Gym sobre GestorPartida.
+
+Un EntornoDudo sienta al agente en un asiento y juega los turnos de los
+oponentes (políticas de src.simulacion.politicas) hasta que le toca al
+agente. `reset()` retorna (observacion, info) y `step(accion)` retorna
+(observacion, recompensa, terminado, truncado, info). La recompensa es 1 si
+el agente gana, -1 si queda eliminado y 0 en otro caso.
+
+Las acciones son enteros: el ordinal de la apuesta (ver
+validador_apuesta.ordinal) hasta la mayor cantidad de dados que puede haber
+en la mesa, y después de ellos DUDAR y CALZAR. La observación es un dict de
+arreglos de NumPy que el entorno reescribe en su lugar en cada paso:
+
+- dados_propios: histograma (6,) de los dados del agente,
+- dados_por_asiento: cantidad de dados de cada asiento,
+- apuesta: ordinal de la apuesta vigente, o -1 al inicio de la ronda,
+- ases_comodin: 1 si los ases son comodines,
+- historial: ordinales de las últimas apuestas de la ronda (-1 si faltan),
+- mascara: acciones legales, con las reglas de ValidadorApuesta.
+
+EntornosVectorizados maneja N entornos que escriben en las filas de los
+mismos arreglos (BuffersEntorno) y se reinician solos al terminar. Con
+`procesos > 0` los entornos corren en subprocesos y los arreglos viven en
+memoria compartida, así que juntar datos no copia ni crea arreglos por paso.
+"""
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.juego.gestor_partida import GestorPartida
+from src.juego.observacion import construir_observacion
+from src.juego.validador_apuesta import ValidadorApuesta, apuesta_desde_ordinal, ordinal
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import PartidaInvalidaError, avanzar_turno
+from src.simulacion.motor_lotes import tabla_validas
+from src.simulacion.motor_rapido import MAX_DADOS, NUM_PINTAS
+from src.simulacion.politicas import crear_politica
+
+_DUDAR = {"tipo": "dudar"}
+_CALZAR = {"tipo": "calzar"}
+
+
+def num_acciones(num_jugadores):
+    """Cantidad de acciones: los ordinales apostables, DUDAR y CALZAR."""
+    return num_jugadores * MAX_DADOS * NUM_PINTAS + 2
+
+
+def _campos(num_jugadores, ventana):
+    """Nombre, forma por entorno y tipo de cada arreglo de BuffersEntorno."""
+    observacion = [
+        ("dados_propios", (NUM_PINTAS,), np.int16),
+        ("dados_por_asiento", (num_jugadores,), np.int16),
+        ("apuesta", (), np.int32),
+        ("ases_comodin", (), np.int8),
+        ("historial", (ventana,), np.int32),
+        ("mascara", (num_acciones(num_jugadores),), np.bool_),
+    ]
+    # La observación con la que terminó cada episodio, antes de reiniciar
+    finales = [("final_" + nombre, forma, tipo) for nombre, forma, tipo in observacion]
+    pasos = [
+        ("accion", (), np.int64),
+        ("recompensa", (), np.float32),
+        ("terminado", (), np.bool_),
+        ("truncado", (), np.bool_),
+        ("ganador", (), np.int16),
+    ]
+    return observacion + finales + pasos
+
+
+class BuffersEntorno:
+    """
+    Arreglos preasignados de N entornos, todos dentro de un solo bloque de
+    memoria: normal, o compartida entre procesos si `compartida` es True.
+    """
+
+    def __init__(
+        self, num_entornos, num_jugadores, ventana=8, compartida=False, nombre=None
+    ):
+        self.num_entornos = num_entornos
+        self.num_jugadores = num_jugadores
+        self.ventana = ventana
+        campos = _campos(num_jugadores, ventana)
+        desplazamientos = []
+        tamano = 0
+        for _, forma, tipo in campos:
+            # Cada arreglo parte alineado a 8 bytes
+            tamano = (tamano + 7) // 8 * 8
+            desplazamientos.append(tamano)
+            tamano += num_entornos * int(np.prod(forma)) * np.dtype(tipo).itemsize
+        self._memoria = None
+        if nombre is not None:
+            # Los subprocesos comparten el rastreador de recursos del proceso
+            # que creó el bloque, así que conectarse no lo duplica
+            self._memoria = shared_memory.SharedMemory(name=nombre)
+            bloque = self._memoria.buf
+        elif compartida:
+            self._memoria = shared_memory.SharedMemory(create=True, size=max(tamano, 1))
+            bloque = self._memoria.buf
+        else:
+            bloque = bytearray(tamano)
+        self._creador = compartida and nombre is None
+        self.arreglos = {}
+        for (nombre_campo, forma, tipo), inicio in zip(campos, desplazamientos):
+            self.arreglos[nombre_campo] = np.ndarray(
+                (num_entornos,) + forma, dtype=tipo, buffer=bloque, offset=inicio
+            )
+        self.arreglos["ganador"][:] = -1
+
+    @property
+    def nombre(self):
+        """Nombre del bloque de memoria compartida, o None."""
+        return None if self._memoria is None else self._memoria.name
+
+    def observaciones(self, final=False):
+        """Dict con los arreglos (N, ...) de la observación."""
+        prefijo = "final_" if final else ""
+        return {
+            nombre: self.arreglos[prefijo + nombre]
+            for nombre, _, _ in _campos(self.num_jugadores, self.ventana)[:6]
+        }
+
+    def fila(self, indice):
+        """
+        Dict con vistas de la observación del entorno `indice`; los campos
+        escalares quedan como vistas de forma (1,).
+        """
+        return {
+            nombre: (
+                arreglo[indice] if arreglo.ndim > 1 else arreglo[indice : indice + 1]
+            )
+            for nombre, arreglo in self.observaciones().items()
+        }
+
+    def cerrar(self):
+        """Libera la memoria compartida (y la borra si este objeto la creó)."""
+        if self._memoria is None:
+            return
+        self.arreglos = {}
+        self._memoria.close()
+        if self._creador:
+            self._memoria.unlink()
+        self._memoria = None
+
+
+class EntornoDudo:
+    def __init__(
+        self,
+        num_jugadores=2,
+        oponentes=("aleatoria",),
+        dados_por_jugador=5,
+        asiento=0,
+        ventana_historial=8,
+        generador: GeneradorAleatorio = None,
+        max_turnos=10000,
+        buffers=None,
+        indice=0,
+    ):
+        """
+        Crea el entorno con el agente en `asiento`. `oponentes` son nombres
+        de políticas (ver crear_politica) o políticas, una para cada otro
+        asiento; si hay menos, se repiten en orden. Si se entregan
+        `buffers`, la observación se escribe en su fila `indice`.
+        """
+        if not 0 <= asiento < num_jugadores:
+            raise ValueError("El asiento del agente no está en la mesa")
+        self.num_jugadores = num_jugadores
+        self.dados_por_jugador = dados_por_jugador
+        self.asiento = asiento
+        self.max_turnos = max_turnos
+        self.oponentes = tuple(oponentes)
+        self._sembrar(generador if generador is not None else GeneradorAleatorio())
+        if buffers is None:
+            buffers = BuffersEntorno(1, num_jugadores, ventana_historial)
+            indice = 0
+        self.buffers = buffers
+        self.indice = indice
+        self.observacion = buffers.fila(indice)
+        self._arreglos = buffers.arreglos
+        self._total_apuestas = num_acciones(num_jugadores) - 2
+        self.gestor = None
+        self.turnos = 0
+        self._info = {}
+
+    def _sembrar(self, generador):
+        """Usa `generador` para los dados y crea las políticas oponentes."""
+        self.generador = generador
+        (generador_politicas,) = generador.spawn(1)
+        otros = [i for i in range(self.num_jugadores) if i != self.asiento]
+        self.politicas = {}
+        for n, jugador in enumerate(otros):
+            oponente = self.oponentes[n % len(self.oponentes)]
+            if isinstance(oponente, str):
+                oponente = crear_politica(oponente, generador_politicas)
+            self.politicas[jugador] = oponente
+
+    @property
+    def accion_dudar(self):
+        return self._total_apuestas
+
+    @property
+    def accion_calzar(self):
+        return self._total_apuestas + 1
+
+    def reset(self, semilla=None):
+        """
+        Empieza un episodio nuevo; retorna (observacion, info). Con
+        `semilla` se vuelven a crear el generador y los oponentes por nombre.
+        """
+        if semilla is not None:
+            self._sembrar(GeneradorAleatorio(semilla))
+        (generador_dados,) = self.generador.spawn(1)
+        self.gestor = GestorPartida(
+            num_jugadores=self.num_jugadores,
+            dados_por_jugador=self.dados_por_jugador,
+            generador=generador_dados,
+            compacto=True,
+        )
+        self.gestor.set_jugador_inicial(self.gestor.determinar_jugador_inicial())
+        self.turnos = 0
+        self._info.clear()
+        self._jugar_oponentes()
+        self._escribir_observacion()
+        self._escribir_paso(0.0, False, False)
+        return self.observacion, self._info
+
+    def step(self, accion):
+        """
+        Aplica la acción del agente y juega los oponentes hasta su próximo
+        turno. Retorna (observacion, recompensa, terminado, truncado, info).
+        """
+        if self.gestor is None:
+            raise RuntimeError("Se debe llamar a reset antes de step")
+        if self._terminado():
+            raise RuntimeError("El episodio terminó: se debe llamar a reset")
+        accion = int(accion)
+        if not 0 <= accion < len(self.observacion["mascara"]) or not (
+            self.observacion["mascara"][accion]
+        ):
+            raise PartidaInvalidaError(f"Acción ilegal para el agente: {accion}")
+        if accion == self.accion_dudar:
+            accion_dict = _DUDAR
+        elif accion == self.accion_calzar:
+            accion_dict = _CALZAR
+        else:
+            accion_dict = {"tipo": "apuesta", "apuesta": apuesta_desde_ordinal(accion)}
+        self._jugar_turno(self.asiento, accion_dict)
+        self._jugar_oponentes()
+        self._escribir_observacion()
+        terminado = self._terminado()
+        truncado = not terminado and self.turnos >= self.max_turnos
+        if not terminado:
+            recompensa = 0.0
+        elif self.gestor.estado_mesa.es_activo(self.asiento):
+            recompensa = 1.0
+        else:
+            recompensa = -1.0
+        self._escribir_paso(recompensa, terminado, truncado)
+        return self.observacion, recompensa, terminado, truncado, self._info
+
+    def _terminado(self):
+        estado = self.gestor.estado_mesa
+        return self.gestor.hay_ganador() or not estado.es_activo(self.asiento)
+
+    def _jugar_turno(self, jugador, accion):
+        gestor = self.gestor
+        apostador = gestor.jugador_ultima_apuesta
+        resultado = gestor.elegir_accion(jugador, accion)
+        if accion["tipo"] == "apuesta" and not resultado["valida"]:
+            raise PartidaInvalidaError(
+                f"El jugador {jugador} hizo una apuesta inválida"
+            )
+        avanzar_turno(gestor, jugador, apostador, accion, resultado)
+        self.turnos += 1
+
+    def _jugar_oponentes(self):
+        """Juega los turnos de los oponentes hasta que le toque al agente."""
+        gestor = self.gestor
+        while not self._terminado() and self.turnos < self.max_turnos:
+            jugador = gestor.jugador_actual
+            if jugador == self.asiento:
+                return
+            politica = self.politicas[jugador]
+            if hasattr(politica, "actuar"):
+                accion = politica.actuar(construir_observacion(gestor, jugador))
+            else:
+                accion = politica(gestor, jugador)
+            if accion.get("tipo") != "apuesta" and gestor.ultima_apuesta is None:
+                raise PartidaInvalidaError("No se puede dudar sin una apuesta previa")
+            self._jugar_turno(jugador, accion)
+
+    def _escribir_observacion(self):
+        gestor = self.gestor
+        observacion = self.observacion
+        estado = gestor.estado_mesa
+        observacion["dados_propios"][:] = gestor.cachos[self.asiento].conteo_para(
+            self.asiento
+        )
+        observacion["dados_por_asiento"][:] = estado.dados
+        ultima = gestor.ultima_apuesta
+        anterior = None if ultima is None else ordinal(ultima)
+        observacion["apuesta"][0] = -1 if anterior is None else anterior
+        observacion["ases_comodin"][0] = gestor.arbitro.usar_ases_comodin
+        historial = observacion["historial"]
+        historial[:] = -1
+        recientes = gestor.historial_apuestas[-len(historial) :]
+        for i, (_, apuesta) in enumerate(recientes, len(historial) - len(recientes)):
+            historial[i] = ordinal(apuesta)
+        self._escribir_mascara(anterior, estado.dados[self.asiento])
+
+    def _escribir_mascara(self, anterior, cantidad_dados):
+        mascara = self.observacion["mascara"]
+        total = self._total_apuestas
+        tabla = tabla_validas(self.num_jugadores * MAX_DADOS)
+        if cantidad_dados < 1 or self._terminado():
+            mascara[:] = False
+            return
+        if anterior is None:
+            mascara[:total] = tabla[total + (cantidad_dados == 1)]
+        elif anterior < total:
+            mascara[:total] = tabla[anterior]
+        else:
+            # Sobre la cota de la tabla solo se puede bajar a ases
+            apuesta = apuesta_desde_ordinal(anterior)
+            for valor in range(total):
+                mascara[valor] = ValidadorApuesta.es_valida(
+                    apuesta, apuesta_desde_ordinal(valor), cantidad_dados
+                )
+        # Con el índice de pintas de GestorPartida siempre se puede calzar
+        mascara[total] = mascara[total + 1] = anterior is not None
+
+    def _escribir_paso(self, recompensa, terminado, truncado):
+        arreglos, i = self._arreglos, self.indice
+        arreglos["recompensa"][i] = recompensa
+        arreglos["terminado"][i] = terminado
+        arreglos["truncado"][i] = truncado
+        ganador = -1
+        if terminado and self.gestor.hay_ganador():
+            ganador = self.gestor.jugadores_activos()[0]
+        arreglos["ganador"][i] = ganador
+        if ganador >= 0:
+            self._info["ganador"] = ganador
+
+
+def _pasar_y_reiniciar(entornos, buffers):
+    """Juega la acción de cada entorno y reinicia los que terminaron."""
+    arreglos = buffers.arreglos
+    acciones = arreglos["accion"]
+    for entorno in entornos:
+        i = entorno.indice
+        _, recompensa, terminado, truncado, _ = entorno.step(acciones[i])
+        if terminado or truncado:
+            for nombre in entorno.observacion:
+                arreglos["final_" + nombre][i] = arreglos[nombre][i]
+            ganador = arreglos["ganador"][i]
+            entorno.reset()
+            # Queda el resultado del episodio que terminó, no el del reinicio
+            arreglos["recompensa"][i] = recompensa
+            arreglos["terminado"][i] = terminado
+            arreglos["truncado"][i] = truncado
+            arreglos["ganador"][i] = ganador
+
+
+def _trabajador(conexion, nombre, num_entornos, num_jugadores, ventana, indices, args):
+    """Proceso que maneja los entornos `indices` sobre la memoria compartida."""
+    buffers = BuffersEntorno(num_entornos, num_jugadores, ventana, nombre=nombre)
+    generadores, opciones = args
+    entornos = [
+        EntornoDudo(
+            num_jugadores,
+            generador=generador,
+            buffers=buffers,
+            indice=indice,
+            ventana_historial=ventana,
+            **opciones,
+        )
+        for indice, generador in zip(indices, generadores)
+    ]
+    try:
+        while True:
+            comando = conexion.recv()
+            if comando not in ("reset", "step"):
+                break
+            try:
+                if comando == "reset":
+                    for entorno in entornos:
+                        entorno.reset()
+                else:
+                    _pasar_y_reiniciar(entornos, buffers)
+            except Exception as error:
+                # Se responde con la excepción para que el proceso principal
+                # la lance y este subproceso siga atendiendo comandos
+                conexion.send(error)
+            else:
+                conexion.send(None)
+    finally:
+        buffers.cerrar()
+        conexion.close()
+
+
+class EntornosVectorizados:
+    def __init__(
+        self,
+        num_entornos,
+        num_jugadores=2,
+        oponentes=("aleatoria",),
+        dados_por_jugador=5,
+        asiento=0,
+        ventana_historial=8,
+        generador: GeneradorAleatorio = None,
+        max_turnos=10000,
+        procesos=0,
+    ):
+        """
+        Crea `num_entornos` entornos con generadores hijos de `generador`.
+        Con `procesos > 0` se reparten en esa cantidad de subprocesos, que
+        leen las acciones y escriben las observaciones en memoria
+        compartida; `oponentes` debe contener nombres de políticas.
+        """
+        generador = generador if generador is not None else GeneradorAleatorio()
+        generadores = generador.spawn(num_entornos)
+        opciones = {
+            "oponentes": oponentes,
+            "dados_por_jugador": dados_por_jugador,
+            "asiento": asiento,
+            "max_turnos": max_turnos,
+        }
+        self.num_entornos = num_entornos
+        self.buffers = BuffersEntorno(
+            num_entornos, num_jugadores, ventana_historial, compartida=procesos > 0
+        )
+        self.observacion = self.buffers.observaciones()
+        self.observacion_final = self.buffers.observaciones(final=True)
+        self.entornos = []
+        self._procesos = []
+        self._conexiones = []
+        if procesos <= 0:
+            self.entornos = [
+                EntornoDudo(
+                    num_jugadores,
+                    generador=g,
+                    buffers=self.buffers,
+                    indice=i,
+                    ventana_historial=ventana_historial,
+                    **opciones,
+                )
+                for i, g in enumerate(generadores)
+            ]
+            return
+        for parte in np.array_split(np.arange(num_entornos), procesos):
+            if not len(parte):
+                continue
+            propia, remota = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_trabajador,
+                args=(
+                    remota,
+                    self.buffers.nombre,
+                    num_entornos,
+                    num_jugadores,
+                    ventana_historial,
+                    parte.tolist(),
+                    ([generadores[i] for i in parte], opciones),
+                ),
+                daemon=True,
+            )
+            proceso.start()
+            remota.close()
+            self._procesos.append(proceso)
+            self._conexiones.append(propia)
+
+    def _ordenar(self, comando):
+        """
+        Envía el comando a todos los subprocesos, espera sus respuestas y
+        lanza la primera excepción que haya ocurrido en alguno.
+        """
+        for conexion in self._conexiones:
+            conexion.send(comando)
+        errores = [conexion.recv() for conexion in self._conexiones]
+        for error in errores:
+            if error is not None:
+                raise error
+
+    def reset(self):
+        """Reinicia todos los entornos; retorna (observacion, info)."""
+        if self._conexiones:
+            self._ordenar("reset")
+        else:
+            for entorno in self.entornos:
+                entorno.reset()
+        return self.observacion, {}
+
+    def step(self, acciones):
+        """
+        Aplica una acción por entorno y retorna (observacion, recompensas,
+        terminados, truncados, info). Los arreglos retornados son siempre
+        los mismos. Los entornos que terminaron ya están reiniciados: su
+        última observación queda en `observacion_final` y su ganador en
+        info["ganador"] (-1 si el episodio sigue).
+        """
+        arreglos = self.buffers.arreglos
+        arreglos["accion"][:] = acciones
+        if self._conexiones:
+            self._ordenar("step")
+        else:
+            _pasar_y_reiniciar(self.entornos, self.buffers)
+        return (
+            self.observacion,
+            arreglos["recompensa"],
+            arreglos["terminado"],
+            arreglos["truncado"],
+            {"ganador": arreglos["ganador"]},
+        )
+
+    def close(self):
+        """Termina los subprocesos y libera la memoria compartida."""
+        try:
+            for conexion in self._conexiones:
+                try:
+                    conexion.send("cerrar")
+                except OSError:
+                    pass  # el subproceso ya terminó
+            for proceso in self._procesos:
+                proceso.join()
+            for conexion in self._conexiones:
+                conexion.close()
+        finally:
+            self._conexiones = []
+            self._procesos = []
+            self.observacion = self.observacion_final = None
+            self.buffers.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.close()
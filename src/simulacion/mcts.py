@@ -0,0 +1,453 @@
+"""
+Agente de búsqueda Monte Carlo en árbol (MCTS) con determinización.
+
+En cada iteración se sortean los dados ocultos de los rivales (los propios
+y la cantidad de dados de cada uno son conocidos), descartando los sorteos
+que no cuadran con las apuestas que cada rival hizo en la ronda; se
+restaura un GestorPartida armado desde la observación y se recorre un
+árbol de acciones aplicándolas con `elegir_accion`. El árbol solo tiene
+las decisiones del jugador que busca (los rivales juegan con una política
+de simulación) y se comparte entre determinizaciones, porque las acciones
+legales solo dependen de información pública. La búsqueda termina al
+agotar un presupuesto de tiempo o de iteraciones y se elige la acción más
+visitada.
+
+Con varios procesos cada uno busca con el mismo presupuesto y se suman
+las visitas de la raíz (paralelización de raíz).
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import (
+    NUM_PINTAS,
+    apuesta_desde_ordinal,
+    ordinal,
+    tabla_transiciones,
+)
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.politicas import Politica
+
+DUDAR = ("dudar",)
+CALZAR = ("calzar",)
+
+
+def _sin_agitar():
+    pass
+
+
+def _accion_a_dict(accion):
+    if accion[0] == "apuesta":
+        return {
+            "tipo": "apuesta",
+            "apuesta": apuesta_desde_ordinal(accion[1]),
+        }
+    return {"tipo": accion[0]}
+
+
+class _Nodo:
+    """
+    Nodo donde decide el jugador que busca. Guarda las visitas y la
+    recompensa acumulada de cada acción, y los nodos siguientes según la
+    acción y las jugadas de los rivales que vinieron después.
+    """
+
+    __slots__ = ("visitas", "pendientes", "estadisticas", "hijos")
+
+    def __init__(self, acciones):
+        self.visitas = 0
+        self.pendientes = list(acciones)
+        self.estadisticas = {}
+        self.hijos = {}
+
+
+class _Busqueda:
+    def __init__(
+        self,
+        observacion,
+        generador,
+        exploracion,
+        anchura,
+        max_profundidad,
+        margen,
+        intentos,
+    ):
+        self.generador = generador
+        self.margen = margen
+        self.exploracion = exploracion
+        self.anchura = anchura
+        self.max_profundidad = max_profundidad
+        self.jugador = observacion.jugador
+        self.num_jugadores = len(observacion.dados_por_jugador)
+        self.gestor = _gestor_desde_observacion(observacion, generador)
+        self.base = self.gestor.snapshot()
+        self.dados_iniciales = self._dados()
+        self.total_dados = observacion.total_dados
+        self.intentos = intentos
+        self.rivales = [
+            (
+                i,
+                cantidad,
+                self._apuestas_de(i, observacion.historial, observacion.ases_comodin),
+            )
+            for i, cantidad in enumerate(observacion.dados_por_jugador)
+            if i != self.jugador and observacion.activos[i] and cantidad > 0
+        ]
+        self.raiz = _Nodo(self._acciones(self.jugador))
+
+    def _dados(self):
+        return [
+            j.cacho.get_cantidad_dados() + j.dados_a_favor
+            for j in self.gestor.jugadores
+        ]
+
+    def _acciones(self, jugador):
+        """
+        Apuestas legales según la tabla de transiciones del validador,
+        limitadas a las `anchura` cantidades más bajas de cada pinta, más
+        dudar y calzar. Se omiten
+        las apuestas ya hechas en la ronda: el validador permite ciclos
+        (por ejemplo 2 TREN, 1 AS, 2 TREN) que alargarían las simulaciones.
+        """
+        gestor = self.gestor
+        total = gestor.indice_pintas.total
+        if gestor.ultima_apuesta is None:
+            un_dado = gestor.jugadores[jugador].cacho.get_cantidad_dados() == 1
+            candidatas = [
+                valor
+                for valor in range(total * NUM_PINTAS)
+                if valor % NUM_PINTAS != 0 or un_dado
+            ]
+        else:
+            anterior = ordinal(gestor.ultima_apuesta)
+            if anterior < total * NUM_PINTAS:
+                candidatas = tabla_transiciones(total)[1][anterior]
+            else:
+                candidatas = ()
+        hechas = {ordinal(apuesta) for _, apuesta in gestor.historial_apuestas}
+        por_pinta = [0] * NUM_PINTAS
+        acciones = []
+        for valor in candidatas:
+            indice = valor % NUM_PINTAS
+            if por_pinta[indice] < self.anchura and valor not in hechas:
+                por_pinta[indice] += 1
+                acciones.append(("apuesta", valor))
+        if gestor.ultima_apuesta is not None:
+            acciones.append(DUDAR)
+            acciones.append(CALZAR)
+        return acciones
+
+    def _siguiente(self, jugador):
+        return self.gestor.turnos.siguiente(jugador)
+
+    def _aplicar(self, jugador, accion):
+        """
+        Aplica la acción; si termina la ronda retorna la recompensa del
+        jugador que busca: los dados que ganó menos lo que ganaron en
+        promedio los rivales.
+        """
+        self.gestor.elegir_accion(jugador, _accion_a_dict(accion))
+        if accion[0] == "apuesta":
+            return None
+        cambios = [
+            despues - antes
+            for despues, antes in zip(self._dados(), self.dados_iniciales)
+        ]
+        propio = cambios[self.jugador]
+        otros = max(len(self.rivales), 1)
+        return propio - (sum(cambios) - propio) / otros
+
+    def _apuestas_de(self, rival, historial, ases_comodin):
+        """(índice de pinta, cantidad, ases comodín) de cada apuesta del rival."""
+        apuestas = []
+        for jugador, apuesta in historial:
+            if jugador == rival:
+                indice = apuesta.get_pinta().value - 1
+                comodin = ases_comodin and indice != 0
+                apuestas.append((indice, apuesta.get_cantidad(), comodin))
+        return apuestas
+
+    def _consistente(self, cantidad, caras, apuestas):
+        """
+        Indica si, con estas caras, el rival habría hecho sus apuestas de
+        la ronda: ninguna supera lo que esperaría con sus dados más `margen`.
+        """
+        ocultos = self.total_dados - cantidad
+        for indice, apostada, comodin in apuestas:
+            propias = caras.count(indice)
+            if comodin:
+                propias += caras.count(0)
+                esperada = propias + ocultos / 3
+            else:
+                esperada = propias + ocultos / 6
+            if apostada > esperada + self.margen:
+                return False
+        return True
+
+    def _determinizar(self):
+        """
+        Sortea los dados de los rivales. Se rechazan hasta `intentos` veces
+        los sorteos que no son consistentes con las apuestas de cada rival.
+        """
+        self.gestor.restore(self.base)
+        cachos = self.gestor.cachos
+        for rival, cantidad, apuestas in self.rivales:
+            caras = self.generador.generar_caras(cantidad)
+            for _ in range(self.intentos if apuestas else 0):
+                if self._consistente(cantidad, caras, apuestas):
+                    break
+                caras = self.generador.generar_caras(cantidad)
+            cachos[rival].cargar_caras(caras)
+
+    def _elegir(self, lista):
+        return lista[self.generador.generar_entero(0, len(lista) - 1)]
+
+    def _esperanza(self, cacho, indice):
+        """Cantidad esperada de una pinta vista desde el cacho de un jugador."""
+        conteo = cacho.conteo_por_pinta()
+        propias = conteo[indice]
+        probabilidad = 1 / 6
+        if self.gestor.arbitro.usar_ases_comodin and indice != 0:
+            propias += conteo[0]
+            probabilidad = 1 / 3
+        ocultos = self.gestor.indice_pintas.total - cacho.get_cantidad_dados()
+        return propias + ocultos * probabilidad
+
+    def _accion_simulada(self, jugador):
+        """
+        Política de la simulación, al estilo de PoliticaEsperanza: duda si
+        la apuesta supera lo esperado más `margen`; si no, sube a la apuesta
+        mínima de la pinta que más le conviene con sus propios dados.
+        """
+        gestor = self.gestor
+        cacho = gestor.jugadores[jugador].cacho
+        apuesta = gestor.ultima_apuesta
+        if apuesta is not None:
+            esperada = self._esperanza(cacho, apuesta.get_pinta().value - 1)
+            if apuesta.get_cantidad() > esperada + self.margen:
+                return DUDAR
+        mejor, mejor_valor = DUDAR, -math.inf
+        vistas = set()
+        for accion in self._acciones(jugador):
+            if accion[0] != "apuesta":
+                continue
+            cantidad, indice = divmod(accion[1], NUM_PINTAS)
+            if indice in vistas:
+                continue
+            vistas.add(indice)
+            valor = self._esperanza(cacho, indice) - (cantidad + 1)
+            if valor > mejor_valor:
+                mejor, mejor_valor = accion, valor
+        return mejor
+
+    def _jugar_rivales(self):
+        """
+        Los rivales juegan con la política de simulación hasta que vuelve a
+        ser el turno del jugador o termina la ronda.
+        """
+        secuencia = []
+        jugador = self._siguiente(self.jugador)
+        while jugador != self.jugador:
+            accion = self._accion_simulada(jugador)
+            secuencia.append(accion)
+            recompensa = self._aplicar(jugador, accion)
+            if recompensa is not None:
+                return recompensa, tuple(secuencia)
+            jugador = self._siguiente(jugador)
+        return None, tuple(secuencia)
+
+    def _simular(self):
+        """Juega la ronda desde el turno del jugador con la política de simulación."""
+        jugador = self.jugador
+        for _ in range(self.max_profundidad):
+            recompensa = self._aplicar(jugador, self._accion_simulada(jugador))
+            if recompensa is not None:
+                return recompensa
+            jugador = self._siguiente(jugador)
+        return self._aplicar(jugador, DUDAR)
+
+    def _elegir_uct(self, nodo):
+        log_visitas = math.log(nodo.visitas)
+        mejor, mejor_valor = None, -math.inf
+        for accion, (visitas, suma) in nodo.estadisticas.items():
+            valor = suma / visitas + self.exploracion * math.sqrt(log_visitas / visitas)
+            if valor > mejor_valor:
+                mejor, mejor_valor = accion, valor
+        return mejor
+
+    def iterar(self):
+        self._determinizar()
+        nodo = self.raiz
+        camino = []
+        while True:
+            if nodo.pendientes:
+                i = self.generador.generar_entero(0, len(nodo.pendientes) - 1)
+                accion = nodo.pendientes.pop(i)
+                nodo.estadisticas[accion] = [0, 0.0]
+            else:
+                accion = self._elegir_uct(nodo)
+            camino.append((nodo, accion))
+            recompensa = self._aplicar(self.jugador, accion)
+            if recompensa is not None:
+                break
+            recompensa, secuencia = self._jugar_rivales()
+            if recompensa is not None:
+                break
+            hijo = nodo.hijos.get((accion, secuencia))
+            if hijo is None:
+                # Expansión: un nodo nuevo por iteración y luego simulación
+                hijo = _Nodo(self._acciones(self.jugador))
+                nodo.hijos[(accion, secuencia)] = hijo
+                recompensa = self._simular()
+                break
+            nodo = hijo
+        # Retropropagación
+        for visitado, accion in camino:
+            visitado.visitas += 1
+            estadistica = visitado.estadisticas[accion]
+            estadistica[0] += 1
+            estadistica[1] += recompensa
+
+    def visitas_raiz(self):
+        return {
+            accion: visitas
+            for accion, (visitas, _) in self.raiz.estadisticas.items()
+            if visitas
+        }
+
+
+def _gestor_desde_observacion(observacion, generador):
+    """Arma un GestorPartida con la información pública de la observación."""
+    num_jugadores = len(observacion.dados_por_jugador)
+    gestor = GestorPartida(
+        num_jugadores=num_jugadores, generador=generador, compacto=True
+    )
+    # Los dados se sortean en cada iteración; al cerrar la ronda no se agita
+    gestor.agitar_cachos = _sin_agitar
+    propias = [pinta.value - 1 for pinta in observacion.pintas_propias]
+    for i, jugador in enumerate(gestor.jugadores):
+        jugador.activo = observacion.activos[i]
+        jugador.dados_a_favor = observacion.dados_a_favor[i]
+        if i == observacion.jugador:
+            jugador.cacho.cargar_caras(propias)
+        else:
+            jugador.cacho.cargar_caras([0] * observacion.dados_por_jugador[i])
+        # La simulación lee los conteos de cada cacho
+        jugador.cacho.set_visible()
+    gestor.ultima_apuesta = observacion.ultima_apuesta
+    gestor.jugador_ultima_apuesta = observacion.jugador_ultima_apuesta
+    gestor.historial_apuestas = list(observacion.historial)
+    gestor.jugador_actual = observacion.jugador
+    gestor.set_sentido(observacion.sentido)
+    gestor.arbitro.set_ases_comodin(observacion.ases_comodin)
+    return gestor
+
+
+def buscar(
+    observacion,
+    generador,
+    presupuesto_ms=50,
+    iteraciones=None,
+    exploracion=1.0,
+    anchura=2,
+    max_profundidad=12,
+    margen=1.0,
+    intentos=20,
+):
+    """
+    Ejecuta MCTS hasta agotar el tiempo (`presupuesto_ms`) o las
+    iteraciones, lo que ocurra primero, y retorna las visitas de cada
+    acción de la raíz. Sin ninguno de los dos límites se usan 50 ms.
+    Siempre se hace al menos una iteración, así que hay alguna acción
+    visitada aunque el presupuesto sea cero.
+    """
+    busqueda = _Busqueda(
+        observacion, generador, exploracion, anchura, max_profundidad, margen, intentos
+    )
+    if presupuesto_ms is None and iteraciones is None:
+        presupuesto_ms = 50
+    limite = None
+    if presupuesto_ms is not None:
+        limite = time.perf_counter() + presupuesto_ms / 1000
+    hechas = 0
+    while True:
+        busqueda.iterar()
+        hechas += 1
+        if iteraciones is not None and hechas >= iteraciones:
+            break
+        if limite is not None and time.perf_counter() >= limite:
+            break
+    return busqueda.visitas_raiz()
+
+
+class AgenteMCTS(Politica):
+    def __init__(
+        self,
+        generador: GeneradorAleatorio = None,
+        presupuesto_ms=50,
+        iteraciones=None,
+        exploracion=1.0,
+        anchura=2,
+        max_profundidad=12,
+        margen=1.0,
+        intentos=20,
+        num_procesos=1,
+    ):
+        """
+        Con num_procesos > 1 se mantiene un pool de procesos que buscan en
+        paralelo con el mismo presupuesto; hay que llamar a cerrar() al
+        terminar o usar el agente con `with`.
+        """
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        self.presupuesto_ms = presupuesto_ms
+        self.iteraciones = iteraciones
+        self.exploracion = exploracion
+        self.anchura = anchura
+        self.max_profundidad = max_profundidad
+        self.margen = margen
+        self.intentos = intentos
+        self.num_procesos = num_procesos
+        self._pool = None
+
+    def _parametros(self):
+        return (
+            self.presupuesto_ms,
+            self.iteraciones,
+            self.exploracion,
+            self.anchura,
+            self.max_profundidad,
+            self.margen,
+            self.intentos,
+        )
+
+    def actuar(self, observacion):
+        if self.num_procesos == 1:
+            visitas = buscar(observacion, self.generador, *self._parametros())
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.num_procesos)
+            generadores = self.generador.spawn(self.num_procesos)
+            futuros = [
+                self._pool.submit(buscar, observacion, generador, *self._parametros())
+                for generador in generadores
+            ]
+            visitas = {}
+            for futuro in futuros:
+                for accion, cantidad in futuro.result().items():
+                    visitas[accion] = visitas.get(accion, 0) + cantidad
+        # En caso de empate gana la primera acción en orden de ordinal
+        accion = max(sorted(visitas), key=visitas.get)
+        return _accion_a_dict(accion)
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
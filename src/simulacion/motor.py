@@ -0,0 +1,98 @@
+"""
+Motor que juega partidas completas de GestorPartida sin interfaz.
+"""
+
+from src.juego.gestor_partida import GestorPartida
+from src.juego.observacion import construir_observacion
+from src.juego.turnos import HORARIO
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+class PartidaInvalidaError(Exception):
+    """Se lanza cuando una política entrega una acción que no se puede jugar."""
+
+
+class ResultadoPartida:
+    def __init__(self, ganador, rondas, turnos):
+        self.ganador = ganador
+        self.rondas = rondas
+        self.turnos = turnos
+
+
+def _jugador_que_inicia(gestor, jugador, apostador, accion, resultado):
+    """El jugador que pierde o recoge un dado comienza la siguiente ronda."""
+    if accion["tipo"] == "dudar" and resultado["resultado"] == "pierde_apostador":
+        return apostador
+    return jugador
+
+
+def avanzar_turno(gestor, jugador, apostador, accion, resultado):
+    """
+    Deja en `gestor.jugador_actual` a quien juega después de que `jugador`
+    hizo `accion` con `resultado`; `apostador` es quien había hecho la
+    última apuesta antes de la acción.
+    """
+    if accion["tipo"] == "apuesta":
+        gestor.set_jugador_inicial(jugador)
+        gestor.siguiente_jugador()
+    else:
+        gestor.iniciar_ronda_con(
+            _jugador_que_inicia(gestor, jugador, apostador, accion, resultado)
+        )
+
+
+def jugar_partida(
+    politicas,
+    generador: GeneradorAleatorio = None,
+    dados_por_jugador=5,
+    max_turnos=100000,
+    compacto=True,
+    diario=None,
+    metricas=None,
+    sentido=HORARIO,
+):
+    """
+    Juega una partida completa con una política por asiento y retorna un
+    ResultadoPartida con el índice del ganador. Cada política puede ser un
+    Agente (con `actuar`) o un invocable `politica(gestor, jugador)`.
+    Por defecto usa cachos compactos, que consumen el generador igual que
+    los cachos normales y por lo tanto producen la misma partida.
+    Si se entrega un EscritorDiario, la partida queda registrada en él, y
+    si se entrega un Metricas se miden las acciones del gestor. `sentido`
+    es el sentido de juego (ver src.juego.turnos).
+    """
+    gestor = GestorPartida(
+        num_jugadores=len(politicas),
+        dados_por_jugador=dados_por_jugador,
+        generador=generador,
+        compacto=compacto,
+    )
+    gestor.set_jugador_inicial(gestor.determinar_jugador_inicial())
+    gestor.set_sentido(sentido)
+    if diario is not None:
+        gestor.set_diario(diario)
+    if metricas is not None:
+        gestor.set_metricas(metricas)
+    turnos = 0
+    while not gestor.hay_ganador():
+        if turnos >= max_turnos:
+            raise PartidaInvalidaError("La partida superó el máximo de turnos")
+        turnos += 1
+        jugador = gestor.jugador_actual
+        politica = politicas[jugador]
+        if hasattr(politica, "actuar"):
+            accion = politica.actuar(construir_observacion(gestor, jugador))
+        else:
+            accion = politica(gestor, jugador)
+        tipo = accion.get("tipo")
+        if tipo != "apuesta" and gestor.ultima_apuesta is None:
+            raise PartidaInvalidaError(f"No se puede {tipo} sin una apuesta previa")
+        apostador = gestor.jugador_ultima_apuesta
+        resultado = gestor.elegir_accion(jugador, accion)
+        if tipo == "apuesta" and not resultado["valida"]:
+            raise PartidaInvalidaError(
+                f"El jugador {jugador} hizo una apuesta inválida"
+            )
+        avanzar_turno(gestor, jugador, apostador, accion, resultado)
+    ganador = gestor.jugadores_activos()[0]
+    return ResultadoPartida(ganador, gestor.ronda_actual + 1, turnos)
@@ -0,0 +1,540 @@
+"""
+Motor que avanza miles de partidas a la vez sobre arreglos de NumPy.
+
+Es la versión por lotes de src.simulacion.motor_rapido: todas las partidas
+del lote tienen la misma cantidad de asientos y en cada paso cada partida
+que sigue en juego aplica una acción de su jugador actual. Las apuestas son
+ordinales (ver validador_apuesta.ordinal) y las acciones DUDAR y CALZAR son
+los mismos enteros negativos del motor rápido.
+
+- los dados de cada asiento son un histograma: arreglo (partidas, asientos, 6),
+- las dudas y calces del paso se resuelven juntos con esos histogramas,
+- las rondas nuevas se reparten con una sola llamada al generador,
+- las apuestas legales salen de la tabla de transiciones como una máscara
+  (partidas, ordinales).
+
+Las reglas son las de PartidaRapida, pero los dados no salen del mismo flujo
+del generador, así que la misma semilla no da las mismas partidas. Las
+políticas reciben una ObservacionLotes y retornan un arreglo de acciones.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from src.juego.turnos import ANTIHORARIO, HORARIO
+from src.juego.validador_apuesta import tabla_transiciones
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor_rapido import (
+    AS,
+    CALZAR,
+    DUDAR,
+    GANA_CALZADOR,
+    MAX_DADOS,
+    NUM_PINTAS,
+    PIERDE_APOSTADOR,
+    PIERDE_CALZADOR,
+    PIERDE_DUDADOR,
+)
+
+SIN_APUESTA = -1  # valor de ultima_apuesta al inicio de cada ronda
+_PINTAS = np.arange(NUM_PINTAS)
+
+
+def _generador_numpy(generador):
+    """
+    Como en MesaDados: el generador numpy de `generador` si lo tiene o uno
+    con semilla derivada de él, para que las corridas sean reproducibles.
+    """
+    if generador is not None and generador.generador_numpy is not None:
+        return generador.generador_numpy
+    semilla = None
+    if generador is not None:
+        semilla = generador.generar_entero(0, 2**63 - 1)
+    return np.random.default_rng(semilla)
+
+
+@lru_cache(maxsize=16)
+def tabla_validas(total_dados):
+    """
+    Arreglo booleano (filas, total_dados * 6) con las apuestas válidas
+    después de cada ordinal, armado con tabla_transiciones. Las dos últimas
+    filas son las aperturas: sin un dado (no se parte con ases) y con uno.
+    """
+    ordinales = total_dados * NUM_PINTAS
+    mascaras, _ = tabla_transiciones(total_dados)
+    tabla = np.zeros((ordinales + 2, ordinales), dtype=bool)
+    bits = np.arange(ordinales)
+    for anterior, mascara in enumerate(mascaras):
+        # Los enteros de Python no entran en un arreglo: se pasa por bytes
+        crudos = np.frombuffer(
+            mascara.to_bytes((ordinales + 7) // 8, "little"), dtype=np.uint8
+        )
+        tabla[anterior] = np.unpackbits(crudos, bitorder="little")[:ordinales]
+    tabla[ordinales] = bits % NUM_PINTAS != AS
+    tabla[ordinales + 1] = True
+    tabla.setflags(write=False)
+    return tabla
+
+
+def es_valida_lotes(anterior, nuevo, cantidad_dados):
+    """
+    Como motor_rapido.es_valida, elemento a elemento y sin límite de
+    cantidad. `anterior` vale SIN_APUESTA en la primera apuesta de la ronda.
+    """
+    anterior = np.asarray(anterior)
+    nuevo = np.asarray(nuevo)
+    cantidad_nueva, pinta_nueva = np.divmod(nuevo, NUM_PINTAS)
+    cantidad_anterior, pinta_anterior = np.divmod(anterior, NUM_PINTAS)
+    misma_pinta = (pinta_nueva == pinta_anterior) & (cantidad_nueva > cantidad_anterior)
+    pinta_mayor = (cantidad_nueva == cantidad_anterior) & (pinta_nueva > pinta_anterior)
+    # Las cantidades de los ordinales parten en 0: se suma 1 para las reglas
+    a_ases = (
+        (pinta_nueva == AS)
+        & (pinta_anterior != AS)
+        & (cantidad_nueva == (cantidad_anterior + 1) // 2)
+    )
+    desde_ases = (
+        (pinta_anterior == AS)
+        & (pinta_nueva != AS)
+        & (cantidad_nueva >= (cantidad_anterior + 1) * 2)
+    )
+    subida = misma_pinta | pinta_mayor | a_ases | desde_ases
+    apertura = (pinta_nueva != AS) | (cantidad_dados == 1)
+    valida = np.where(anterior == SIN_APUESTA, apertura, subida)
+    return valida & (cantidad_dados >= 1) & (nuevo >= 0)
+
+
+def subidas_minimas_lotes(anterior, cantidad_dados):
+    """
+    Como motor_rapido.subidas_minimas para muchas partidas: retorna los
+    ordinales (partidas, 6) de la subida mínima a cada pinta y la máscara
+    de los que son válidos.
+    """
+    anterior = np.asarray(anterior)[:, np.newaxis]
+    cantidad, pinta = np.divmod(anterior, NUM_PINTAS)
+    cantidad = cantidad + 1
+    minima = np.where(_PINTAS > pinta, cantidad, cantidad + 1)
+    minima = np.where((_PINTAS == AS) & (pinta != AS), cantidad // 2 + 1, minima)
+    minima = np.where((_PINTAS != AS) & (pinta == AS), cantidad * 2 + 1, minima)
+    minima = np.where(anterior == SIN_APUESTA, 1, minima)
+    ordinales = (minima - 1) * NUM_PINTAS + _PINTAS
+    # Con el validador no se puede subir la cantidad bajando de pinta (salvo
+    # a ases o desde ases) ni abrir con ases sin tener un solo dado
+    cantidad_dados = np.asarray(cantidad_dados)[:, np.newaxis]
+    sin_apuesta = anterior == SIN_APUESTA
+    baja = ~sin_apuesta & (pinta != AS) & (_PINTAS != AS) & (_PINTAS < pinta)
+    apertura_ases = sin_apuesta & (_PINTAS == AS) & (cantidad_dados != 1)
+    validas = ~baja & ~apertura_ases & (cantidad_dados >= 1)
+    return ordinales, validas
+
+
+class ObservacionLotes:
+    """
+    Lo que ve el jugador actual de cada partida del lote, en arreglos con
+    una fila por partida. Como Observacion, solo incluye sus propios dados.
+    """
+
+    __slots__ = (
+        "jugador",
+        "pintas_propias",
+        "dados_por_jugador",
+        "total_dados",
+        "activos",
+        "ultima_apuesta",
+        "jugador_ultima_apuesta",
+        "ases_comodin",
+        "ronda",
+        "en_juego",
+    )
+
+    def __init__(
+        self,
+        jugador,
+        pintas_propias,
+        dados_por_jugador,
+        total_dados,
+        activos,
+        ultima_apuesta,
+        jugador_ultima_apuesta,
+        ases_comodin,
+        ronda,
+        en_juego,
+    ):
+        self.jugador = jugador
+        self.pintas_propias = pintas_propias  # histograma (partidas, 6)
+        self.dados_por_jugador = dados_por_jugador
+        self.total_dados = total_dados  # dados en juego en toda la mesa
+        self.activos = activos
+        self.ultima_apuesta = ultima_apuesta
+        self.jugador_ultima_apuesta = jugador_ultima_apuesta
+        self.ases_comodin = ases_comodin
+        self.ronda = ronda
+        self.en_juego = en_juego  # False en las partidas ya terminadas
+
+    @property
+    def cantidad_dados(self):
+        """Cantidad de dados en juego del jugador actual de cada partida."""
+        filas = np.arange(len(self.jugador))
+        return self.dados_por_jugador[filas, self.jugador]
+
+    @property
+    def dados_ocultos(self):
+        return self.total_dados - self.cantidad_dados
+
+    def mascara_apuestas(self):
+        """
+        Arreglo booleano (partidas, asientos * 5 * 6) con las apuestas
+        legales del jugador actual, hasta la mayor cantidad de dados que
+        puede haber en la mesa; vacío en las partidas terminadas.
+        """
+        tabla = tabla_validas(self.dados_por_jugador.shape[1] * MAX_DADOS)
+        ordinales = tabla.shape[1]
+        cantidad_dados = self.cantidad_dados
+        # Una apuesta sobre la cota no tiene fila en la tabla: sus subidas
+        # (solo a ases pueden quedar bajo la cota) se validan una por una
+        sin_fila = self.ultima_apuesta >= ordinales
+        fila = np.where(
+            self.ultima_apuesta == SIN_APUESTA,
+            ordinales + (cantidad_dados == 1),
+            np.where(sin_fila, 0, self.ultima_apuesta),
+        )
+        mascara = tabla[fila]
+        if sin_fila.any():
+            mascara[sin_fila] = es_valida_lotes(
+                self.ultima_apuesta[sin_fila, np.newaxis],
+                np.arange(ordinales),
+                cantidad_dados[sin_fila, np.newaxis],
+            )
+        puede = self.en_juego & (cantidad_dados >= 1)
+        return mascara & puede[:, np.newaxis]
+
+    def puede_dudar(self):
+        """Indica en qué partidas se puede dudar o calzar."""
+        return self.en_juego & (self.ultima_apuesta != SIN_APUESTA)
+
+
+class PartidasLotes:
+    def __init__(
+        self,
+        num_partidas,
+        num_jugadores=3,
+        dados_por_jugador=5,
+        generador: GeneradorAleatorio = None,
+        sentido=HORARIO,
+    ):
+        """
+        Crea `num_partidas` partidas de `num_jugadores` asientos, reparte
+        sus dados y sortea el jugador inicial de cada una. Como MesaDados,
+        usa el generador numpy del generador entregado o deriva uno de él.
+        """
+        if not 1 <= dados_por_jugador <= MAX_DADOS:
+            raise ValueError(f"Se juega con 1 a {MAX_DADOS} dados por jugador")
+        if sentido not in (HORARIO, ANTIHORARIO):
+            raise ValueError("El sentido debe ser HORARIO o ANTIHORARIO")
+        self._rng = _generador_numpy(generador)
+        self.num_partidas = num_partidas
+        self.num_jugadores = num_jugadores
+        self.sentido = sentido
+        forma = (num_partidas, num_jugadores)
+        self.conteos = np.zeros(forma + (NUM_PINTAS,), dtype=np.int16)
+        self.dados = np.full(forma, dados_por_jugador, dtype=np.int16)
+        self.dados_a_favor = np.zeros(forma, dtype=np.int16)
+        self.activos = np.ones(forma, dtype=bool)
+        # Totales por partida, al día para no recorrer los asientos
+        self.num_activos = np.full(num_partidas, num_jugadores, dtype=np.int64)
+        self.total_dados = np.full(
+            num_partidas, num_jugadores * dados_por_jugador, dtype=np.int64
+        )
+        self.con_un_dado = np.full(
+            num_partidas, num_jugadores if dados_por_jugador == 1 else 0, dtype=np.int64
+        )
+        self.ultima_apuesta = np.full(num_partidas, SIN_APUESTA, dtype=np.int64)
+        self.jugador_ultima_apuesta = np.full(num_partidas, -1, dtype=np.int64)
+        self.ronda_actual = np.zeros(num_partidas, dtype=np.int64)
+        self.turnos = np.zeros(num_partidas, dtype=np.int64)
+        # Como en PartidaRapida, la regla de ases recién se revisa después de
+        # la primera acción, aunque se juegue con un dado
+        self.ases_comodin = np.ones(num_partidas, dtype=bool)
+        self._repartir(np.arange(num_partidas))
+        self.jugador_actual = self._rng.integers(0, num_jugadores, size=num_partidas)
+
+    @classmethod
+    def desde_partidas(cls, partidas):
+        """
+        Arma un lote con el estado actual de varias PartidaRapida de la
+        misma cantidad de asientos y el mismo sentido de juego.
+        """
+        primera = partidas[0]
+        lote = cls(len(partidas), primera.num_jugadores, sentido=primera.sentido)
+        for i, partida in enumerate(partidas):
+            lote.conteos[i] = partida.conteos
+            lote.dados[i] = partida.dados
+            lote.dados_a_favor[i] = partida.dados_a_favor
+            lote.activos[i] = [
+                bool(partida.activos >> j & 1) for j in range(partida.num_jugadores)
+            ]
+            lote.num_activos[i] = lote.activos[i].sum()
+            lote.total_dados[i] = partida.total_dados
+            lote.con_un_dado[i] = partida.con_un_dado
+            if partida.ultima_apuesta is not None:
+                lote.ultima_apuesta[i] = partida.ultima_apuesta
+                lote.jugador_ultima_apuesta[i] = partida.jugador_ultima_apuesta
+            lote.jugador_actual[i] = partida.jugador_actual
+            lote.ronda_actual[i] = partida.ronda_actual
+            lote.ases_comodin[i] = partida.ases_comodin
+        return lote
+
+    def terminadas(self):
+        """Indica qué partidas ya tienen ganador."""
+        return self.num_activos <= 1
+
+    def ganadores(self):
+        """Asiento del ganador de cada partida, o -1 si sigue en juego."""
+        return np.where(self.terminadas(), self.activos.argmax(axis=1), -1)
+
+    def observar(self):
+        """Observación del jugador actual de cada partida."""
+        filas = np.arange(self.num_partidas)
+        return ObservacionLotes(
+            jugador=self.jugador_actual,
+            pintas_propias=self.conteos[filas, self.jugador_actual],
+            dados_por_jugador=self.dados,
+            total_dados=self.total_dados,
+            activos=self.activos,
+            ultima_apuesta=self.ultima_apuesta,
+            jugador_ultima_apuesta=self.jugador_ultima_apuesta,
+            ases_comodin=self.ases_comodin,
+            ronda=self.ronda_actual,
+            en_juego=~self.terminadas(),
+        )
+
+    def siguientes(self, partidas, asientos):
+        """
+        Asiento activo que juega después de cada asiento en su partida, en
+        el sentido de juego, o el mismo asiento si no queda otro.
+        """
+        pasos = np.arange(1, self.num_jugadores + 1) * self.sentido
+        candidatos = (asientos[:, np.newaxis] + pasos) % self.num_jugadores
+        activos = self.activos[partidas[:, np.newaxis], candidatos]
+        primero = candidatos[np.arange(len(partidas)), activos.argmax(axis=1)]
+        return np.where(activos.any(axis=1), primero, asientos)
+
+    def actuar(self, acciones):
+        """
+        Aplica la acción del jugador actual en cada partida en juego; las
+        partidas terminadas no cambian. Retorna un arreglo con, por cada
+        partida, 1 o 0 si apostó (0 si la apuesta fue inválida y la partida
+        no cambió) o el código de resultado del diario si dudó o calzó.
+        """
+        acciones = np.asarray(acciones, dtype=np.int64)
+        resultados = np.zeros(self.num_partidas, dtype=np.int8)
+        partidas = np.flatnonzero(~self.terminadas())
+        accion = acciones[partidas]
+        jugador = self.jugador_actual[partidas]
+        if (accion < CALZAR).any():
+            raise ValueError("Acción desconocida")
+        jugada = accion < 0
+        if (self.ultima_apuesta[partidas[jugada]] == SIN_APUESTA).any():
+            raise ValueError("No se puede dudar ni calzar sin una apuesta previa")
+        self.turnos[partidas] += 1
+
+        apuestas = partidas[~jugada]
+        if len(apuestas):
+            apostador = jugador[~jugada]
+            nuevo = accion[~jugada]
+            validas = es_valida_lotes(
+                self.ultima_apuesta[apuestas], nuevo, self.dados[apuestas, apostador]
+            )
+            resultados[apuestas] = validas
+            apuestas, apostador = apuestas[validas], apostador[validas]
+            self.ultima_apuesta[apuestas] = nuevo[validas]
+            self.jugador_ultima_apuesta[apuestas] = apostador
+            self.jugador_actual[apuestas] = self.siguientes(apuestas, apostador)
+
+        resueltas = partidas[jugada]
+        if len(resueltas):
+            self._resolver(resueltas, jugador[jugada], accion[jugada], resultados)
+        # Como GestorPartida, la regla de ases se revisa después de cada acción
+        self.ases_comodin[partidas] = self.con_un_dado[partidas] == 0
+        return resultados
+
+    def _resolver(self, partidas, jugador, accion, resultados):
+        """Resuelve juntas las dudas y los calces del paso."""
+        cantidad, pinta = np.divmod(self.ultima_apuesta[partidas], NUM_PINTAS)
+        cantidad += 1
+        mesa = self.conteos[partidas].sum(axis=1)
+        filas = np.arange(len(partidas))
+        total = mesa[filas, pinta] + np.where(
+            self.ases_comodin[partidas] & (pinta != AS), mesa[:, AS], 0
+        )
+        dudar = accion == DUDAR
+        pierde_dudador = total >= cantidad
+        acierta = total == cantidad
+        resultado = np.where(
+            dudar,
+            np.where(pierde_dudador, PIERDE_DUDADOR, PIERDE_APOSTADOR),
+            np.where(acierta, GANA_CALZADOR, PIERDE_CALZADOR),
+        )
+        resultados[partidas] = resultado
+        apostador = self.jugador_ultima_apuesta[partidas]
+        inicia = np.where(dudar & ~pierde_dudador, apostador, jugador)
+        gana = ~dudar & acierta
+        self._quitar_dados(partidas[~gana], inicia[~gana])
+        self._agregar_dados(partidas[gana], inicia[gana])
+        # Como en PartidaRapida, las partidas que terminan no parten otra ronda
+        siguen = partidas[~self.terminadas()[partidas]]
+        self.ronda_actual[siguen] += 1
+        self._repartir(siguen)
+        self.ultima_apuesta[siguen] = SIN_APUESTA
+        self.jugador_ultima_apuesta[siguen] = -1
+        self.jugador_actual[partidas] = np.where(
+            self.activos[partidas, inicia], inicia, self.siguientes(partidas, inicia)
+        )
+
+    def _quitar_dados(self, partidas, asientos):
+        """Quita un dado a cada asiento, o uno de sus dados a favor."""
+        favor = self.dados_a_favor[partidas, asientos] > 0
+        self.dados_a_favor[partidas[favor], asientos[favor]] -= 1
+        quitar = ~favor & (self.dados[partidas, asientos] > 0)
+        partidas, asientos = partidas[quitar], asientos[quitar]
+        # Como CachoCompacto, se pierde un dado de la pinta más alta
+        conteo = self.conteos[partidas, asientos]
+        pinta = NUM_PINTAS - 1 - (conteo[:, ::-1] > 0).argmax(axis=1)
+        self.conteos[partidas, asientos, pinta] -= 1
+        self._cambiar_dados(partidas, asientos, -1)
+        eliminados = self.dados[partidas, asientos] == 0
+        self.activos[partidas[eliminados], asientos[eliminados]] = False
+        self.num_activos[partidas[eliminados]] -= 1
+
+    def _agregar_dados(self, partidas, asientos):
+        """Da un dado a cada asiento, o un dado a favor si ya tiene el máximo."""
+        lleno = self.dados[partidas, asientos] >= MAX_DADOS
+        self.dados_a_favor[partidas[lleno], asientos[lleno]] += 1
+        partidas, asientos = partidas[~lleno], asientos[~lleno]
+        pinta = self._rng.integers(0, NUM_PINTAS, size=len(partidas))
+        self.conteos[partidas, asientos, pinta] += 1
+        self._cambiar_dados(partidas, asientos, 1)
+
+    def _cambiar_dados(self, partidas, asientos, diferencia):
+        antes = self.dados[partidas, asientos]
+        despues = antes + diferencia
+        self.dados[partidas, asientos] = despues
+        self.total_dados[partidas] += diferencia
+        self.con_un_dado[partidas] += (despues == 1).astype(np.int64) - (antes == 1)
+
+    def _repartir(self, partidas):
+        """Agita los dados de las partidas entregadas con una sola llamada."""
+        if not len(partidas):
+            return
+        forma = (len(partidas), self.num_jugadores, MAX_DADOS)
+        caras = self._rng.integers(0, NUM_PINTAS, size=forma, dtype=np.int64)
+        en_juego = np.arange(MAX_DADOS) < self.dados[partidas][..., np.newaxis]
+        # Los dados fuera de juego van a una séptima casilla que se descarta
+        caras = np.where(en_juego, caras, NUM_PINTAS)
+        casillas = (np.arange(forma[0] * forma[1]) * (NUM_PINTAS + 1)).reshape(
+            forma[:2] + (1,)
+        )
+        conteos = np.bincount(
+            (casillas + caras).ravel(), minlength=forma[0] * forma[1] * (NUM_PINTAS + 1)
+        )
+        self.conteos[partidas] = conteos.reshape(forma[:2] + (NUM_PINTAS + 1,))[
+            ..., :NUM_PINTAS
+        ]
+
+
+class PoliticaEsperanzaLotes:
+    """
+    PoliticaEsperanza para un lote: toma la misma decisión que
+    motor_rapido.politica_esperanza en cada partida.
+    """
+
+    def __init__(self, margen=1.0):
+        self.margen = margen
+
+    def esperanzas(self, observacion):
+        """Cantidad esperada de cada pinta, arreglo (partidas, 6)."""
+        propias = observacion.pintas_propias
+        ocultos = observacion.dados_ocultos[:, np.newaxis]
+        sin_comodin = propias + ocultos * (1 / 6)
+        comodin = propias + propias[:, AS : AS + 1] + ocultos * (2 / 6)
+        usa_ases = observacion.ases_comodin[:, np.newaxis] & (_PINTAS != AS)
+        return np.where(usa_ases, comodin, sin_comodin)
+
+    def actuar(self, observacion):
+        esperanza = self.esperanzas(observacion)
+        anterior = observacion.ultima_apuesta
+        filas = np.arange(len(anterior))
+        cantidad, pinta = np.divmod(anterior, NUM_PINTAS)
+        dudar = (anterior != SIN_APUESTA) & (
+            cantidad + 1 > esperanza[filas, pinta] + self.margen
+        )
+        ordinales, validas = subidas_minimas_lotes(anterior, observacion.cantidad_dados)
+        valor = np.where(validas, esperanza - (ordinales // NUM_PINTAS + 1), -np.inf)
+        # argmax se queda con la primera pinta ante un empate, como max()
+        mejor = valor.argmax(axis=1)
+        dudar |= ~validas.any(axis=1)
+        return np.where(dudar, DUDAR, ordinales[filas, mejor])
+
+
+class PoliticaAleatoriaLotes:
+    """
+    PoliticaAleatoria para un lote: duda con cierta probabilidad; si no,
+    sube con una apuesta mínima al azar.
+    """
+
+    def __init__(self, generador: GeneradorAleatorio = None, prob_dudar=0.3):
+        self._rng = _generador_numpy(generador)
+        self.prob_dudar = prob_dudar
+
+    def actuar(self, observacion):
+        anterior = observacion.ultima_apuesta
+        ordinales, validas = subidas_minimas_lotes(anterior, observacion.cantidad_dados)
+        # Una puntuación al azar por candidata elige una válida uniformemente
+        azar = np.where(validas, self._rng.random(validas.shape), -1.0)
+        elegida = ordinales[np.arange(len(anterior)), azar.argmax(axis=1)]
+        dudar = (anterior != SIN_APUESTA) & (
+            self._rng.random(len(anterior)) < self.prob_dudar
+        )
+        return np.where(dudar | ~validas.any(axis=1), DUDAR, elegida)
+
+
+def jugar_lotes(
+    politicas,
+    num_partidas,
+    generador: GeneradorAleatorio = None,
+    dados_por_jugador=5,
+    max_pasos=100000,
+    sentido=HORARIO,
+):
+    """
+    Juega `num_partidas` partidas a la vez con una política por asiento
+    (un objeto con `actuar(observacion_lotes)`). Una política repetida en
+    varios asientos se evalúa una sola vez por paso. Retorna los arreglos
+    (ganadores, rondas, turnos) de cada partida.
+    """
+    lote = PartidasLotes(
+        num_partidas, len(politicas), dados_por_jugador, generador, sentido
+    )
+    distintas = list({id(politica): politica for politica in politicas}.values())
+    pasos = 0
+    while not lote.terminadas().all():
+        if pasos >= max_pasos:
+            raise ValueError("Las partidas superaron el máximo de pasos")
+        pasos += 1
+        observacion = lote.observar()
+        if len(distintas) == 1:
+            acciones = distintas[0].actuar(observacion)
+        else:
+            acciones = np.empty(num_partidas, dtype=np.int64)
+            for politica in distintas:
+                propias = politica.actuar(observacion)
+                for asiento, otra in enumerate(politicas):
+                    if otra is politica:
+                        elegidas = observacion.jugador == asiento
+                        acciones[elegidas] = propias[elegidas]
+        resultados = lote.actuar(acciones)
+        apostaron = observacion.en_juego & (acciones >= 0)
+        if (apostaron & (resultados == 0)).any():
+            raise ValueError("Una política hizo una apuesta inválida")
+    return lote.ganadores(), lote.ronda_actual + 1, lote.turnos
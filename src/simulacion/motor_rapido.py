@@ -0,0 +1,365 @@
+"""
+Motor de partidas sobre enteros, para simular muchas partidas.
+
+Juega con las mismas reglas que GestorPartida con cachos compactos y
+consume el generador de la misma forma, así que con la misma semilla y las
+mismas acciones llega a los mismos resultados (src.simulacion.diferencial
+lo verifica). No usa objetos Dado, Cacho ni Apuesta:
+
+- las apuestas son ordinales (ver validador_apuesta.ordinal),
+- los dados de cada asiento son un histograma de 6 enteros,
+- cada ronda se reparte con una sola llamada a generar_caras.
+
+Las acciones son enteros: el ordinal de la apuesta, DUDAR o CALZAR. No
+incluye la ronda especial "obligar" ni el diario.
+"""
+
+from functools import lru_cache
+from math import inf
+
+from src.juego.turnos import ANTIHORARIO, HORARIO
+from src.servicios.diario import CODIGO_RESULTADO
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+NUM_PINTAS = 6
+AS = 0  # índice de la pinta AS en los histogramas y ordinales
+MAX_DADOS = 5
+
+DUDAR = -1
+CALZAR = -2
+
+# Códigos de resultado, los mismos del diario
+PIERDE_DUDADOR = CODIGO_RESULTADO["pierde_dudador"]
+PIERDE_APOSTADOR = CODIGO_RESULTADO["pierde_apostador"]
+GANA_CALZADOR = CODIGO_RESULTADO["gana_calzador"]
+PIERDE_CALZADOR = CODIGO_RESULTADO["pierde_calzador"]
+
+
+def es_valida(anterior, nuevo, cantidad_dados):
+    """
+    Igual que ValidadorApuesta.es_valida, sobre ordinales y sin límite de
+    cantidad. `anterior` es None en la primera apuesta de la ronda.
+    """
+    if cantidad_dados < 1 or nuevo < 0:
+        return False
+    pinta_nueva = nuevo % NUM_PINTAS
+    if anterior is None:
+        return pinta_nueva != AS or cantidad_dados == 1
+    cantidad_nueva = nuevo // NUM_PINTAS
+    cantidad_anterior = anterior // NUM_PINTAS
+    pinta_anterior = anterior % NUM_PINTAS
+    if pinta_nueva == pinta_anterior:
+        return cantidad_nueva > cantidad_anterior
+    if cantidad_nueva == cantidad_anterior and pinta_nueva > pinta_anterior:
+        return True
+    # Las cantidades de los ordinales parten en 0: se suma 1 para las reglas
+    if pinta_nueva == AS:
+        return cantidad_nueva + 1 == (cantidad_anterior + 1) // 2 + 1
+    if pinta_anterior == AS:
+        return cantidad_nueva + 1 >= (cantidad_anterior + 1) * 2 + 1
+    return False
+
+
+def subidas_minimas(anterior, cantidad_dados):
+    """Como politicas.subidas_minimas, retornando una tupla de ordinales."""
+    if cantidad_dados < 1:
+        return ()
+    return _subidas_minimas(anterior, cantidad_dados == 1)
+
+
+@lru_cache(maxsize=None)
+def _subidas_minimas(anterior, un_dado):
+    # es_valida solo distingue entre tener uno o más dados
+    candidatas = []
+    for pinta in range(NUM_PINTAS):
+        if anterior is None:
+            cantidad = 1
+        else:
+            cantidad_anterior, pinta_anterior = divmod(anterior, NUM_PINTAS)
+            cantidad_anterior += 1
+            if pinta == AS and pinta_anterior != AS:
+                cantidad = cantidad_anterior // 2 + 1
+            elif pinta != AS and pinta_anterior == AS:
+                cantidad = cantidad_anterior * 2 + 1
+            elif pinta > pinta_anterior:
+                cantidad = cantidad_anterior
+            else:
+                cantidad = cantidad_anterior + 1
+        valor = (cantidad - 1) * NUM_PINTAS + pinta
+        if es_valida(anterior, valor, 1 if un_dado else 2):
+            candidatas.append(valor)
+    return tuple(candidatas)
+
+
+# Subidas mínimas como (ordinal, cantidad, pinta) para las políticas, por
+# anterior y separadas según si el jugador tiene un dado. Son diccionarios
+# simples porque se consultan en cada turno.
+_CANDIDATAS = ({}, {})
+
+
+def _candidatas(anterior, un_dado):
+    tabla = _CANDIDATAS[un_dado]
+    candidatas = tabla.get(anterior)
+    if candidatas is None:
+        candidatas = tabla[anterior] = tuple(
+            (valor, valor // NUM_PINTAS + 1, valor % NUM_PINTAS)
+            for valor in _subidas_minimas(anterior, un_dado)
+        )
+    return candidatas
+
+
+class PartidaRapida:
+    __slots__ = (
+        "num_jugadores",
+        "generador",
+        "conteos",
+        "mesa",
+        "dados",
+        "dados_a_favor",
+        "activos",
+        "con_un_dado",
+        "total_dados",
+        "ultima_apuesta",
+        "jugador_ultima_apuesta",
+        "jugador_actual",
+        "ronda_actual",
+        "ases_comodin",
+        "sentido",
+    )
+
+    def __init__(
+        self,
+        num_jugadores=3,
+        dados_por_jugador=5,
+        generador: GeneradorAleatorio = None,
+        sentido=HORARIO,
+    ):
+        """
+        Reparte los dados iniciales como GestorPartida(compacto=True): cinco
+        dados por asiento lanzados de a uno, quitando los de pinta más alta
+        si se juega con menos.
+        """
+        if not 1 <= dados_por_jugador <= MAX_DADOS:
+            raise ValueError(f"Se juega con 1 a {MAX_DADOS} dados por jugador")
+        if sentido not in (HORARIO, ANTIHORARIO):
+            raise ValueError("El sentido debe ser HORARIO o ANTIHORARIO")
+        self.num_jugadores = num_jugadores
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        self.conteos = []  # histograma de pintas de cada asiento
+        generar_entero = self.generador.generar_entero
+        for _ in range(num_jugadores):
+            conteo = [0] * NUM_PINTAS
+            for _ in range(MAX_DADOS):
+                conteo[generar_entero(0, NUM_PINTAS - 1)] += 1
+            pinta = NUM_PINTAS - 1
+            for _ in range(MAX_DADOS - dados_por_jugador):
+                while conteo[pinta] == 0:
+                    pinta -= 1
+                conteo[pinta] -= 1
+            self.conteos.append(conteo)
+        self.mesa = [sum(columna) for columna in zip(*self.conteos)]
+        self.dados = [dados_por_jugador] * num_jugadores
+        self.dados_a_favor = [0] * num_jugadores
+        self.activos = (1 << num_jugadores) - 1  # bit i: el asiento i juega
+        self.con_un_dado = num_jugadores if dados_por_jugador == 1 else 0
+        self.total_dados = dados_por_jugador * num_jugadores
+        self.ultima_apuesta = None
+        self.jugador_ultima_apuesta = None
+        self.jugador_actual = 0
+        self.ronda_actual = 0
+        # Como en GestorPartida, la regla de ases recién se revisa después de
+        # la primera acción, aunque se juegue con un dado
+        self.ases_comodin = True
+        self.sentido = sentido
+
+    def hay_ganador(self):
+        activos = self.activos
+        return activos & (activos - 1) == 0
+
+    def ganador(self):
+        """Asiento del ganador, o None si la partida sigue."""
+        if not self.hay_ganador() or not self.activos:
+            return None
+        return self.activos.bit_length() - 1
+
+    def siguiente(self, asiento):
+        """Asiento activo que juega después de `asiento` en el sentido de juego."""
+        activos = self.activos
+        if not activos:
+            return asiento
+        if self.sentido == HORARIO:
+            mayores = activos >> (asiento + 1) << (asiento + 1)
+            elegidos = mayores if mayores else activos
+            return (elegidos & -elegidos).bit_length() - 1
+        menores = activos & ((1 << asiento) - 1)
+        return (menores if menores else activos).bit_length() - 1
+
+    def contar(self, pinta):
+        """Dados de la mesa que cuentan para `pinta` con la regla de ases actual."""
+        cantidad = self.mesa[pinta]
+        if self.ases_comodin and pinta != AS:
+            cantidad += self.mesa[AS]
+        return cantidad
+
+    def actuar(self, jugador, accion):
+        """
+        Aplica la acción del jugador y pasa el turno. Para una apuesta
+        retorna 1 si fue válida y 0 si no (sin cambiar nada, ni el turno);
+        para DUDAR o CALZAR retorna el código de resultado del diario.
+        """
+        if accion >= 0:
+            # Como GestorPartida, la regla de ases se revisa en cada acción
+            self.ases_comodin = self.con_un_dado == 0
+            if not es_valida(self.ultima_apuesta, accion, self.dados[jugador]):
+                return 0
+            self.ultima_apuesta = accion
+            self.jugador_ultima_apuesta = jugador
+            self.jugador_actual = self.siguiente(jugador)
+            return 1
+        if self.ultima_apuesta is None:
+            raise ValueError("No se puede dudar ni calzar sin una apuesta previa")
+        cantidad, pinta = divmod(self.ultima_apuesta, NUM_PINTAS)
+        cantidad += 1
+        total = self.contar(pinta)
+        if accion == DUDAR:
+            apostador = self.jugador_ultima_apuesta
+            if total >= cantidad:
+                resultado, inicia = PIERDE_DUDADOR, jugador
+            else:
+                resultado, inicia = PIERDE_APOSTADOR, apostador
+            self._quitar_dado(inicia)
+        elif accion == CALZAR:
+            # Con el histograma de la mesa siempre se puede calzar, igual
+            # que en ArbitroRonda con IndicePintas
+            inicia = jugador
+            if total == cantidad:
+                resultado = GANA_CALZADOR
+                self._agregar_dado(jugador)
+            else:
+                resultado = PIERDE_CALZADOR
+                self._quitar_dado(jugador)
+        else:
+            raise ValueError(f"Acción desconocida: {accion}")
+        if not self.hay_ganador():
+            self._nueva_ronda()
+        self.ases_comodin = self.con_un_dado == 0
+        self.jugador_actual = (
+            inicia if self.activos >> inicia & 1 else self.siguiente(inicia)
+        )
+        return resultado
+
+    def _cambiar_dados(self, asiento, diferencia):
+        antes = self.dados[asiento]
+        despues = antes + diferencia
+        self.dados[asiento] = despues
+        self.total_dados += diferencia
+        self.con_un_dado += (despues == 1) - (antes == 1)
+
+    def _quitar_dado(self, asiento):
+        if self.dados_a_favor[asiento] > 0:
+            self.dados_a_favor[asiento] -= 1
+            return
+        if self.dados[asiento] == 0:
+            return
+        # Como CachoCompacto, se pierde un dado de la pinta más alta
+        conteo = self.conteos[asiento]
+        pinta = NUM_PINTAS - 1
+        while conteo[pinta] == 0:
+            pinta -= 1
+        conteo[pinta] -= 1
+        self.mesa[pinta] -= 1
+        self._cambiar_dados(asiento, -1)
+        if self.dados[asiento] == 0:
+            self.activos &= ~(1 << asiento)
+
+    def _agregar_dado(self, asiento):
+        if self.dados[asiento] < MAX_DADOS:
+            pinta = self.generador.generar_entero(0, NUM_PINTAS - 1)
+            self.conteos[asiento][pinta] += 1
+            self.mesa[pinta] += 1
+            self._cambiar_dados(asiento, 1)
+        else:
+            self.dados_a_favor[asiento] += 1
+
+    def _nueva_ronda(self):
+        """Agita los dados de los asientos activos con una sola llamada."""
+        self.ronda_actual += 1
+        caras = self.generador.generar_caras(self.total_dados)
+        mesa = [0] * NUM_PINTAS
+        for cara in caras:
+            mesa[cara] += 1
+        conteos = self.conteos
+        inicio = 0
+        for asiento, cantidad in enumerate(self.dados):
+            conteo = [0] * NUM_PINTAS
+            for cara in caras[inicio : inicio + cantidad]:
+                conteo[cara] += 1
+            inicio += cantidad
+            conteos[asiento] = conteo
+        self.mesa = mesa
+        self.ultima_apuesta = None
+        self.jugador_ultima_apuesta = None
+
+
+def politica_esperanza(partida, jugador, margen=1.0):
+    """
+    La misma decisión que PoliticaEsperanza, calculada sobre la partida
+    rápida con los dados propios del jugador.
+    """
+    propias = partida.conteos[jugador]
+    dados = partida.dados[jugador]
+    ocultos = partida.total_dados - dados
+    comodin = ocultos * (2 / 6)
+    sin_comodin = ocultos * (1 / 6)
+    ases = propias[AS] if partida.ases_comodin else None
+    anterior = partida.ultima_apuesta
+    if anterior is not None:
+        pinta = anterior % NUM_PINTAS
+        if ases is not None and pinta != AS:
+            esperanza = propias[pinta] + ases + comodin
+        else:
+            esperanza = propias[pinta] + sin_comodin
+        if anterior // NUM_PINTAS + 1 > esperanza + margen:
+            return DUDAR
+    # Como max(), ante un empate se queda con la primera candidata
+    mejor, mejor_valor = DUDAR, -inf
+    candidatas = _CANDIDATAS[dados == 1].get(anterior)
+    if candidatas is None:
+        candidatas = _candidatas(anterior, dados == 1)
+    for valor, cantidad, pinta in candidatas:
+        if ases is not None and pinta != AS:
+            esperanza = propias[pinta] + ases + comodin - cantidad
+        else:
+            esperanza = propias[pinta] + sin_comodin - cantidad
+        if esperanza > mejor_valor:
+            mejor, mejor_valor = valor, esperanza
+    return mejor
+
+
+def jugar_partida_rapida(
+    politicas,
+    generador: GeneradorAleatorio = None,
+    dados_por_jugador=5,
+    max_turnos=100000,
+    sentido=HORARIO,
+):
+    """
+    Juega una partida completa con una política `politica(partida, jugador)`
+    por asiento, que retorna una acción entera. Elige al jugador inicial
+    como jugar_partida y retorna (ganador, rondas, turnos).
+    """
+    partida = PartidaRapida(len(politicas), dados_por_jugador, generador, sentido)
+    partida.jugador_actual = partida.generador.generar_entero(0, len(politicas) - 1)
+    actuar = partida.actuar
+    turnos = 0
+    # Igual que hay_ganador, sin la llamada en cada turno
+    while partida.activos & (partida.activos - 1):
+        if turnos >= max_turnos:
+            raise ValueError("La partida superó el máximo de turnos")
+        turnos += 1
+        jugador = partida.jugador_actual
+        accion = politicas[jugador](partida, jugador)
+        resultado = actuar(jugador, accion)
+        if accion >= 0 and not resultado:
+            raise ValueError(f"El jugador {jugador} hizo una apuesta inválida")
+    return partida.ganador(), partida.ronda_actual + 1, turnos
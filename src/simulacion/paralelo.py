@@ -0,0 +1,96 @@
+"""
+Ejecución Monte Carlo de muchas partidas repartidas en un pool de procesos.
+
+Cada lote de partidas recibe un generador hijo derivado de la semilla maestra
+con GeneradorAleatorio.spawn, por lo que el resultado no depende de la
+cantidad de procesos usados.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import jugar_partida
+from src.simulacion.politicas import crear_politica
+
+
+class ResultadoSimulacion:
+    def __init__(self, num_jugadores):
+        self.partidas = 0
+        self.victorias = [0] * num_jugadores
+        self.rondas = 0
+        self.turnos = 0
+
+    def registrar(self, resultado_partida):
+        self.partidas += 1
+        self.victorias[resultado_partida.ganador] += 1
+        self.rondas += resultado_partida.rondas
+        self.turnos += resultado_partida.turnos
+
+    def combinar(self, otro):
+        """Suma los resultados de otro lote a este resultado."""
+        self.partidas += otro.partidas
+        self.victorias = [a + b for a, b in zip(self.victorias, otro.victorias)]
+        self.rondas += otro.rondas
+        self.turnos += otro.turnos
+        return self
+
+    def tasas_victoria(self):
+        if self.partidas == 0:
+            return [0.0] * len(self.victorias)
+        return [v / self.partidas for v in self.victorias]
+
+
+def generadores_de_lotes(semilla_maestra, num_lotes):
+    """Deriva un generador independiente por lote a partir de la semilla maestra."""
+    return GeneradorAleatorio(semilla_maestra).spawn(num_lotes)
+
+
+def simular_lote(nombres_politicas, num_partidas, generador, dados_por_jugador=5):
+    """
+    Juega `num_partidas` en el proceso actual. Cada partida usa su propio
+    flujo de dados y de políticas, derivados del generador del lote.
+    """
+    resultado = ResultadoSimulacion(len(nombres_politicas))
+    for generador_partida in generador.spawn(num_partidas):
+        generador_dados, generador_politicas = generador_partida.spawn(2)
+        politicas = [
+            crear_politica(nombre, generador_politicas) for nombre in nombres_politicas
+        ]
+        resultado.registrar(
+            jugar_partida(politicas, generador_dados, dados_por_jugador)
+        )
+    return resultado
+
+
+def simular(
+    nombres_politicas,
+    num_partidas,
+    semilla_maestra=0,
+    num_procesos=None,
+    partidas_por_lote=100,
+    dados_por_jugador=5,
+):
+    """
+    Reparte las partidas en lotes, los ejecuta en un ProcessPoolExecutor y
+    combina los resultados en el orden de los lotes.
+    Con num_procesos=1 todo se ejecuta en el proceso actual.
+    """
+    tamanos = []
+    restantes = num_partidas
+    while restantes > 0:
+        tamanos.append(min(partidas_por_lote, restantes))
+        restantes -= tamanos[-1]
+    generadores = generadores_de_lotes(semilla_maestra, len(tamanos))
+    total = ResultadoSimulacion(len(nombres_politicas))
+    argumentos = [
+        (nombres_politicas, tamano, generador, dados_por_jugador)
+        for tamano, generador in zip(tamanos, generadores)
+    ]
+    if num_procesos == 1:
+        for args in argumentos:
+            total.combinar(simular_lote(*args))
+        return total
+    with ProcessPoolExecutor(max_workers=num_procesos) as pool:
+        for resultado in pool.map(simular_lote, *zip(*argumentos)):
+            total.combinar(resultado)
+    return total
@@ -0,0 +1,125 @@
+"""
+Políticas de jugadores automáticos para simular partidas completas.
+
+Las políticas son agentes (ver src.simulacion.agente.Agente): reciben una
+Observacion en `actuar` y retornan una acción con el formato que acepta
+`GestorPartida.elegir_accion`. También se pueden invocar como
+`politica(gestor, jugador)`.
+"""
+
+from abc import ABC, abstractmethod
+
+from src.juego.dado import PINTAS, Pinta
+from src.juego.observacion import construir_observacion
+from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+class Politica(ABC):
+    """
+    Base de las políticas: adapta la llamada con gestor a `actuar`. Las
+    subclases deben implementar `actuar`.
+    """
+
+    def __call__(self, gestor, jugador):
+        return self.actuar(construir_observacion(gestor, jugador))
+
+    @abstractmethod
+    def actuar(self, observacion):
+        """Retorna la acción elegida para la observación."""
+
+
+def subidas_minimas(apuesta_anterior, cantidad_dados):
+    """
+    Retorna las apuestas válidas más bajas de cada pinta que superan a la
+    apuesta anterior (o las aperturas posibles si no hay apuesta).
+    """
+    candidatas = []
+    for pinta in PINTAS:
+        if apuesta_anterior is None:
+            cantidad = 1
+        elif pinta == Pinta.AS and apuesta_anterior.get_pinta() != Pinta.AS:
+            cantidad = apuesta_anterior.get_cantidad() // 2 + 1
+        elif pinta != Pinta.AS and apuesta_anterior.get_pinta() == Pinta.AS:
+            cantidad = apuesta_anterior.get_cantidad() * 2 + 1
+        elif pinta.value > apuesta_anterior.get_pinta().value:
+            cantidad = apuesta_anterior.get_cantidad()
+        else:
+            cantidad = apuesta_anterior.get_cantidad() + 1
+        apuesta = Apuesta.obtener(cantidad, pinta)
+        if ValidadorApuesta.es_valida(apuesta_anterior, apuesta, cantidad_dados):
+            candidatas.append(apuesta)
+    return candidatas
+
+
+class PoliticaAleatoria(Politica):
+    """Duda con cierta probabilidad; si no, sube con una apuesta mínima al azar."""
+
+    def __init__(self, generador: GeneradorAleatorio = None, prob_dudar=0.3):
+        self.generador = generador if generador is not None else GeneradorAleatorio()
+        self.prob_dudar = prob_dudar
+
+    def actuar(self, observacion):
+        if observacion.ultima_apuesta is not None:
+            tirada = self.generador.generar_entero(0, 999)
+            if tirada < self.prob_dudar * 1000:
+                return {"tipo": "dudar"}
+        candidatas = subidas_minimas(
+            observacion.ultima_apuesta, observacion.cantidad_dados
+        )
+        if not candidatas:
+            return {"tipo": "dudar"}
+        indice = self.generador.generar_entero(0, len(candidatas) - 1)
+        return {"tipo": "apuesta", "apuesta": candidatas[indice]}
+
+
+class PoliticaEsperanza(Politica):
+    """
+    Estima la cantidad esperada de cada pinta con sus propios dados y la
+    probabilidad de los dados ocultos. Duda si la apuesta supera la
+    esperanza más un margen; si no, sube a la pinta que más le conviene.
+    """
+
+    def __init__(self, generador: GeneradorAleatorio = None, margen=1.0):
+        self.generador = generador
+        self.margen = margen
+
+    def esperanza(self, observacion, pinta):
+        propias = observacion.pintas_propias
+        ases_comodin = observacion.ases_comodin and pinta != Pinta.AS
+        if ases_comodin:
+            vistos = sum(1 for p in propias if p == pinta or p == Pinta.AS)
+            probabilidad = 2 / 6
+        else:
+            vistos = sum(1 for p in propias if p == pinta)
+            probabilidad = 1 / 6
+        return vistos + observacion.dados_ocultos * probabilidad
+
+    def actuar(self, observacion):
+        anterior = observacion.ultima_apuesta
+        if anterior is not None:
+            limite = self.esperanza(observacion, anterior.get_pinta())
+            if anterior.get_cantidad() > limite + self.margen:
+                return {"tipo": "dudar"}
+        candidatas = subidas_minimas(anterior, observacion.cantidad_dados)
+        if not candidatas:
+            return {"tipo": "dudar"}
+        mejor = max(
+            candidatas,
+            key=lambda a: self.esperanza(observacion, a.get_pinta()) - a.get_cantidad(),
+        )
+        return {"tipo": "apuesta", "apuesta": mejor}
+
+
+# Registro de políticas por nombre, para elegirlas desde la línea de comandos
+# y para poder crearlas dentro de los procesos de simulación
+POLITICAS = {
+    "aleatoria": PoliticaAleatoria,
+    "esperanza": PoliticaEsperanza,
+}
+
+
+def crear_politica(nombre, generador: GeneradorAleatorio = None):
+    if nombre not in POLITICAS:
+        raise ValueError(f"Política desconocida: {nombre}")
+    return POLITICAS[nombre](generador=generador)
@@ -0,0 +1,46 @@
+"""
+Ratings tipo Elo para comparar agentes a partir de resultados de partidas.
+"""
+
+
+class Elo:
+    def __init__(self, k=24.0, inicial=1500.0):
+        self.k = k
+        self.inicial = inicial
+        self.ratings = {}
+        self.partidas = {}
+
+    def rating(self, nombre):
+        return self.ratings.get(nombre, self.inicial)
+
+    def esperado(self, nombre_a, nombre_b):
+        """Probabilidad esperada de que `nombre_a` le gane a `nombre_b`."""
+        diferencia = self.rating(nombre_b) - self.rating(nombre_a)
+        return 1.0 / (1.0 + 10 ** (diferencia / 400.0))
+
+    def registrar_partida(self, participantes, ganador):
+        """
+        Actualiza los ratings con una partida de dos o más jugadores: el
+        ganador le gana a cada uno de los demás y el ajuste se reparte entre
+        los duelos para que una mesa grande no pese más que una de dos.
+        """
+        rivales = [p for p in participantes if p != ganador]
+        if not rivales:
+            return
+        k = self.k / len(rivales)
+        cambios = {nombre: 0.0 for nombre in participantes}
+        for rival in rivales:
+            ajuste = k * (1.0 - self.esperado(ganador, rival))
+            cambios[ganador] += ajuste
+            cambios[rival] -= ajuste
+        for nombre, cambio in cambios.items():
+            self.ratings[nombre] = self.rating(nombre) + cambio
+            self.partidas[nombre] = self.partidas.get(nombre, 0) + 1
+
+    def clasificacion(self):
+        """Lista de (nombre, rating) ordenada de mayor a menor rating."""
+        return sorted(
+            ((nombre, self.rating(nombre)) for nombre in self.ratings),
+            key=lambda par: par[1],
+            reverse=True,
+        )
@@ -0,0 +1,247 @@
+"""
+Repetición de partidas registradas en un diario (ver src.servicios.diario).
+
+Cada partida se vuelve a jugar con GestorPartida y ArbitroRonda cargando
+los dados registrados en cada ronda, sin usar azar, y se compara cada
+resultado recalculado con el registrado. Con una variante de reglas se
+puede volver a puntuar un corpus antiguo con reglas nuevas: las
+diferencias se reportan como divergencias y el estado se vuelve a
+sincronizar con lo registrado para seguir con la partida.
+
+Como el diario rota solo entre partidas, cada archivo se procesa en un
+proceso distinto y se lee como flujo, sin cargar el corpus en memoria.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src.juego.dado import PINTAS
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta
+from src.servicios import diario as eventos
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+def _reglas_estandar(gestor):
+    pass
+
+
+def _nunca():
+    return False
+
+
+def _ases_siempre_comodin(gestor):
+    gestor._debe_actualizar_regla_especial = _nunca
+    gestor.desactivar_regla_especial()
+
+
+def _sin_comodines(gestor):
+    gestor._debe_actualizar_regla_especial = _nunca
+    gestor.arbitro.set_ases_comodin(False)
+
+
+# Cada variante configura una vez el gestor con el que se repite la partida
+VARIANTES = {
+    "estandar": _reglas_estandar,
+    "ases_siempre_comodin": _ases_siempre_comodin,
+    "sin_comodines": _sin_comodines,
+}
+
+
+class Divergencia:
+    def __init__(self, partida, ronda, tipo, jugador, registrado, recalculado):
+        self.partida = partida
+        self.ronda = ronda
+        self.tipo = tipo
+        self.jugador = jugador
+        self.registrado = registrado
+        self.recalculado = recalculado
+
+    def __repr__(self):
+        return (
+            f"Divergencia(partida={self.partida}, ronda={self.ronda}, "
+            f"tipo={self.tipo}, jugador={self.jugador}, "
+            f"registrado={self.registrado!r}, recalculado={self.recalculado!r})"
+        )
+
+
+class ResultadoRepeticion:
+    def __init__(self, max_ejemplos=100):
+        self.partidas = 0
+        self.eventos = 0
+        self.partidas_con_divergencias = 0
+        self.total_divergencias = 0
+        self.max_ejemplos = max_ejemplos
+        self.divergencias = []  # solo los primeros `max_ejemplos`
+
+    def registrar_divergencia(self, divergencia):
+        self.total_divergencias += 1
+        if len(self.divergencias) < self.max_ejemplos:
+            self.divergencias.append(divergencia)
+
+    def combinar(self, otro):
+        """Suma los resultados de otro archivo a este resultado."""
+        self.partidas += otro.partidas
+        self.eventos += otro.eventos
+        self.partidas_con_divergencias += otro.partidas_con_divergencias
+        self.total_divergencias += otro.total_divergencias
+        espacio = self.max_ejemplos - len(self.divergencias)
+        self.divergencias.extend(otro.divergencias[:espacio])
+        return self
+
+
+class _Repeticion:
+    """Estado de la partida que se está repitiendo."""
+
+    def __init__(self, inicio, variante, resultado):
+        self.partida = inicio.partida
+        self.resultado = resultado
+        self.divergente = False
+        # El generador no se usa: los dados se cargan desde el diario
+        self.gestor = GestorPartida(
+            num_jugadores=inicio.cantidad,
+            dados_por_jugador=inicio.detalle,
+            generador=GeneradorAleatorio(0),
+            compacto=True,
+        )
+        self.gestor.agitar_cachos = _sin_agitar
+        variante(self.gestor)
+        self.caras = {}
+
+    def _comparar(self, registro, registrado, recalculado):
+        if registrado != recalculado:
+            self.divergente = True
+            self.resultado.registrar_divergencia(
+                Divergencia(
+                    self.partida,
+                    registro.ronda,
+                    registro.tipo,
+                    registro.jugador,
+                    registrado,
+                    recalculado,
+                )
+            )
+
+    def procesar(self, registro):
+        tipo = registro.tipo
+        gestor = self.gestor
+        if tipo == eventos.DADOS:
+            self.caras[registro.jugador] = eventos.desempaquetar_caras(
+                registro.datos, registro.cantidad
+            )
+        elif tipo == eventos.APUESTA:
+            self._cargar_ronda()
+            apuesta = Apuesta.obtener(registro.cantidad, PINTAS[registro.detalle - 1])
+            anterior = (gestor.ultima_apuesta, gestor.jugador_ultima_apuesta)
+            historial = list(gestor.historial_apuestas)
+            resultado = gestor.elegir_accion(
+                registro.jugador, {"tipo": "apuesta", "apuesta": apuesta}
+            )
+            valida = bool(registro.datos)
+            self._comparar(registro, valida, resultado["valida"])
+            # Ante una divergencia se sigue con lo registrado
+            if valida and not resultado["valida"]:
+                gestor.ultima_apuesta = apuesta
+                gestor.jugador_ultima_apuesta = registro.jugador
+                gestor.historial_apuestas.append((registro.jugador, apuesta))
+            elif not valida and resultado["valida"]:
+                gestor.ultima_apuesta, gestor.jugador_ultima_apuesta = anterior
+                gestor.historial_apuestas = historial
+        elif tipo in (eventos.DUDA, eventos.CALZAR):
+            self._cargar_ronda()
+            accion = "dudar" if tipo == eventos.DUDA else "calzar"
+            resultado = gestor.elegir_accion(registro.jugador, {"tipo": accion})
+            self._comparar(
+                registro,
+                eventos.RESULTADOS[registro.detalle],
+                resultado["resultado"],
+            )
+        elif tipo == eventos.OBLIGAR:
+            self._cargar_ronda()
+            recalculado = gestor.obligar(registro.jugador, bool(registro.detalle))
+            self._comparar(registro, True, recalculado)
+        elif tipo in (eventos.PIERDE_DADO, eventos.GANA_DADO):
+            jugador = gestor.jugadores[registro.jugador]
+            recalculado = (jugador.cacho.get_cantidad_dados(), jugador.dados_a_favor)
+            self._comparar(registro, (registro.cantidad, registro.detalle), recalculado)
+            jugador.dados_a_favor = registro.detalle
+        elif tipo == eventos.FIN_PARTIDA:
+            ganadores = gestor.jugadores_activos()
+            recalculado = ganadores[0] if len(ganadores) == 1 else None
+            self._comparar(registro, registro.jugador, recalculado)
+
+    def _cargar_ronda(self):
+        """Carga los dados registrados de la ronda antes de su primera acción."""
+        if not self.caras:
+            return
+        gestor = self.gestor
+        for i, jugador in enumerate(gestor.jugadores):
+            caras = self.caras.get(i)
+            jugador.activo = caras is not None
+            if caras is not None:
+                jugador.cacho.cargar_caras(caras)
+            else:
+                jugador.cacho.cargar_caras(())
+        gestor.ultima_apuesta = None
+        gestor.jugador_ultima_apuesta = None
+        gestor.historial_apuestas = []
+        if gestor._debe_actualizar_regla_especial():
+            gestor._actualizar_regla_especial()
+        self.caras = {}
+
+
+def _sin_agitar():
+    pass
+
+
+def repetir_registros(registros, variante="estandar", max_ejemplos=100):
+    """
+    Repite las partidas de un flujo de registros (por ejemplo leer_diario)
+    y retorna un ResultadoRepeticion. Los registros se consumen de a uno.
+    """
+    ajustar = VARIANTES[variante] if isinstance(variante, str) else variante
+    resultado = ResultadoRepeticion(max_ejemplos)
+    actual = None
+    for registro in registros:
+        resultado.eventos += 1
+        if registro.tipo == eventos.INICIO_PARTIDA:
+            _cerrar(actual, resultado)
+            actual = _Repeticion(registro, ajustar, resultado)
+        elif actual is not None:
+            actual.procesar(registro)
+    _cerrar(actual, resultado)
+    return resultado
+
+
+def _cerrar(repeticion, resultado):
+    if repeticion is not None:
+        resultado.partidas += 1
+        resultado.partidas_con_divergencias += repeticion.divergente
+
+
+def repetir_archivo(ruta, variante="estandar", max_ejemplos=100):
+    return repetir_registros(eventos.leer_archivo(ruta), variante, max_ejemplos)
+
+
+def repetir_corpus(ruta_base, variante="estandar", num_procesos=None, max_ejemplos=100):
+    """
+    Repite todas las partidas de un diario rotado, un archivo por tarea de
+    un ProcessPoolExecutor. Con num_procesos=1 todo corre en este proceso.
+    Las variantes por nombre se pueden enviar a otros procesos; una
+    variante propia debe ser una función de módulo.
+    """
+    rutas = eventos.archivos_diario(ruta_base)
+    total = ResultadoRepeticion(max_ejemplos)
+    if num_procesos == 1:
+        for ruta in rutas:
+            total.combinar(repetir_archivo(ruta, variante, max_ejemplos))
+        return total
+    with ProcessPoolExecutor(max_workers=num_procesos) as pool:
+        resultados = pool.map(
+            repetir_archivo,
+            rutas,
+            [variante] * len(rutas),
+            [max_ejemplos] * len(rutas),
+        )
+        for resultado in resultados:
+            total.combinar(resultado)
+    return total
@@ -0,0 +1,109 @@
+"""
+Torneo todos contra todos entre agentes registrados.
+
+Cada cruce (combinación de agentes) juega varias partidas rotando los
+asientos y se ejecuta como una tarea de un ProcessPoolExecutor. Los
+resultados llegan en el orden de los cruces y se van sumando a los ratings
+Elo, así que un torneo con la misma semilla da siempre la misma tabla.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import jugar_partida
+from src.simulacion.politicas import POLITICAS
+from src.simulacion.ratings import Elo
+
+
+def jugar_cruce(nombres, fabricas, num_partidas, generador, dados_por_jugador=5):
+    """
+    Juega `num_partidas` entre los agentes de un cruce. En la partida i los
+    asientos se rotan i posiciones. Retorna una lista de
+    (nombres por asiento, nombre del ganador).
+    """
+    resultados = []
+    for indice, generador_partida in enumerate(generador.spawn(num_partidas)):
+        rotacion = indice % len(nombres)
+        asientos = nombres[rotacion:] + nombres[:rotacion]
+        fabricas_asientos = fabricas[rotacion:] + fabricas[:rotacion]
+        generador_dados, generador_agentes = generador_partida.spawn(2)
+        agentes = [fabrica(generador_agentes) for fabrica in fabricas_asientos]
+        partida = jugar_partida(agentes, generador_dados, dados_por_jugador)
+        resultados.append((tuple(asientos), asientos[partida.ganador]))
+    return resultados
+
+
+class ResultadoTorneo:
+    def __init__(self, elo):
+        self.elo = elo
+        self.partidas = {}
+        self.victorias = {}
+
+    def registrar(self, asientos, ganador):
+        for nombre in asientos:
+            self.partidas[nombre] = self.partidas.get(nombre, 0) + 1
+        self.victorias[ganador] = self.victorias.get(ganador, 0) + 1
+        self.elo.registrar_partida(asientos, ganador)
+
+    def tasa_victoria(self, nombre):
+        partidas = self.partidas.get(nombre, 0)
+        return self.victorias.get(nombre, 0) / partidas if partidas else 0.0
+
+
+class Torneo:
+    def __init__(
+        self,
+        agentes=None,
+        jugadores_por_mesa=2,
+        partidas_por_cruce=20,
+        dados_por_jugador=5,
+        semilla=0,
+        num_procesos=None,
+    ):
+        """
+        `agentes` es un diccionario nombre -> fábrica, donde la fábrica
+        recibe un GeneradorAleatorio y retorna un Agente. Para usar procesos
+        las fábricas deben poder serializarse (por ejemplo, una clase).
+        Por defecto se registran las políticas de src.simulacion.politicas.
+        """
+        self.agentes = dict(POLITICAS if agentes is None else agentes)
+        self.jugadores_por_mesa = jugadores_por_mesa
+        self.partidas_por_cruce = partidas_por_cruce
+        self.dados_por_jugador = dados_por_jugador
+        self.semilla = semilla
+        self.num_procesos = num_procesos
+
+    def registrar(self, nombre, fabrica):
+        self.agentes[nombre] = fabrica
+
+    def cruces(self):
+        return list(combinations(sorted(self.agentes), self.jugadores_por_mesa))
+
+    def jugar(self, elo=None):
+        cruces = self.cruces()
+        generadores = GeneradorAleatorio(self.semilla).spawn(len(cruces))
+        argumentos = [
+            (
+                list(cruce),
+                [self.agentes[nombre] for nombre in cruce],
+                self.partidas_por_cruce,
+                generador,
+                self.dados_por_jugador,
+            )
+            for cruce, generador in zip(cruces, generadores)
+        ]
+        resultado = ResultadoTorneo(elo if elo is not None else Elo())
+        if self.num_procesos == 1:
+            lotes = (jugar_cruce(*args) for args in argumentos)
+            self._acumular(resultado, lotes)
+            return resultado
+        with ProcessPoolExecutor(max_workers=self.num_procesos) as pool:
+            self._acumular(resultado, pool.map(jugar_cruce, *zip(*argumentos)))
+        return resultado
+
+    @staticmethod
+    def _acumular(resultado, lotes):
+        for lote in lotes:
+            for asientos, ganador in lote:
+                resultado.registrar(asientos, ganador)
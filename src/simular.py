@@ -0,0 +1,51 @@
+"""
+Punto de entrada para simular partidas sin interfaz.
+
+Uso:
+    python -m src.simular --partidas 10000 --politicas esperanza,aleatoria
+"""
+
+import argparse
+import time
+
+from src.simulacion.paralelo import simular
+from src.simulacion.politicas import POLITICAS
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Simulador Monte Carlo del Dudo")
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument(
+        "--politicas",
+        default="esperanza,aleatoria",
+        help=f"Políticas por asiento separadas por coma ({', '.join(POLITICAS)})",
+    )
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--lote", type=int, default=100)
+    parser.add_argument("--dados", type=int, default=5)
+    return parser
+
+
+def main(argumentos=None):
+    args = crear_parser().parse_args(argumentos)
+    nombres = args.politicas.split(",")
+    inicio = time.perf_counter()
+    resultado = simular(
+        nombres,
+        args.partidas,
+        semilla_maestra=args.semilla,
+        num_procesos=args.procesos,
+        partidas_por_lote=args.lote,
+        dados_por_jugador=args.dados,
+    )
+    duracion = time.perf_counter() - inicio
+    print(f"Partidas: {resultado.partidas} en {duracion:.2f} s")
+    print(f"Rondas promedio: {resultado.rondas / max(resultado.partidas, 1):.2f}")
+    for asiento, (nombre, tasa) in enumerate(zip(nombres, resultado.tasas_victoria())):
+        print(f"Asiento {asiento + 1} ({nombre}): {tasa:.2%}")
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
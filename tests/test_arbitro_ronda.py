@@ -3,7 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from src.juego.arbitro_ronda import ArbitroRonda
-from src.juego.contador_pintas import ContadorPintas
+from src.juego.contador_pintas import ContadorPintas, IndicePintas
 from src.juego.dado import Pinta
 
 
@@ -87,3 +87,17 @@ class TestArbitroRonda:
         jugada = (0, Pinta.TREN, 2)
         resultado = arbitro.resolver_calzar(cachos, jugada)
         assert resultado == "pierde_calzador"
+
+    def test_resolver_con_indice_no_recorre_los_cachos(self):
+        indice = IndicePintas()
+        indice.sumar_conteo((1, 0, 2, 0, 0, 0))
+        cachos = [Mock(), Mock()]
+        cachos[0].get_cantidad_dados.return_value = 1
+        arbitro = ArbitroRonda()
+        arbitro.set_indice(indice)
+        assert arbitro.resolver_duda(cachos, (0, Pinta.TREN, 3)) == "pierde_dudador"
+        assert arbitro.resolver_duda(cachos, (0, Pinta.TREN, 4)) == "pierde_apostador"
+        assert arbitro.resolver_calzar(cachos, (0, Pinta.TREN, 3)) == "gana_calzador"
+        for cacho in cachos:
+            cacho.get_pintas_de_dados.assert_not_called()
+            cacho.set_visible.assert_not_called()
@@ -1,6 +1,9 @@
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from src.juego.cacho import Cacho
+import pytest
+
+from src.juego.cacho import ARBITRO, Cacho, CachoCompacto
+from src.juego.contador_pintas import IndicePintas
 from src.juego.dado import Pinta
 
 
@@ -174,3 +177,152 @@ class TestCacho:
         pintas_finales = cacho.get_pintas_de_dados()
         assert len(pintas_finales) == 5
         assert pintas_finales == pintas_iniciales  # no cambió
+
+
+class TestCachoCompacto:
+    def test_cacho_compacto_inicia_con_5_dados(self):
+        cacho = CachoCompacto()
+        assert cacho.get_cantidad_dados() == 5
+        cacho.set_visible()
+        assert sum(cacho.conteo_por_pinta()) == 5
+
+    @patch("src.servicios.generador_aleatorio.GeneradorAleatorio.generar_entero")
+    def test_conteo_por_pinta_con_mock(self, mock_generar):
+        mock_generar.side_effect = [Pinta.AS, Pinta.TREN, Pinta.AS, 5, Pinta.TREN]
+        cacho = CachoCompacto()
+        assert cacho.conteo_por_pinta() is None
+        cacho.set_visible()
+        assert cacho.conteo_por_pinta() == (2, 0, 2, 0, 0, 1)
+        assert cacho.get_pintas_de_dados() == [
+            Pinta.AS,
+            Pinta.AS,
+            Pinta.TREN,
+            Pinta.TREN,
+            Pinta.SEXTO,
+        ]
+
+    @patch("src.servicios.generador_aleatorio.GeneradorAleatorio.generar_entero")
+    def test_agitar_agregar_y_eliminar_en_forma_compacta(self, mock_generar):
+        mock_generar.side_effect = [0, 0, 0, 0, 0, 5, 5, 5, 5, 4, 2]
+        cacho = CachoCompacto()
+        cacho.set_visible()
+        cacho.agitar()
+        assert cacho.conteo_por_pinta() == (0, 0, 0, 0, 1, 4)
+        cacho.eliminar_dado()  # quita un SEXTO
+        cacho.eliminar_dado()  # quita otro SEXTO
+        cacho.agregar_dado()  # agrega un TREN
+        assert cacho.get_cantidad_dados() == 4
+        assert cacho.conteo_por_pinta() == (0, 0, 1, 0, 1, 2)
+
+    def test_agregar_dado_existente_y_limite(self):
+        cacho = CachoCompacto(2)
+        cacho.eliminar_dado()
+        cacho.eliminar_dado()
+        cacho.eliminar_dado()
+        assert cacho.get_cantidad_dados() == 0
+        cacho.agregar_dado(Mock(show=Mock(return_value=Pinta.QUINA)))
+        cacho.agregar_dado()
+        cacho.agregar_dado()
+        cacho.set_visible()
+        assert cacho.get_cantidad_dados() == 2
+        assert Pinta.QUINA in cacho.get_pintas_de_dados()
+
+    def test_cacho_compacto_usa_slots(self):
+        cacho = CachoCompacto()
+        assert not hasattr(cacho, "__dict__")
+        assert not hasattr(Cacho(), "__dict__")
+
+    def test_conteo_por_pinta_cacho_normal(self):
+        cacho = Cacho()
+        assert cacho.conteo_por_pinta() is None
+        cacho.set_visible()
+        conteo = cacho.conteo_por_pinta()
+        pintas = cacho.get_pintas_de_dados()
+        assert conteo == tuple(pintas.count(p) for p in Pinta)
+
+
+class TestCargarCaras:
+    def test_cargar_caras_reemplaza_los_dados(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.set_visible()
+            cacho.cargar_caras([0, 2, 2])
+            assert cacho.get_cantidad_dados() == 3
+            assert sorted(cacho.get_pintas_de_dados(), key=lambda p: p.value) == [
+                Pinta.AS,
+                Pinta.TREN,
+                Pinta.TREN,
+            ]
+
+    def test_cargar_mas_caras_que_el_maximo(self):
+        for cacho in (Cacho(2), CachoCompacto(2)):
+            with pytest.raises(ValueError):
+                cacho.cargar_caras([0, 1, 2])
+
+
+class TestEstadoCacho:
+    def test_restaurar_vuelve_al_estado_guardado(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.cargar_caras([0, 1, 5])
+            estado = cacho.estado()
+            cacho.set_visible()
+            cacho.eliminar_dado()
+            cacho.agitar()
+            cacho.restaurar(estado)
+            assert cacho.get_cantidad_dados() == 3
+            assert not cacho.get_visibilidad()
+            cacho.set_visible()
+            assert cacho.conteo_por_pinta() == (1, 1, 0, 0, 0, 1)
+
+    def test_restaurar_avisa_al_observador(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            indice = IndicePintas([cacho])
+            cacho.cargar_caras([3, 3])
+            estado = cacho.estado()
+            cacho.cargar_caras([0, 0, 0, 0, 0])
+            cacho.restaurar(estado)
+            assert indice.conteo == [0, 0, 0, 2, 0, 0]
+            assert indice.total == 2
+
+    def test_clonar_es_independiente(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            indice = IndicePintas([cacho])
+            cacho.cargar_caras([2, 4])
+            copia = cacho.clonar()
+            assert type(copia) is type(cacho)
+            assert copia.estado() == cacho.estado()
+            copia.eliminar_dado()
+            assert cacho.get_cantidad_dados() == 2
+            assert indice.total == 2
+
+
+class TestVisibilidadPorObservador:
+    def test_cada_observador_ve_segun_su_bit(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.cargar_caras([0, 3])
+            cacho.mostrar_a(2)
+            assert cacho.get_mascara_visibilidad() == 0b100
+            assert cacho.pintas_para(2) == (Pinta.AS, Pinta.CUADRA)
+            assert cacho.conteo_para(2) == (1, 0, 0, 1, 0, 0)
+            assert cacho.pintas_para(0) is None
+            assert cacho.pintas_para(ARBITRO) is not None
+            # leer no cambia la visibilidad global
+            assert not cacho.get_visibilidad()
+            cacho.ocultar_a(2)
+            assert cacho.pintas_para(2) is None
+
+    def test_la_vista_se_comparte_hasta_que_cambian_los_dados(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.cargar_caras([1, 1])
+            vista = cacho.pintas_para(ARBITRO)
+            assert cacho.pintas_para(ARBITRO) is vista
+            cacho.agregar_dado()
+            assert cacho.pintas_para(ARBITRO) is not vista
+            assert len(cacho.pintas_para(ARBITRO)) == 3
+
+    def test_estado_incluye_la_mascara(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.set_mascara_visibilidad(0b11)
+            estado = cacho.estado()
+            cacho.ocultar_a(0)
+            cacho.restaurar(estado)
+            assert cacho.puede_ver(0) and cacho.puede_ver(1)
@@ -0,0 +1,124 @@
+from src.juego.dado import Pinta
+from src.juego.observacion import Observacion
+from src.juego.validador_apuesta import Apuesta, ordinal
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.cfr import (
+    CALZAR,
+    DUDAR,
+    AgenteCFR,
+    EstrategiaMmap,
+    SolverCFR,
+    acciones_legales,
+)
+from src.simulacion.politicas import PoliticaEsperanza
+
+
+def _observacion(jugador, pintas, dados, historial, ases_comodin=False):
+    ultima = historial[-1] if historial else (None, None)
+    return Observacion(
+        jugador=jugador,
+        pintas_propias=pintas,
+        dados_por_jugador=dados,
+        dados_a_favor=(0,) * len(dados),
+        activos=tuple(d > 0 for d in dados),
+        ultima_apuesta=ultima[1],
+        jugador_ultima_apuesta=ultima[0],
+        historial=historial,
+        ases_comodin=ases_comodin,
+        ronda=1,
+    )
+
+
+class TestAccionesLegales:
+    def test_apertura_sin_ases_salvo_con_un_dado(self):
+        assert 0 not in acciones_legales((), 2, 4, 4)
+        assert 0 in acciones_legales((), 1, 4, 4)
+
+    def test_no_repite_apuestas_y_respeta_el_limite(self):
+        tonto = ordinal(Apuesta(1, Pinta.TONTO))
+        as_ = ordinal(Apuesta(1, Pinta.AS))
+        acciones = acciones_legales((tonto, as_), 1, 2, 4)
+        assert tonto not in acciones
+        assert acciones[-2:] == (DUDAR, CALZAR)
+        assert acciones_legales((tonto, as_), 1, 2, 2) == (DUDAR, CALZAR)
+
+
+class TestSolverCFR:
+    def test_aprende_a_dudar_apuestas_imposibles(self):
+        solver = SolverCFR((1, 1), generador=GeneradorAleatorio(3))
+        solver.iterar(1500)
+        revisados = 0
+        for (jugador, mano, historial), (arrepentimientos, _) in solver.nodos.items():
+            if jugador != 1 or len(historial) != 1 or not any(arrepentimientos):
+                continue
+            cantidad, pinta = divmod(historial[0], 6)
+            # sin comodines, dos de una pinta que no está en la mano es imposible
+            if cantidad == 1 and mano[0] != pinta:
+                acciones = acciones_legales(historial, 1, 2, solver.max_apuestas)
+                estrategia = solver.estrategia_actual((jugador, mano, historial))
+                assert estrategia[acciones.index(DUDAR)] == max(estrategia)
+                revisados += 1
+        assert revisados > 0
+
+    def test_checkpoint_y_estrategia_mmap(self, tmp_path):
+        solver = SolverCFR((1, 1), generador=GeneradorAleatorio(5))
+        ruta = tmp_path / "solver.pkl"
+        solver.entrenar(300, iteraciones_por_epoca=100, ruta_checkpoint=ruta)
+        recuperado = SolverCFR.cargar_checkpoint(ruta)
+        assert recuperado.iteraciones == 300
+        assert recuperado.nodos == solver.nodos
+
+        archivo = tmp_path / "estrategia.bin"
+        solver.exportar_estrategia(archivo)
+        estrategia = EstrategiaMmap(archivo)
+        try:
+            assert estrategia.dados == (1, 1)
+            assert estrategia.cantidad == len(solver.nodos)
+            for llave in list(solver.nodos)[:50]:
+                _, probabilidades = estrategia.probabilidades(*llave)
+                esperadas = solver.estrategia_promedio(llave)
+                for leida, esperada in zip(probabilidades, esperadas):
+                    assert abs(leida - esperada) < 1e-3
+            assert estrategia.probabilidades(0, [0, 0, 0], ()) is None
+        finally:
+            estrategia.cerrar()
+
+    def test_entrenamiento_en_varios_procesos(self):
+        solver = SolverCFR((1, 1), generador=GeneradorAleatorio(7))
+        solver.entrenar(200, num_procesos=2, iteraciones_por_epoca=100)
+        assert solver.iteraciones == 200
+        for arrepentimientos, suma in solver.nodos.values():
+            assert len(arrepentimientos) == len(suma)
+
+
+class TestAgenteCFR:
+    def test_juega_con_la_estrategia_o_delega(self, tmp_path):
+        solver = SolverCFR((1, 1), generador=GeneradorAleatorio(11))
+        solver.iterar(300)
+        archivo = tmp_path / "estrategia.bin"
+        solver.exportar_estrategia(archivo)
+        estrategia = EstrategiaMmap(archivo)
+        try:
+            agente = AgenteCFR(
+                estrategia,
+                PoliticaEsperanza(GeneradorAleatorio(1)),
+                GeneradorAleatorio(2),
+            )
+            apertura = agente.actuar(_observacion(0, (Pinta.TREN,), (1, 1), ()))
+            assert apertura["tipo"] == "apuesta"
+            assert apertura["apuesta"].get_cantidad() <= 2
+
+            historial = ((1, Apuesta(2, Pinta.SEXTO)),)
+            respuesta = agente.actuar(
+                _observacion(0, (Pinta.TONTO,), (1, 1), historial)
+            )
+            assert respuesta["tipo"] in ("dudar", "calzar", "apuesta")
+
+            # con otra cantidad de dados se usa el agente de respaldo
+            respaldo = agente.actuar(
+                _observacion(0, (Pinta.TREN,) * 5, (5, 5), (), ases_comodin=True)
+            )
+            assert respaldo["tipo"] == "apuesta"
+            assert respaldo["apuesta"].get_pinta() != Pinta.AS
+        finally:
+            estrategia.cerrar()
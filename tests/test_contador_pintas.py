@@ -2,8 +2,8 @@ from unittest.mock import Mock
 
 import pytest
 
-from src.juego.cacho import Cacho
-from src.juego.contador_pintas import ContadorPintas
+from src.juego.cacho import Cacho, CachoCompacto
+from src.juego.contador_pintas import ContadorPintas, IndicePintas
 from src.juego.dado import Pinta
 
 
@@ -67,15 +67,36 @@ class TestContadorPintas:
         assert contador.contar(cachos, Pinta.TREN) == 2  # TREN + AS
         assert contador.contar(cachos, Pinta.AS) == 1
 
-    def test_contar_pinta_obliga_mostrar_si_cacho_oculto(self):
-        cacho_oculto = Mock()
-        # Simula oculto primero, luego visible siempre
-        cacho_oculto.get_pintas_de_dados.side_effect = [None] + [
-            [Pinta.TREN, Pinta.AS]
-        ] * 10
-        cacho_oculto.set_visible = Mock()
-        contador = ContadorPintas()
-        resultado = contador.contar([cacho_oculto], Pinta.TREN)
-        assert resultado == 2  # TREN + AS
-        assert contador.contar([cacho_oculto], Pinta.AS) == 1
-        cacho_oculto.set_visible.assert_called_once()
+    def test_contar_cacho_oculto_sin_cambiar_visibilidad(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            cacho.cargar_caras([2, 0, 4])
+            contador = ContadorPintas()
+            assert contador.contar([cacho], Pinta.TREN) == 2  # TREN + AS
+            assert contador.contar([cacho], Pinta.AS) == 1
+            assert not cacho.get_visibilidad()
+            assert cacho.get_pintas_de_dados() is None
+
+
+class TestIndicePintas:
+    def test_indice_cuenta_en_o1_con_y_sin_comodin(self):
+        indice = IndicePintas()
+        indice.sumar_conteo((2, 0, 1, 0, 0, 3))
+        assert indice.total == 6
+        assert indice.contar(Pinta.TREN) == 3
+        assert indice.contar(Pinta.TREN, ases_comodin=False) == 1
+        assert indice.contar(Pinta.AS) == 2
+
+    def test_indice_sigue_los_cambios_de_los_cachos(self):
+        cachos = [Cacho(), CachoCompacto()]
+        indice = IndicePintas(cachos)
+        for paso in range(3):
+            cachos[paso % 2].agitar()
+            cachos[0].eliminar_dado()
+            cachos[1].eliminar_dado()
+            cachos[1].agregar_dado()
+            for cacho in cachos:
+                cacho.set_visible()
+            for pinta in Pinta:
+                esperado = ContadorPintas().contar(cachos, pinta)
+                assert indice.contar(pinta) == esperado
+        assert indice.total == sum(c.get_cantidad_dados() for c in cachos)
@@ -2,6 +2,9 @@
 Tests para la clase Dado del juego Dudo Chileno.
 """
 
+from unittest.mock import Mock
+
+from src.juego import dado as modulo_dado
 from src.juego.dado import Dado, Pinta
 
 
@@ -47,3 +50,19 @@ class TestDado:
         dado = Dado()
         pinta = dado.show()
         assert isinstance(pinta, Pinta)
+
+    def test_dado_usa_generador_inyectado(self):
+        """Test que verifica que el dado usa el generador entregado."""
+        generador = Mock()
+        generador.generar_entero.return_value = 3
+        assert Dado(generador).show() == Pinta.CUADRA
+        generador.generar_entero.assert_called_once_with(0, 5)
+
+    def test_dados_sin_generador_comparten_uno(self, monkeypatch):
+        """Test que los dados sin generador usan el del módulo."""
+        generador = Mock()
+        generador.generar_entero.return_value = 0
+        monkeypatch.setattr(modulo_dado, "_generador_por_defecto", generador)
+        assert Dado().show() == Pinta.AS
+        assert Dado().show() == Pinta.AS
+        assert generador.generar_entero.call_count == 2
@@ -0,0 +1,130 @@
+import types
+
+import pytest
+
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta
+from src.servicios import diario
+from src.servicios.diario import EscritorDiario, archivos_diario, leer_diario
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import jugar_partida
+from src.simulacion.politicas import PoliticaAleatoria, PoliticaEsperanza
+
+
+class TestRegistros:
+    def test_empaquetar_caras(self):
+        caras = [0, 5, 3, 3, 1]
+        assert diario.desempaquetar_caras(diario.empaquetar_caras(caras), 5) == caras
+
+    def test_escribe_y_lee_en_bloques(self, tmp_path):
+        base = tmp_path / "diario"
+        with EscritorDiario(base, registros_por_bloque=3) as escritor:
+            escritor.iniciar_partida(2, 5)
+            for ronda in range(10):
+                escritor.registrar(diario.APUESTA, ronda, 1, 2, 3, 1)
+        registros = leer_diario(base, registros_por_bloque=4)
+        assert isinstance(registros, types.GeneratorType)
+        registros = list(registros)
+        assert len(registros) == 11
+        assert registros[0].tipo == diario.INICIO_PARTIDA
+        assert registros[-1] == diario.Registro(diario.APUESTA, 1, 2, 3, 0, 9, 1)
+
+    def test_campos_en_el_limite_de_su_ancho(self, tmp_path):
+        base = tmp_path / "diario"
+        with EscritorDiario(base) as escritor:
+            escritor.iniciar_partida(300, 5)
+            escritor.registrar(diario.APUESTA, 1, 299, 2**16 - 1, 6, 1)
+            for campos in ((2**16, 0), (0, -1)):
+                with pytest.raises(ValueError):
+                    escritor.registrar(diario.APUESTA, 1, *campos)
+        registros = list(leer_diario(base))
+        assert len(registros) == 2
+        assert registros[0].cantidad == 300
+        assert registros[1] == diario.Registro(
+            diario.APUESTA, 299, 2**16 - 1, 6, 0, 1, 1
+        )
+
+    def test_rota_solo_entre_partidas(self, tmp_path):
+        base = tmp_path / "diario"
+        with EscritorDiario(base, max_bytes_archivo=100) as escritor:
+            for _ in range(3):
+                escritor.iniciar_partida(2, 5)
+                for _ in range(10):
+                    escritor.registrar(diario.APUESTA)
+        assert len(archivos_diario(base)) == 3
+        for ruta in archivos_diario(base):
+            partidas = {r.partida for r in diario.leer_archivo(ruta)}
+            assert len(partidas) == 1
+
+
+class TestDiarioGestor:
+    def test_registra_ronda_apuesta_y_duda(self, tmp_path):
+        base = tmp_path / "diario"
+        gestor = GestorPartida(num_jugadores=2, generador=GeneradorAleatorio(4))
+        with EscritorDiario(base) as escritor:
+            gestor.set_diario(escritor)
+            caras = [
+                [p.value - 1 for p in _pintas(gestor.jugadores[i].cacho)]
+                for i in range(2)
+            ]
+            gestor.elegir_accion(
+                0, {"tipo": "apuesta", "apuesta": Apuesta(9, Pinta.TREN)}
+            )
+            gestor.elegir_accion(1, {"tipo": "dudar"})
+        registros = list(leer_diario(base))
+        tipos = [r.tipo for r in registros]
+        assert tipos[:8] == [
+            diario.INICIO_PARTIDA,
+            diario.INICIO_RONDA,
+            diario.DADOS,
+            diario.DADOS,
+            diario.APUESTA,
+            diario.DUDA,
+            diario.PIERDE_DADO,
+            diario.INICIO_RONDA,
+        ]
+        for registro, esperadas in zip(registros[2:4], caras):
+            assert (
+                diario.desempaquetar_caras(registro.datos, registro.cantidad)
+                == esperadas
+            )
+        duda = registros[5]
+        assert diario.RESULTADOS[duda.detalle] == "pierde_apostador"
+        assert registros[6].jugador == 0 and registros[6].cantidad == 4
+        # la visibilidad de los cachos no cambia al registrar
+        assert not gestor.jugadores[0].cacho.get_visibilidad()
+
+    def test_inicio_registra_los_dados_iniciales(self, tmp_path):
+        base = tmp_path / "diario"
+        gestor = GestorPartida(
+            num_jugadores=3, dados_por_jugador=3, generador=GeneradorAleatorio(2)
+        )
+        with EscritorDiario(base) as escritor:
+            gestor.set_diario(escritor)
+        inicio = next(iter(leer_diario(base)))
+        assert inicio.tipo == diario.INICIO_PARTIDA
+        assert (inicio.cantidad, inicio.detalle) == (3, 3)
+
+    def test_partida_completa_termina_con_ganador(self, tmp_path):
+        base = tmp_path / "diario"
+        generador = GeneradorAleatorio(8)
+        with EscritorDiario(base) as escritor:
+            resultado = jugar_partida(
+                [PoliticaEsperanza(generador), PoliticaAleatoria(generador)],
+                generador,
+                dados_por_jugador=2,
+                diario=escritor,
+            )
+        registros = list(leer_diario(base))
+        assert registros[-1].tipo == diario.FIN_PARTIDA
+        assert registros[-1].jugador == resultado.ganador
+        rondas = [r for r in registros if r.tipo == diario.INICIO_RONDA]
+        assert len(rondas) == resultado.rondas
+
+
+def _pintas(cacho):
+    cacho.set_visible()
+    pintas = cacho.get_pintas_de_dados()
+    cacho.set_oculto()
+    return pintas
@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from src.juego.validador_apuesta import ValidadorApuesta, apuesta_desde_ordinal
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.entorno import (
+    BuffersEntorno,
+    EntornoDudo,
+    EntornosVectorizados,
+    num_acciones,
+)
+from src.simulacion.motor import PartidaInvalidaError
+
+
+def _primera_legal(mascaras):
+    """La acción legal de menor índice de cada fila (cero si no hay)."""
+    return np.argmax(mascaras, axis=-1)
+
+
+def _jugar_episodio(entorno, semilla=None):
+    observacion, _ = entorno.reset(semilla)
+    while True:
+        accion = _primera_legal(observacion["mascara"])
+        observacion, recompensa, terminado, truncado, info = entorno.step(accion)
+        if terminado or truncado:
+            return recompensa, info
+
+
+class TestEntornoDudo:
+    def test_reset_escribe_la_observacion(self):
+        entorno = EntornoDudo(3, generador=GeneradorAleatorio(1))
+        observacion, info = entorno.reset()
+        assert info == {}
+        assert observacion["dados_propios"].sum() == 5
+        assert observacion["dados_por_asiento"].tolist() == [5, 5, 5]
+        assert observacion["ases_comodin"][0] == 1
+        assert len(observacion["mascara"]) == num_acciones(3)
+        assert entorno.gestor.jugador_actual == entorno.asiento
+
+    def test_mascara_sigue_al_validador(self):
+        entorno = EntornoDudo(
+            2, oponentes=("esperanza",), generador=GeneradorAleatorio(2)
+        )
+        observacion, _ = entorno.reset()
+        for _ in range(5):
+            gestor = entorno.gestor
+            mascara = observacion["mascara"]
+            dados = gestor.estado_mesa.dados[entorno.asiento]
+            for valor in range(entorno.accion_dudar):
+                assert mascara[valor] == ValidadorApuesta.es_valida(
+                    gestor.ultima_apuesta, apuesta_desde_ordinal(valor), dados
+                )
+            hay_apuesta = gestor.ultima_apuesta is not None
+            assert mascara[entorno.accion_dudar] == hay_apuesta
+            assert mascara[entorno.accion_calzar] == hay_apuesta
+            observacion, *_ = entorno.step(_primera_legal(mascara))
+
+    def test_historial_guarda_las_ultimas_apuestas(self):
+        entorno = EntornoDudo(2, ventana_historial=3, generador=GeneradorAleatorio(5))
+        observacion, _ = entorno.reset()
+        entorno.step(_primera_legal(observacion["mascara"]))
+        apuestas = entorno.gestor.historial_apuestas
+        esperado = [-1] * 3 + [
+            (a.get_cantidad() - 1) * 6 + a.get_pinta().value - 1 for _, a in apuestas
+        ]
+        assert observacion["historial"].tolist() == esperado[-3:]
+
+    def test_accion_ilegal_es_error(self):
+        entorno = EntornoDudo(2, generador=GeneradorAleatorio(3))
+        with pytest.raises(RuntimeError):
+            entorno.step(0)
+        observacion, _ = entorno.reset()
+        ilegal = int(np.argmin(observacion["mascara"]))
+        with pytest.raises(PartidaInvalidaError):
+            entorno.step(ilegal)
+
+    def test_episodio_termina_con_recompensa(self):
+        entorno = EntornoDudo(3, generador=GeneradorAleatorio(4))
+        recompensa, info = _jugar_episodio(entorno)
+        assert recompensa in (1.0, -1.0)
+        assert not entorno.observacion["mascara"].any()
+        if recompensa == 1.0:
+            assert info["ganador"] == entorno.asiento
+        with pytest.raises(RuntimeError):
+            entorno.step(0)
+
+    def test_misma_semilla_mismo_episodio(self):
+        resultados = []
+        for _ in range(2):
+            entorno = EntornoDudo(3, oponentes=("aleatoria", "esperanza"))
+            resultados.append((_jugar_episodio(entorno, semilla=8), entorno.turnos))
+        assert resultados[0] == resultados[1]
+
+
+class TestEntornosVectorizados:
+    def test_escribe_en_los_mismos_arreglos_y_se_reinicia(self):
+        with EntornosVectorizados(4, 2, generador=GeneradorAleatorio(6)) as entornos:
+            observacion, _ = entornos.reset()
+            mascaras = observacion["mascara"]
+            terminados = 0
+            for _ in range(300):
+                salida = entornos.step(_primera_legal(observacion["mascara"]))
+                assert salida[0]["mascara"] is mascaras
+                _, recompensas, terminado, _, info = salida
+                for i in np.flatnonzero(terminado):
+                    terminados += 1
+                    assert recompensas[i] in (1.0, -1.0)
+                    assert not entornos.observacion_final["mascara"][i].any()
+                    # La fila ya tiene el primer turno del episodio nuevo
+                    assert observacion["mascara"][i].any()
+                    assert info["ganador"][i] in (0, 1)
+            assert terminados > 0
+
+    def test_subprocesos_dan_lo_mismo_que_en_proceso(self):
+        trayectorias = []
+        for procesos in (0, 2):
+            with EntornosVectorizados(
+                3, 2, generador=GeneradorAleatorio(7), procesos=procesos
+            ) as entornos:
+                observacion, _ = entornos.reset()
+                recompensas = []
+                for _ in range(100):
+                    _, recompensa, *_ = entornos.step(
+                        _primera_legal(observacion["mascara"])
+                    )
+                    recompensas.append(recompensa.copy())
+                trayectorias.append(
+                    (np.array(recompensas), observacion["dados_propios"].copy())
+                )
+        assert (trayectorias[0][0] == trayectorias[1][0]).all()
+        assert (trayectorias[0][1] == trayectorias[1][1]).all()
+
+    def test_accion_ilegal_en_subproceso_es_error(self):
+        with EntornosVectorizados(
+            2, 2, generador=GeneradorAleatorio(8), procesos=1
+        ) as entornos:
+            observacion, _ = entornos.reset()
+            with pytest.raises(PartidaInvalidaError):
+                entornos.step(np.full(2, 10**6))
+            # El subproceso sigue vivo y atiende comandos
+            entornos.reset()
+            entornos.step(_primera_legal(observacion["mascara"]))
+        assert entornos.buffers.nombre is None
+
+    def test_cerrar_tolera_subprocesos_caidos(self):
+        entornos = EntornosVectorizados(
+            2, 2, generador=GeneradorAleatorio(9), procesos=2
+        )
+        entornos._procesos[0].terminate()
+        entornos._procesos[0].join()
+        entornos.close()
+        assert entornos.buffers.nombre is None
+
+
+class TestBuffersEntorno:
+    def test_memoria_compartida_se_conecta_y_se_libera(self):
+        buffers = BuffersEntorno(2, 3, compartida=True)
+        otro = BuffersEntorno(2, 3, nombre=buffers.nombre)
+        buffers.arreglos["apuesta"][1] = 17
+        assert otro.arreglos["apuesta"][1] == 17
+        otro.cerrar()
+        buffers.cerrar()
+        assert buffers.nombre is None
+
+    def test_fila_es_una_vista(self):
+        buffers = BuffersEntorno(3, 2, ventana=4)
+        fila = buffers.fila(2)
+        fila["apuesta"][0] = 5
+        fila["historial"][:] = 9
+        assert buffers.arreglos["apuesta"].tolist() == [0, 0, 5]
+        assert buffers.arreglos["historial"][2].tolist() == [9] * 4
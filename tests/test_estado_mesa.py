@@ -0,0 +1,71 @@
+from src.juego.cacho import Cacho, CachoCompacto
+from src.juego.contador_pintas import IndicePintas
+from src.juego.estado_mesa import EstadoMesa, ObservadorAsiento
+from src.juego.gestor_partida import GestorPartida
+from src.juego.mesa_dados import MesaDados
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+class TestEstadoMesa:
+    def test_cuenta_asientos_con_un_dado(self):
+        estado = EstadoMesa([5, 1, 2])
+        assert estado.con_un_dado == 1
+        estado.cambiar_dados(2, -1)
+        assert estado.con_un_dado == 2
+        estado.set_dados(1, 0)
+        assert estado.con_un_dado == 1
+        assert estado.dados == [5, 0, 1]
+
+    def test_mascara_de_activos(self):
+        estado = EstadoMesa([1, 1, 1, 1])
+        estado.set_activo(0, False)
+        estado.set_activo(2, False)
+        assert estado.asientos_activos() == [1, 3]
+        assert estado.cantidad_activos() == 2
+        assert estado.primer_activo() == 1
+        estado.set_activo(1, False)
+        estado.set_activo(3, False)
+        assert estado.primer_activo() is None
+
+    def test_observador_sigue_al_cacho_y_reenvia(self):
+        for cacho in (Cacho(), CachoCompacto()):
+            estado = EstadoMesa([0])
+            indice = IndicePintas()
+            cacho.set_observador(ObservadorAsiento(estado, 0, indice))
+            assert estado.dados == [5]
+            cacho.eliminar_dado()
+            cacho.cargar_caras([0])
+            assert estado.dados == [1]
+            assert estado.con_un_dado == 1
+            assert indice.total == 1
+
+
+class TestEstadoMesaEnGestor:
+    def test_jugador_lee_y_escribe_en_el_estado(self):
+        gestor = GestorPartida(num_jugadores=3, generador=GeneradorAleatorio(1))
+        gestor.jugadores[1].dados_a_favor = 2
+        gestor.jugadores[2].activo = False
+        assert gestor.estado_mesa.dados_a_favor == [0, 2, 0]
+        assert gestor.jugadores_activos() == [0, 1]
+
+    def test_consultas_siguen_cambios_directos_en_los_cachos(self):
+        gestor = GestorPartida(num_jugadores=3, compacto=True)
+        for _ in range(4):
+            gestor.cachos[2].eliminar_dado()
+        assert gestor.jugadores_con_un_dado() == [2]
+        assert gestor._debe_actualizar_regla_especial()
+        gestor.quitar_dado(2)
+        gestor.quitar_dado(1)
+        assert not gestor.jugadores[2].activo
+        assert gestor.estado_mesa.dados == [5, 4, 0]
+        assert not gestor.hay_ganador()
+
+    def test_cachos_sin_observador_se_actualizan_al_quitar(self):
+        mesa = MesaDados(1, 2, dados_por_jugador=1, generador=GeneradorAleatorio(2))
+        gestor = GestorPartida(
+            num_jugadores=2, dados_por_jugador=1, cachos=mesa.cachos(0)
+        )
+        assert gestor.estado_mesa.con_un_dado == 2
+        gestor.quitar_dado(0)
+        assert gestor.hay_ganador()
+        assert gestor.obtener_ganador() == "Jugador 2"
@@ -1,4 +1,8 @@
 # tests/test_generador_aleatorio.py
+from unittest.mock import patch
+
+import pytest
+
 from src.servicios.generador_aleatorio import GeneradorAleatorio
 
 
@@ -45,3 +49,85 @@ class TestGeneradorAleatorio:
         sec1 = [gen1.generar_entero(1, 6) for _ in range(5)]
         sec2 = [gen2.generar_entero(1, 6) for _ in range(5)]
         assert sec1 != sec2
+
+    def test_generar_enteros_en_rango_y_reproducible(self):
+        """Test que la generación en bloque respeta el rango y la semilla."""
+        gen1 = GeneradorAleatorio(semilla=3)
+        gen2 = GeneradorAleatorio(semilla=3)
+        valores = gen1.generar_enteros(2, 9, 500)
+        assert valores == gen2.generar_enteros(2, 9, 500)
+        assert len(valores) == 500
+        assert set(valores) == set(range(2, 10))
+        assert GeneradorAleatorio().generar_enteros(4, 4, 3) == [4, 4, 4]
+
+    @pytest.mark.parametrize("backend", ["random", "numpy"])
+    def test_generar_enteros_con_intervalo_vacio(self, backend):
+        """Test que un máximo menor que el mínimo lanza ValueError."""
+        generador = GeneradorAleatorio(semilla=1, backend=backend)
+        for minimo, maximo in ((5, 4), (5, 0)):
+            with pytest.raises(ValueError):
+                generador.generar_enteros(minimo, maximo, 3)
+
+    def test_generar_caras_sin_sesgo(self):
+        """Test que las caras del buffer son uniformes entre 0 y 5."""
+        generador = GeneradorAleatorio(semilla=1)
+        caras = generador.generar_caras(6000) + generador.generar_caras(7)
+        assert len(caras) == 6007
+        conteo = [caras.count(c) for c in range(6)]
+        assert all(900 < c < 1100 for c in conteo)
+
+    def test_generar_caras_usa_pocas_llamadas(self):
+        """Test que el buffer saca muchos dados por llamada a getrandbits."""
+        generador = GeneradorAleatorio(semilla=2)
+        with patch.object(
+            generador._random, "getrandbits", wraps=generador._random.getrandbits
+        ) as espia:
+            generador.generar_caras(300)
+        assert espia.call_count <= 2
+
+    def test_backend_numpy(self):
+        """Test del backend opcional de NumPy."""
+        gen1 = GeneradorAleatorio(semilla=5, backend="numpy")
+        gen2 = GeneradorAleatorio(semilla=5, backend="numpy")
+        assert gen1.generador_numpy is not None
+        assert gen1.generar_caras(50) == gen2.generar_caras(50)
+        assert all(1 <= gen1.generar_entero(1, 6) <= 6 for _ in range(20))
+        assert isinstance(gen1.generar_entero(1, 6), int)
+        assert set(gen1.generar_enteros(0, 2, 100)) == {0, 1, 2}
+        assert GeneradorAleatorio().generador_numpy is None
+
+    def test_backend_desconocido(self):
+        """Test que un backend inválido lanza ValueError."""
+        with pytest.raises(ValueError):
+            GeneradorAleatorio(backend="otro")
+
+    def test_spawn_reproducible_e_independiente(self):
+        """Test que los hijos dependen solo de la semilla y su posición."""
+        hijos1 = GeneradorAleatorio(semilla=8).spawn(3)
+        hijos2 = GeneradorAleatorio(semilla=8).spawn(3)
+        sec1 = [h.generar_enteros(0, 10**6, 5) for h in hijos1]
+        sec2 = [h.generar_enteros(0, 10**6, 5) for h in hijos2]
+        assert sec1 == sec2
+        assert len({tuple(s) for s in sec1}) == 3
+        padre = GeneradorAleatorio(semilla=8).generar_enteros(0, 10**6, 5)
+        assert padre not in sec1
+
+    def test_spawn_sucesivos_y_nietos_son_distintos(self):
+        """Test que spawn no repite hijos y que los nietos son distintos."""
+        generador = GeneradorAleatorio(semilla=8)
+        primero = generador.spawn(1)[0]
+        segundo = generador.spawn(1)[0]
+        nieto = primero.spawn(1)[0]
+        valores = {
+            tuple(g.generar_enteros(0, 10**6, 5)) for g in (primero, segundo, nieto)
+        }
+        assert len(valores) == 3
+
+    def test_spawn_sin_semilla_y_con_numpy(self):
+        """Test de spawn desde un generador sin semilla y con backend numpy."""
+        assert len(GeneradorAleatorio().spawn(2)) == 2
+        hijos1 = GeneradorAleatorio(semilla=4, backend="numpy").spawn(2)
+        hijos2 = GeneradorAleatorio(semilla=4, backend="numpy").spawn(2)
+        assert hijos1[1].backend == "numpy"
+        assert hijos1[1].generar_caras(20) == hijos2[1].generar_caras(20)
+        assert hijos1[0].generar_caras(20) != hijos1[1].generar_caras(20)
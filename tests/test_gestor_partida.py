@@ -4,6 +4,7 @@ import pytest
 
 from src.juego.dado import *
 from src.juego.gestor_partida import *
+from src.juego.mesa_dados import MesaDados
 
 
 class TestGestorPartida:
@@ -490,3 +491,201 @@ class TestGestorPartida:
         # Debe retornar un diccionario vacío
         assert isinstance(resultado, dict)
         assert len(resultado) == 0
+
+    def test_gestor_con_cachos_compactos(self):
+        """Test que verifica que el modo compacto mantiene las reglas de dados"""
+        gestor = GestorPartida(num_jugadores=2, dados_por_jugador=3, compacto=True)
+        assert all(isinstance(c, CachoCompacto) for c in gestor.cachos)
+        assert all(c.get_cantidad_dados() == 3 for c in gestor.cachos)
+        gestor.quitar_dado(0)
+        gestor.agregar_dado(1)
+        assert gestor.cachos[0].get_cantidad_dados() == 2
+        assert gestor.cachos[1].get_cantidad_dados() == 4
+
+    def test_indice_de_pintas_se_mantiene_actualizado(self):
+        """Test que verifica que el histograma de la mesa sigue a los cachos"""
+        for compacto in (False, True):
+            gestor = GestorPartida(num_jugadores=3, compacto=compacto)
+            gestor.quitar_dado(0)
+            gestor.jugadores[1].cacho.eliminar_dado()
+            gestor.nueva_ronda()
+            gestor.agregar_dado(0)
+            for cacho in gestor.cachos:
+                cacho.set_visible()
+            esperado = [0] * 6
+            for cacho in gestor.cachos:
+                for pinta in cacho.get_pintas_de_dados():
+                    esperado[pinta.value - 1] += 1
+            assert gestor.indice_pintas.conteo == esperado
+            assert gestor.indice_pintas.total == 14
+
+    def test_agitar_cachos_genera_la_mesa_en_una_llamada(self):
+        """Test que nueva_ronda pide todas las caras de la mesa de una vez"""
+        gestor = GestorPartida(num_jugadores=3, compacto=True)
+        gestor.quitar_dado(2)
+        with patch.object(
+            gestor.generador, "generar_caras", wraps=gestor.generador.generar_caras
+        ) as espia:
+            gestor.nueva_ronda()
+        espia.assert_called_once_with(14)
+        assert [c.get_cantidad_dados() for c in gestor.cachos] == [5, 5, 4]
+        assert gestor.indice_pintas.total == 14
+
+    def test_generador_inyectado_hace_la_partida_reproducible(self):
+        """Test que dos gestores con la misma semilla reparten los mismos dados"""
+        repartos = []
+        for _ in range(2):
+            gestor = GestorPartida(
+                num_jugadores=3, generador=GeneradorAleatorio(semilla=21)
+            )
+            gestor.nueva_ronda()
+            for cacho in gestor.cachos:
+                cacho.set_visible()
+            repartos.append([c.get_pintas_de_dados() for c in gestor.cachos])
+        assert repartos[0] == repartos[1]
+
+    def test_cachos_mock_no_se_toman_como_observados(self):
+        """Test que un Mock sin observador real cuenta sus dados al iniciar"""
+        cachos = [Mock(get_cantidad_dados=Mock(return_value=5)) for _ in range(3)]
+        gestor = GestorPartida(num_jugadores=3, cachos=cachos)
+        assert gestor.indice_pintas is None
+        assert gestor.estado_mesa.dados == [5, 5, 5]
+        cachos[0].get_cantidad_dados.return_value = 4
+        gestor.quitar_dado(0)
+        cachos[0].eliminar_dado.assert_called_once()
+        assert gestor.jugadores[0].activo
+        assert gestor.estado_mesa.dados[0] == 4
+
+
+class TestSnapshotGestor:
+    def _estado_visible(self, gestor):
+        pintas = []
+        for cacho in gestor.cachos:
+            visible = cacho.get_visibilidad()
+            cacho.set_visible()
+            pintas.append(sorted(p.value for p in cacho.get_pintas_de_dados()))
+            if not visible:
+                cacho.set_oculto()
+        return (
+            pintas,
+            [j.dados_a_favor for j in gestor.jugadores],
+            [j.activo for j in gestor.jugadores],
+            list(gestor.indice_pintas.conteo),
+            gestor.ultima_apuesta,
+            list(gestor.historial_apuestas),
+            gestor.ronda_actual,
+            gestor.arbitro.usar_ases_comodin,
+        )
+
+    @pytest.mark.parametrize("compacto", [False, True])
+    def test_restore_deshace_una_ronda(self, compacto):
+        gestor = GestorPartida(
+            num_jugadores=2,
+            dados_por_jugador=2,
+            generador=GeneradorAleatorio(9),
+            compacto=compacto,
+        )
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)})
+        antes = self._estado_visible(gestor)
+        estado = gestor.snapshot()
+        gestor.elegir_accion(1, {"tipo": "dudar"})
+        gestor.quitar_dado(1)
+        assert self._estado_visible(gestor) != antes
+        gestor.restore(estado)
+        assert self._estado_visible(gestor) == antes
+        assert gestor.snapshot() == estado
+
+    def test_clone_es_independiente(self):
+        gestor = GestorPartida(
+            num_jugadores=3, generador=GeneradorAleatorio(2), compacto=True
+        )
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(2, Pinta.QUINA)})
+        copia = gestor.clone()
+        assert copia.snapshot() == gestor.snapshot()
+        assert [j.nombre for j in copia.jugadores] == [
+            j.nombre for j in gestor.jugadores
+        ]
+        copia.elegir_accion(1, {"tipo": "dudar"})
+        assert copia.snapshot() != gestor.snapshot()
+        assert gestor.ultima_apuesta == Apuesta(2, Pinta.QUINA)
+        assert gestor.indice_pintas.total == 15
+
+    def test_snapshot_y_clone_con_mesa_dados(self):
+        mesa = MesaDados(1, 2, dados_por_jugador=3, generador=GeneradorAleatorio(6))
+        gestor = GestorPartida(
+            num_jugadores=2,
+            dados_por_jugador=3,
+            cachos=mesa.cachos(0),
+            generador=GeneradorAleatorio(6),
+        )
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)})
+        pintas = [leer_pintas(cacho, ARBITRO) for cacho in gestor.cachos]
+        estado = gestor.snapshot()
+        gestor.elegir_accion(1, {"tipo": "dudar"})
+        gestor.quitar_dado(1)
+        gestor.nueva_ronda()
+        gestor.restore(estado)
+        assert gestor.snapshot() == estado
+        assert gestor.estado_mesa.dados == [3, 3]
+        assert [leer_pintas(cacho, ARBITRO) for cacho in gestor.cachos] == pintas
+        copia = gestor.clone()
+        assert copia.snapshot() == estado
+        copia.quitar_dado(0)
+        copia.cachos[1].agitar()
+        assert gestor.snapshot() == estado
+        assert copia.estado_mesa.dados == [2, 3]
+
+
+class TestObligar:
+    def _gestor_con_un_dado(self):
+        gestor = GestorPartida(
+            num_jugadores=3, dados_por_jugador=2, generador=GeneradorAleatorio(4)
+        )
+        gestor.quitar_dado(0)
+        gestor.nueva_ronda()
+        return gestor
+
+    def test_solo_la_primera_vez_con_un_dado(self):
+        gestor = self._gestor_con_un_dado()
+        assert gestor.puede_obligar(0)
+        assert not gestor.puede_obligar(1)
+        gestor.nueva_ronda()
+        assert not gestor.obligar(0, abierta=True)
+
+    def test_ronda_abierta_muestra_los_dados_ajenos(self):
+        gestor = self._gestor_con_un_dado()
+        assert gestor.obligar(0, abierta=True)
+        assert not gestor.arbitro.usar_ases_comodin
+        for i in range(3):
+            obs = construir_observacion(gestor, i)
+            assert obs.pintas_propias == ()
+            assert all(
+                (pintas is None) == (j == i)
+                for j, pintas in enumerate(obs.pintas_visibles)
+            )
+        gestor.nueva_ronda()
+        assert gestor.ronda_obligada is None
+        assert len(construir_observacion(gestor, 1).pintas_propias) == 2
+
+    def test_ronda_cerrada_y_pinta_fija(self):
+        gestor = self._gestor_con_un_dado()
+        gestor.obligar(0, abierta=False)
+        assert len(construir_observacion(gestor, 0).pintas_propias) == 1
+        assert construir_observacion(gestor, 1).pintas_propias == ()
+
+        def apostar(jugador, cantidad, pinta):
+            accion = {"tipo": "apuesta", "apuesta": Apuesta(cantidad, pinta)}
+            return gestor.elegir_accion(jugador, accion)["valida"]
+
+        assert apostar(0, 1, Pinta.AS)
+        assert not apostar(1, 2, Pinta.TREN)
+        assert apostar(1, 2, Pinta.AS)
+
+    def test_snapshot_guarda_la_ronda_obligada(self):
+        gestor = self._gestor_con_un_dado()
+        estado = gestor.snapshot()
+        gestor.obligar(0, abierta=True)
+        gestor.restore(estado)
+        assert gestor.ronda_obligada is None
+        assert gestor.puede_obligar(0)
+        assert construir_observacion(gestor, 1).pintas_visibles[2] is None
@@ -0,0 +1,81 @@
+import time
+
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.observacion import Observacion
+from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.mcts import DUDAR, AgenteMCTS, buscar
+
+
+def _observacion(pintas, dados, historial):
+    ultima = historial[-1] if historial else (None, None)
+    return Observacion(
+        jugador=0,
+        pintas_propias=pintas,
+        dados_por_jugador=dados,
+        dados_a_favor=(0,) * len(dados),
+        activos=tuple(d > 0 for d in dados),
+        ultima_apuesta=ultima[1],
+        jugador_ultima_apuesta=ultima[0],
+        historial=historial,
+        ases_comodin=True,
+        ronda=1,
+    )
+
+
+class TestBusqueda:
+    def test_respeta_el_limite_de_iteraciones(self):
+        observacion = _observacion((Pinta.TREN,) * 5, (5, 5), ())
+        visitas = buscar(
+            observacion, GeneradorAleatorio(1), presupuesto_ms=None, iteraciones=200
+        )
+        assert sum(visitas.values()) == 200
+        # sin apuesta previa solo se puede apostar
+        assert all(accion[0] == "apuesta" for accion in visitas)
+
+    def test_respeta_el_presupuesto_de_tiempo(self):
+        observacion = _observacion((Pinta.TREN,) * 5, (5, 5, 5), ())
+        inicio = time.perf_counter()
+        buscar(observacion, GeneradorAleatorio(2), presupuesto_ms=30)
+        assert time.perf_counter() - inicio < 0.2
+
+    def test_duda_apuesta_imposible(self):
+        historial = ((1, Apuesta(9, Pinta.SEXTO)),)
+        observacion = _observacion((Pinta.TREN,) * 5, (5, 5), historial)
+        visitas = buscar(
+            observacion, GeneradorAleatorio(3), presupuesto_ms=None, iteraciones=300
+        )
+        assert max(visitas, key=visitas.get) == DUDAR
+
+
+class TestAgenteMCTS:
+    def test_juega_acciones_validas(self):
+        gestor = GestorPartida(num_jugadores=3, generador=GeneradorAleatorio(4))
+        agente = AgenteMCTS(GeneradorAleatorio(5), presupuesto_ms=None, iteraciones=50)
+        for jugador in range(3):
+            accion = agente(gestor, jugador)
+            if accion["tipo"] != "apuesta":
+                break
+            assert ValidadorApuesta.es_valida(
+                gestor.ultima_apuesta, accion["apuesta"], 15
+            )
+            assert gestor.elegir_accion(jugador, accion)["valida"] is True
+
+    def test_sin_presupuesto_igual_elige_una_accion(self):
+        gestor = GestorPartida(num_jugadores=2, generador=GeneradorAleatorio(7))
+        agente = AgenteMCTS(GeneradorAleatorio(8), presupuesto_ms=0)
+        accion = agente(gestor, 0)
+        assert accion["tipo"] == "apuesta"
+        assert gestor.elegir_accion(0, accion)["valida"] is True
+
+    def test_paralelizacion_de_raiz(self):
+        historial = ((1, Apuesta(9, Pinta.SEXTO)),)
+        observacion = _observacion((Pinta.TREN,) * 5, (5, 5), historial)
+        with AgenteMCTS(
+            GeneradorAleatorio(6), presupuesto_ms=None, iteraciones=100, num_procesos=2
+        ) as agente:
+            assert agente.actuar(observacion) == {"tipo": "dudar"}
+            assert agente.actuar(observacion) == {"tipo": "dudar"}
+            assert agente._pool is not None
+        assert agente._pool is None
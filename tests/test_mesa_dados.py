@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import numpy as np
+
+from src.juego.dado import Dado, Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.mesa_dados import MesaDados
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+
+
+class TestMesaDados:
+    def test_arreglo_contiguo_con_forma_mesas_jugadores_dados(self):
+        mesa = MesaDados(num_mesas=4, jugadores_por_mesa=3)
+        assert mesa.valores.shape == (4, 3, 5)
+        assert mesa.valores.flags["C_CONTIGUOUS"]
+        assert mesa.valores.min() >= 1
+        assert mesa.valores.max() <= 6
+
+    def test_agitar_hace_una_sola_llamada_al_generador(self):
+        mesa = MesaDados(num_mesas=2, jugadores_por_mesa=2)
+        mesa._rng = Mock(wraps=mesa._rng)
+        mesa.agitar()
+        mesa._rng.integers.assert_called_once()
+        assert mesa._rng.integers.call_args.kwargs["size"] == (2, 2, 5)
+
+    def test_semilla_reproducible(self):
+        mesa1 = MesaDados(3, 2, generador=GeneradorAleatorio(semilla=7))
+        mesa2 = MesaDados(3, 2, generador=GeneradorAleatorio(semilla=7))
+        mesa1.agitar()
+        mesa2.agitar()
+        assert np.array_equal(mesa1.valores, mesa2.valores)
+
+    def test_conteos_ignoran_dados_fuera_de_juego(self):
+        mesa = MesaDados(num_mesas=1, jugadores_por_mesa=2)
+        mesa.valores[0, 0] = [1, 1, 3, 6, 6]
+        mesa.valores[0, 1] = [2, 2, 2, 2, 2]
+        mesa.cantidades[0, 1] = 2
+        conteos = mesa.conteos()
+        assert conteos[0, 0].tolist() == [2, 0, 1, 0, 0, 2]
+        assert conteos[0, 1].tolist() == [0, 2, 0, 0, 0, 0]
+
+
+class TestVistaCacho:
+    def test_vista_lee_la_fila_de_su_mesa(self):
+        mesa = MesaDados(num_mesas=2, jugadores_por_mesa=2)
+        mesa.valores[1, 0] = [1, 2, 3, 4, 5]
+        cacho = mesa.cacho(1, 0)
+        assert cacho.get_pintas_de_dados() is None
+        cacho.set_visible()
+        assert cacho.get_pintas_de_dados() == [
+            Pinta.AS,
+            Pinta.TONTO,
+            Pinta.TREN,
+            Pinta.CUADRA,
+            Pinta.QUINA,
+        ]
+
+    def test_eliminar_y_agregar_dado_respetan_limite(self):
+        mesa = MesaDados(num_mesas=1, jugadores_por_mesa=1)
+        cacho = mesa.cacho(0, 0)
+        cacho.agregar_dado()
+        assert cacho.get_cantidad_dados() == 5
+        cacho.eliminar_dado()
+        cacho.eliminar_dado()
+        assert cacho.get_cantidad_dados() == 3
+        cacho.agregar_dado()
+        assert cacho.get_cantidad_dados() == 4
+
+    def test_agregar_dado_existente_guarda_su_pinta(self):
+        mesa = MesaDados(num_mesas=1, jugadores_por_mesa=1)
+        cacho = mesa.cacho(0, 0)
+        cacho.eliminar_dado()
+        dado = Dado()
+        cacho.agregar_dado(dado)
+        cacho.set_visible()
+        assert cacho.get_pintas_de_dados()[-1] == dado.show()
+
+    def test_gestor_partida_acepta_vistas_de_mesa(self):
+        mesa = MesaDados(num_mesas=3, jugadores_por_mesa=2)
+        gestor = GestorPartida(num_jugadores=2, cachos=mesa.cachos(2))
+        gestor.quitar_dado(1)
+        assert mesa.cantidades[2].tolist() == [5, 4]
+        assert mesa.cantidades[0].tolist() == [5, 5]
+
+    def test_vista_cacho_con_visibilidad_por_observador(self):
+        mesa = MesaDados(1, 2, generador=GeneradorAleatorio(3))
+        vista = mesa.cacho(0, 1)
+        vista.mostrar_a(1)
+        assert vista.pintas_para(0) is None
+        assert len(vista.pintas_para(1)) == 5
+        assert sum(vista.conteo_para(1)) == 5
+        assert not vista.get_visibilidad()
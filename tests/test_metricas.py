@@ -0,0 +1,78 @@
+import json
+
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.servicios.metricas import Histograma, Metricas
+from src.simulacion.motor import jugar_partida
+from src.simulacion.politicas import PoliticaEsperanza
+
+
+def _sin_agitar():
+    pass
+
+
+class TestHistograma:
+    def test_buckets_y_percentil(self):
+        histograma = Histograma((1, 10, 100))
+        for valor in (0.5, 5, 5, 50, 500):
+            histograma.observar(valor)
+        assert histograma.buckets == [1, 2, 1, 1]
+        assert histograma.cantidad == 5
+        assert histograma.percentil(0.5) == 10
+        assert histograma.percentil(1.0) == float("inf")
+
+
+class TestMetricasGestor:
+    def test_sin_metricas_no_reemplaza_metodos(self):
+        gestor = GestorPartida(num_jugadores=2)
+        assert "elegir_accion" not in vars(gestor)
+        gestor.agitar_cachos = _sin_agitar
+        gestor.set_metricas(Metricas())
+        assert "elegir_accion" in vars(gestor)
+        assert "_contar" in vars(gestor.arbitro)
+        gestor.set_metricas(None)
+        assert "elegir_accion" not in vars(gestor)
+        assert "_contar" not in vars(gestor.arbitro)
+        # lo que ya estaba reemplazado en la instancia se conserva
+        assert gestor.agitar_cachos is _sin_agitar
+
+    def test_cuenta_acciones_y_mide_tiempos(self):
+        metricas = Metricas()
+        gestor = GestorPartida(num_jugadores=2, generador=GeneradorAleatorio(1))
+        gestor.set_metricas(metricas)
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(2, Pinta.TREN)})
+        gestor.elegir_accion(1, {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)})
+        gestor.elegir_accion(1, {"tipo": "dudar"})
+        contadores = metricas.instantanea()["contadores"]
+        assert contadores['acciones_total{tipo="apuesta"}'] == 2
+        assert contadores['acciones_total{tipo="dudar"}'] == 1
+        assert contadores["apuestas_invalidas_total"] == 1
+        assert sum(v for k, v in contadores.items() if "resultados" in k) == 1
+        histogramas = metricas.instantanea()["histogramas"]
+        assert histogramas['elegir_accion_segundos{tipo="apuesta"}']["cantidad"] == 2
+        for nombre in ("finalizar_ronda", "nueva_ronda", "agitar_cachos", "contar"):
+            assert histogramas[f"{nombre}_segundos"]["cantidad"] == 1
+        assert histogramas["regla_especial_segundos"]["cantidad"] == 3
+
+    def test_exportar(self):
+        metricas = Metricas()
+        generador = GeneradorAleatorio(2)
+        jugar_partida(
+            [PoliticaEsperanza(generador) for _ in range(3)],
+            generador,
+            dados_por_jugador=2,
+            metricas=metricas,
+        )
+        datos = json.loads(metricas.exportar_json())
+        acciones = datos["histogramas"]['elegir_accion_segundos{tipo="dudar"}']
+        texto = metricas.exportar_prometheus()
+        assert "# TYPE dudo_elegir_accion_segundos histogram" in texto
+        lineas = dict(linea.rsplit(" ", 1) for linea in texto.splitlines())
+        infinito = 'dudo_elegir_accion_segundos_bucket{tipo="dudar",le="+Inf"}'
+        assert int(lineas[infinito]) == acciones["cantidad"]
+        assert (
+            int(lineas['dudo_elegir_accion_segundos_count{tipo="dudar"}'])
+            == acciones["cantidad"]
+        )
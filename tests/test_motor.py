@@ -0,0 +1,45 @@
+import pytest
+
+from src.juego.dado import Pinta
+from src.juego.turnos import ANTIHORARIO
+from src.juego.validador_apuesta import Apuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import PartidaInvalidaError, jugar_partida
+from src.simulacion.politicas import PoliticaAleatoria, PoliticaEsperanza
+
+
+class TestMotor:
+    def test_juega_partida_completa_hasta_un_ganador(self):
+        generador = GeneradorAleatorio(semilla=5)
+        politicas = [PoliticaEsperanza(), PoliticaAleatoria(generador)]
+        resultado = jugar_partida(politicas, generador)
+        assert resultado.ganador in (0, 1)
+        assert resultado.rondas >= 5
+        assert resultado.turnos > 0
+
+    def test_misma_semilla_misma_partida(self):
+        resultados = []
+        for _ in range(2):
+            generador = GeneradorAleatorio(semilla=11)
+            politicas = [PoliticaAleatoria(generador) for _ in range(3)]
+            r = jugar_partida(politicas, generador)
+            resultados.append((r.ganador, r.rondas, r.turnos))
+        assert resultados[0] == resultados[1]
+
+    def test_dudar_sin_apuesta_es_invalido(self):
+        politicas = [lambda gestor, jugador: {"tipo": "dudar"}] * 2
+        with pytest.raises(PartidaInvalidaError):
+            jugar_partida(politicas, GeneradorAleatorio(semilla=1))
+
+    def test_sentido_antihorario(self):
+        turnos = []
+
+        def politica(gestor, jugador):
+            turnos.append(jugador)
+            if gestor.ultima_apuesta is None:
+                return {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)}
+            return {"tipo": "dudar"}
+
+        jugar_partida([politica] * 3, GeneradorAleatorio(4), 1, sentido=ANTIHORARIO)
+        # cada apuesta la responde el jugador a la derecha
+        assert turnos[1] == (turnos[0] - 1) % 3
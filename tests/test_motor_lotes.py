@@ -0,0 +1,189 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.diferencial import _accion_aleatoria
+from src.simulacion.motor_lotes import (
+    SIN_APUESTA,
+    PartidasLotes,
+    PoliticaAleatoriaLotes,
+    PoliticaEsperanzaLotes,
+    es_valida_lotes,
+    jugar_lotes,
+    subidas_minimas_lotes,
+    tabla_validas,
+)
+from src.simulacion.motor_rapido import (
+    DUDAR,
+    PartidaRapida,
+    es_valida,
+    politica_esperanza,
+    subidas_minimas,
+)
+
+
+def _partidas_en_curso(cantidad, num_jugadores, semilla):
+    """PartidaRapida en estados variados, avanzadas con acciones al azar."""
+    azar = random.Random(semilla)
+    partidas = []
+    while len(partidas) < cantidad:
+        partida = PartidaRapida(
+            num_jugadores, azar.randint(1, 5), GeneradorAleatorio(azar.random())
+        )
+        for _ in range(azar.randrange(200)):
+            if partida.hay_ganador():
+                break
+            jugador = partida.jugador_actual
+            partida.actuar(jugador, _accion_aleatoria(azar, partida, jugador))
+        if not partida.hay_ganador():
+            partidas.append(partida)
+    return partidas
+
+
+class TestValidacionLotes:
+    def test_es_valida_lotes_coincide_con_es_valida(self):
+        anteriores = np.arange(-1, 60)[:, np.newaxis]
+        nuevos = np.arange(-1, 60)[np.newaxis, :]
+        for dados in (0, 1, 2):
+            obtenido = es_valida_lotes(anteriores, nuevos, dados)
+            for i, anterior in enumerate(anteriores[:, 0].tolist()):
+                anterior = None if anterior == SIN_APUESTA else anterior
+                for j, nuevo in enumerate(nuevos[0].tolist()):
+                    assert obtenido[i, j] == es_valida(anterior, nuevo, dados)
+
+    def test_tabla_validas_coincide_con_es_valida(self):
+        tabla = tabla_validas(4)
+        for anterior in range(24):
+            for nuevo in range(24):
+                assert tabla[anterior, nuevo] == es_valida(anterior, nuevo, 2)
+        for nuevo in range(24):
+            assert tabla[24, nuevo] == es_valida(None, nuevo, 2)
+            assert tabla[25, nuevo] == es_valida(None, nuevo, 1)
+
+    def test_subidas_minimas_lotes_coinciden(self):
+        anteriores = np.arange(-1, 120)
+        for dados in (0, 1, 2, 5):
+            ordinales, validas = subidas_minimas_lotes(
+                anteriores, np.full(len(anteriores), dados)
+            )
+            for i, anterior in enumerate(anteriores.tolist()):
+                anterior = None if anterior == SIN_APUESTA else anterior
+                esperado = subidas_minimas(anterior, dados)
+                assert tuple(ordinales[i][validas[i]].tolist()) == esperado
+
+    def test_mascara_apuestas_sigue_las_reglas(self):
+        lote = PartidasLotes.desde_partidas(_partidas_en_curso(20, 3, 1))
+        observacion = lote.observar()
+        mascara = observacion.mascara_apuestas()
+        assert mascara.shape == (20, 3 * 5 * 6)
+        nuevos = np.arange(mascara.shape[1])
+        esperado = es_valida_lotes(
+            observacion.ultima_apuesta[:, np.newaxis],
+            nuevos,
+            observacion.cantidad_dados[:, np.newaxis],
+        )
+        assert (mascara == esperado).all()
+
+
+class TestPartidasLotes:
+    def test_reparte_dados_iniciales(self):
+        lote = PartidasLotes(50, 4, 3, GeneradorAleatorio(2))
+        assert (lote.conteos.sum(axis=2) == 3).all()
+        assert (lote.total_dados == 12).all()
+        assert ((lote.jugador_actual >= 0) & (lote.jugador_actual < 4)).all()
+        with pytest.raises(ValueError):
+            PartidasLotes(1, 2, 6)
+
+    def test_un_paso_coincide_con_partida_rapida(self):
+        azar = random.Random(3)
+        for num_jugadores in (2, 3, 6):
+            partidas = _partidas_en_curso(40, num_jugadores, num_jugadores)
+            lote = PartidasLotes.desde_partidas(partidas)
+            acciones = [
+                _accion_aleatoria(azar, partida, partida.jugador_actual)
+                for partida in partidas
+            ]
+            resultados = lote.actuar(acciones)
+            for i, (partida, accion) in enumerate(zip(partidas, acciones)):
+                ronda = partida.ronda_actual
+                assert resultados[i] == partida.actuar(partida.jugador_actual, accion)
+                assert lote.dados[i].tolist() == partida.dados
+                assert lote.dados_a_favor[i].tolist() == partida.dados_a_favor
+                assert lote.total_dados[i] == partida.total_dados
+                assert lote.jugador_actual[i] == partida.jugador_actual
+                assert lote.ronda_actual[i] == partida.ronda_actual
+                assert lote.ases_comodin[i] == partida.ases_comodin
+                ultima = partida.ultima_apuesta
+                assert lote.ultima_apuesta[i] == (
+                    SIN_APUESTA if ultima is None else ultima
+                )
+                if partida.ronda_actual == ronda:
+                    # Sin ronda nueva los dados no se vuelven a lanzar
+                    assert lote.conteos[i].tolist() == partida.conteos
+
+    def test_partidas_terminadas_no_cambian(self):
+        lote = PartidasLotes(2, 2, 1, GeneradorAleatorio(4))
+        lote.activos[0, 1] = False
+        lote.num_activos[0] = 1
+        antes = lote.conteos[0].copy()
+        resultados = lote.actuar([DUDAR, 6])
+        assert resultados.tolist() == [0, 1]
+        assert (lote.conteos[0] == antes).all()
+        assert lote.ganadores()[0] == 0
+
+    def test_dudar_sin_apuesta_es_error(self):
+        lote = PartidasLotes(3)
+        with pytest.raises(ValueError):
+            lote.actuar([DUDAR, 6, 6])
+
+
+class TestPoliticasLotes:
+    def test_esperanza_coincide_con_politica_rapida(self):
+        for num_jugadores in (2, 4):
+            partidas = _partidas_en_curso(60, num_jugadores, 10 + num_jugadores)
+            lote = PartidasLotes.desde_partidas(partidas)
+            acciones = PoliticaEsperanzaLotes().actuar(lote.observar())
+            esperado = [politica_esperanza(p, p.jugador_actual) for p in partidas]
+            assert acciones.tolist() == esperado
+
+    def test_aleatoria_solo_elige_acciones_legales(self):
+        lote = PartidasLotes.desde_partidas(_partidas_en_curso(50, 3, 5))
+        observacion = lote.observar()
+        acciones = PoliticaAleatoriaLotes(GeneradorAleatorio(1)).actuar(observacion)
+        mascara = observacion.mascara_apuestas()
+        for i, accion in enumerate(acciones.tolist()):
+            if 0 <= accion < mascara.shape[1]:
+                assert mascara[i, accion]
+            elif accion >= 0:
+                # Sobre la cota de la máscara solo queda el validador
+                assert es_valida_lotes(
+                    observacion.ultima_apuesta[i], accion, observacion.cantidad_dados[i]
+                )
+            else:
+                assert observacion.puede_dudar()[i]
+
+
+class TestJugarLotes:
+    def test_juega_todas_las_partidas_hasta_un_ganador(self):
+        politicas = [PoliticaEsperanzaLotes(), PoliticaAleatoriaLotes()] * 2
+        ganadores, rondas, turnos = jugar_lotes(politicas, 200, GeneradorAleatorio(6))
+        assert ((ganadores >= 0) & (ganadores < 4)).all()
+        assert (rondas >= 5).all() and (turnos > rondas).all()
+
+    def test_misma_semilla_mismas_partidas(self):
+        resultados = [
+            jugar_lotes([PoliticaEsperanzaLotes()] * 3, 100, GeneradorAleatorio(7))
+            for _ in range(2)
+        ]
+        for primero, segundo in zip(*resultados):
+            assert (primero == segundo).all()
+
+    def test_apuesta_invalida_es_error(self):
+        class SiempreUnAs:
+            def actuar(self, observacion):
+                return np.zeros(len(observacion.jugador), dtype=np.int64)
+
+        with pytest.raises(ValueError):
+            jugar_lotes([SiempreUnAs()] * 2, 10)
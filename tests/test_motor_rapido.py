@@ -0,0 +1,138 @@
+import pytest
+
+from src.juego.validador_apuesta import (
+    ValidadorApuesta,
+    apuesta_desde_ordinal,
+    ordinal,
+)
+from src.servicios.diario import CODIGO_RESULTADO
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion import motor_rapido, politicas
+from src.simulacion.diferencial import (
+    comparar_acciones,
+    comparar_politicas,
+    fuzz,
+    main,
+)
+from src.simulacion.motor_rapido import (
+    AS,
+    CALZAR,
+    DUDAR,
+    PartidaRapida,
+    es_valida,
+    jugar_partida_rapida,
+    politica_esperanza,
+    subidas_minimas,
+)
+
+
+class TestValidacion:
+    def test_es_valida_coincide_con_validador(self):
+        for anterior in range(60):
+            apuesta_anterior = apuesta_desde_ordinal(anterior)
+            for nuevo in range(60):
+                esperado = ValidadorApuesta.es_valida(
+                    apuesta_anterior, apuesta_desde_ordinal(nuevo)
+                )
+                assert es_valida(anterior, nuevo, 5) == esperado
+
+    def test_primera_apuesta_con_ases_solo_con_un_dado(self):
+        assert not es_valida(None, 6 + AS, 5)
+        assert es_valida(None, 6 + AS, 1)
+        assert not es_valida(None, 8, 0)
+
+    def test_subidas_minimas_coinciden_con_politicas(self):
+        for anterior in [None] + list(range(60)):
+            apuesta = None if anterior is None else apuesta_desde_ordinal(anterior)
+            for dados in (0, 1, 2, 5):
+                esperado = [
+                    ordinal(a) for a in politicas.subidas_minimas(apuesta, dados)
+                ]
+                assert list(subidas_minimas(anterior, dados)) == esperado
+
+
+class TestPartidaRapida:
+    def test_reparte_dados_iniciales(self):
+        partida = PartidaRapida(4, 3, GeneradorAleatorio(3))
+        assert [sum(conteo) for conteo in partida.conteos] == [3] * 4
+        assert sum(partida.mesa) == partida.total_dados == 12
+        with pytest.raises(ValueError):
+            PartidaRapida(2, 6)
+
+    def test_apuesta_invalida_no_cambia_el_turno(self):
+        partida = PartidaRapida(3, 5, GeneradorAleatorio(1))
+        assert partida.actuar(0, 6 + 3) == 1
+        assert partida.jugador_actual == 1
+        assert partida.actuar(1, 3) == 0
+        assert partida.jugador_actual == 1
+        assert partida.ultima_apuesta == 9
+
+    def test_dudar_quita_un_dado_y_parte_nueva_ronda(self):
+        partida = PartidaRapida(3, 5, GeneradorAleatorio(2))
+        partida.actuar(0, 119)  # veinte sextos, más dados que los de la mesa
+        resultado = partida.actuar(1, DUDAR)
+        assert resultado == CODIGO_RESULTADO["pierde_apostador"]
+        assert partida.dados == [4, 5, 5]
+        assert partida.jugador_actual == 0
+        assert partida.ronda_actual == 1
+        assert partida.ultima_apuesta is None
+
+    def test_calzar_con_cinco_dados_suma_dado_a_favor(self):
+        partida = PartidaRapida(2, 5, GeneradorAleatorio(4))
+        pinta = 3
+        cantidad = partida.contar(pinta)
+        partida.actuar(0, (cantidad - 1) * 6 + pinta)
+        assert partida.actuar(1, CALZAR) == CODIGO_RESULTADO["gana_calzador"]
+        assert partida.dados_a_favor == [0, 1]
+        assert partida.dados == [5, 5]
+
+    def test_dudar_sin_apuesta_es_error(self):
+        partida = PartidaRapida(2)
+        with pytest.raises(ValueError):
+            partida.actuar(0, DUDAR)
+
+    def test_siguiente_en_ambos_sentidos(self):
+        partida = PartidaRapida(5)
+        partida.activos = 0b10110
+        assert partida.siguiente(4) == 1
+        assert partida.siguiente(1) == 2
+        partida.sentido = -1
+        assert partida.siguiente(1) == 4
+        assert partida.siguiente(4) == 2
+
+
+class TestDiferencial:
+    def test_acciones_aleatorias_coinciden(self):
+        for semilla in range(15):
+            assert comparar_acciones(semilla, 2 + semilla % 5, 1 + semilla % 5) is None
+
+    def test_politicas_coinciden(self):
+        for semilla in range(5):
+            assert comparar_politicas(semilla, 4, 3) is None
+
+    def test_fuzz_varia_backends_y_mesas(self):
+        assert fuzz(10, semilla=7) == []
+
+    def test_main_informa_los_casos(self, capsys):
+        main(["--partidas", "3"])
+        assert "3 casos, 0 divergencias" in capsys.readouterr().out
+
+    def test_detecta_una_regla_distinta(self, monkeypatch):
+        monkeypatch.setattr(motor_rapido, "es_valida", lambda *_: True)
+        assert any(comparar_acciones(s, 3, 5) is not None for s in range(10))
+
+
+class TestJugarPartidaRapida:
+    def test_misma_semilla_misma_partida(self):
+        resultados = [
+            jugar_partida_rapida([politica_esperanza] * 3, GeneradorAleatorio(9))
+            for _ in range(2)
+        ]
+        assert resultados[0] == resultados[1]
+        ganador, rondas, turnos = resultados[0]
+        assert ganador in (0, 1, 2)
+        assert rondas >= 5 and turnos > rondas
+
+    def test_apuesta_invalida_es_error(self):
+        with pytest.raises(ValueError):
+            jugar_partida_rapida([lambda partida, jugador: 0] * 2)
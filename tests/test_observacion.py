@@ -0,0 +1,35 @@
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.observacion import construir_observacion
+from src.juego.validador_apuesta import Apuesta
+
+
+class TestObservacion:
+    def test_observacion_con_estado_de_la_mesa(self):
+        gestor = GestorPartida(num_jugadores=3)
+        gestor.quitar_dado(2)
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(2, Pinta.TREN)})
+        obs = construir_observacion(gestor, 1)
+        assert obs.jugador == 1
+        assert len(obs.pintas_propias) == 5
+        assert obs.dados_por_jugador == (5, 5, 4)
+        assert obs.cantidad_dados == 5
+        assert obs.total_dados == 14
+        assert obs.dados_ocultos == 9
+        assert obs.ultima_apuesta == Apuesta(2, Pinta.TREN)
+        assert obs.jugador_ultima_apuesta == 0
+        assert obs.historial == ((0, Apuesta(2, Pinta.TREN)),)
+        assert obs.ases_comodin is True
+
+    def test_historial_se_reinicia_con_la_ronda(self):
+        gestor = GestorPartida(num_jugadores=2)
+        gestor.elegir_accion(0, {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)})
+        gestor.nueva_ronda()
+        assert construir_observacion(gestor, 0).historial == ()
+
+    def test_observacion_no_cambia_la_visibilidad(self):
+        gestor = GestorPartida(num_jugadores=3)
+        obs = construir_observacion(gestor, 1)
+        assert obs.pintas_visibles[0] is None
+        assert obs.pintas_visibles[1] == obs.pintas_propias
+        assert not any(cacho.get_visibilidad() for cacho in gestor.cachos)
@@ -0,0 +1,33 @@
+from src.simulacion.motor import ResultadoPartida
+from src.simulacion.paralelo import ResultadoSimulacion, generadores_de_lotes, simular
+
+
+class TestParalelo:
+    def test_generadores_de_lotes_reproducibles_e_independientes(self):
+        primeros = [g.generar_entero(0, 10**9) for g in generadores_de_lotes(3, 4)]
+        segundos = [g.generar_entero(0, 10**9) for g in generadores_de_lotes(3, 4)]
+        assert primeros == segundos
+        assert len(set(primeros)) == 4
+
+    def test_combinar_resultados(self):
+        a = ResultadoSimulacion(2)
+        a.registrar(ResultadoPartida(0, 5, 20))
+        b = ResultadoSimulacion(2)
+        b.registrar(ResultadoPartida(1, 7, 30))
+        a.combinar(b)
+        assert a.partidas == 2
+        assert a.victorias == [1, 1]
+        assert a.rondas == 12
+        assert a.tasas_victoria() == [0.5, 0.5]
+
+    def test_resultado_no_depende_de_los_procesos(self):
+        nombres = ["esperanza", "aleatoria", "aleatoria"]
+        secuencial = simular(
+            nombres, 30, semilla_maestra=9, num_procesos=1, partidas_por_lote=7
+        )
+        paralelo = simular(
+            nombres, 30, semilla_maestra=9, num_procesos=2, partidas_por_lote=7
+        )
+        assert secuencial.partidas == paralelo.partidas == 30
+        assert secuencial.victorias == paralelo.victorias
+        assert secuencial.turnos == paralelo.turnos
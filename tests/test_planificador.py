@@ -0,0 +1,130 @@
+import pytest
+
+from src.juego.dado import Pinta
+from src.juego.observacion import Observacion
+from src.juego.validador_apuesta import Apuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.servicios.planificador import AnilloConsistente, Planificador, _ejecutar
+
+
+def _accion_remota(planificador, mesa, jugador):
+    """Abre con la apuesta mínima o duda, como un jugador remoto simple."""
+    observacion = planificador.observar(mesa, jugador)
+    if observacion.ultima_apuesta is None:
+        accion = {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TONTO)}
+    else:
+        accion = {"tipo": "dudar"}
+    return planificador.accion(mesa, jugador, accion)
+
+
+def _jugar_mesa_remota(planificador, mesa, migrar_en=None):
+    respuesta = planificador.crear_mesa(mesa, 2, 3, [None, "esperanza"])
+    respuestas = [respuesta]
+    while "ganador" not in respuesta:
+        if len(respuestas) == migrar_en:
+            destino = 1 - planificador.trabajador_de(mesa)
+            planificador.migrar(mesa, destino)
+            assert planificador.trabajador_de(mesa) == destino
+        respuesta = _accion_remota(planificador, mesa, respuesta["turno"])
+        respuestas.append(respuesta)
+    return respuestas
+
+
+class TestAnilloConsistente:
+    def test_agregar_un_nodo_mueve_pocas_llaves(self):
+        anillo = AnilloConsistente(range(4))
+        antes = {llave: anillo.nodo_de(llave) for llave in range(2000)}
+        assert set(antes.values()) == {0, 1, 2, 3}
+        anillo.agregar(4)
+        despues = {llave: anillo.nodo_de(llave) for llave in range(2000)}
+        movidas = [llave for llave in antes if antes[llave] != despues[llave]]
+        assert all(despues[llave] == 4 for llave in movidas)
+        assert 200 < len(movidas) < 700
+        anillo.quitar(4)
+        assert {llave: anillo.nodo_de(llave) for llave in range(2000)} == antes
+
+
+class TestPlanificador:
+    def test_resultados_no_dependen_de_los_trabajadores(self):
+        comandos = [("crear", f"m{i}", 3, 2, ["esperanza"] * 3) for i in range(30)]
+        ganadores = []
+        for num_trabajadores in (1, 3):
+            with Planificador(num_trabajadores, GeneradorAleatorio(5)) as planificador:
+                respuestas = planificador.ejecutar(comandos)
+                ganadores.append([r["ganador"] for r in respuestas])
+                assert planificador.ubicacion == {}
+                assert planificador.cargas == [0] * num_trabajadores
+        assert ganadores[0] == ganadores[1]
+
+    def test_jugador_remoto_y_errores(self):
+        with Planificador(2, GeneradorAleatorio(1)) as planificador:
+            respuesta = planificador.crear_mesa("m", 2, 3, [None, "esperanza"])
+            assert respuesta["turno"] == 0
+            observacion = planificador.observar("m", 0)
+            assert isinstance(observacion, Observacion)
+            assert len(observacion.pintas_propias) == 3
+            assert "error" in planificador.accion("m", 1, {"tipo": "dudar"})
+            assert "error" in planificador.accion("otra", 0, {"tipo": "dudar"})
+            respuesta = _accion_remota(planificador, "m", 0)
+            # el bot respondió en el mismo comando
+            assert respuesta["jugadas"][0][0] == 0
+            assert respuesta["jugadas"][1][0] == 1
+
+    def test_migrar_no_cambia_la_partida(self):
+        with Planificador(2, GeneradorAleatorio(7)) as planificador:
+            normal = _jugar_mesa_remota(planificador, "m")
+        with Planificador(2, GeneradorAleatorio(7)) as planificador:
+            migrada = _jugar_mesa_remota(planificador, "m", migrar_en=2)
+        assert migrada == normal
+
+    def test_limite_de_mesas_y_rebalanceo(self):
+        with Planificador(
+            3, GeneradorAleatorio(2), max_mesas_por_trabajador=4
+        ) as planificador:
+            turnos = {
+                f"m{i}": planificador.crear_mesa(f"m{i}")["turno"] for i in range(12)
+            }
+            assert planificador.cargas == [4, 4, 4]
+            for i in range(12):
+                planificador.migrar(f"m{i}", 0)
+            assert planificador.cargas == [12, 0, 0]
+            assert planificador.rebalancear() == 8
+            assert planificador.cargas == [4, 4, 4]
+            # las mesas siguen jugables después de migrarlas
+            for mesa, turno in turnos.items():
+                assert "error" not in _accion_remota(planificador, mesa, turno)
+
+    def test_comandos_con_errores_no_detienen_al_trabajador(self):
+        with Planificador(1, GeneradorAleatorio(3)) as planificador:
+            respuesta = planificador.crear_mesa("m", 2, 3, [None, "esperanza"])
+            turno = respuesta["turno"]
+            for accion in ({"tipo": "apuesta"}, {"tipo": "subir"}, None):
+                assert "error" in planificador.accion("m", turno, accion)
+            assert "error" in planificador.crear_mesa("otra", 2, 3, ["no_existe"] * 2)
+            assert planificador.ubicacion == {"m": 0}
+            assert planificador.cargas == [1]
+            assert "error" not in _accion_remota(planificador, "m", turno)
+
+    def test_error_de_un_bot_no_deja_la_mesa_a_medias(self):
+        mesas = {}
+        comando = ("crear", "m", 2, 3, [None, "esperanza"], GeneradorAleatorio(3))
+        turno = _ejecutar(mesas, comando)["turno"]
+        gestor = mesas["m"].gestor
+        antes = gestor.snapshot()
+
+        def bot_roto(gestor, jugador):
+            raise RuntimeError("bot roto")
+
+        mesas["m"].politicas[1] = bot_roto
+        accion = {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TONTO)}
+        with pytest.raises(RuntimeError):
+            _ejecutar(mesas, ("accion", "m", turno, accion))
+        assert gestor.snapshot() == antes
+        assert gestor.jugador_actual == turno
+
+    def test_cerrar_tolera_trabajadores_caidos(self):
+        planificador = Planificador(2, GeneradorAleatorio(4))
+        planificador._procesos[0].terminate()
+        planificador._procesos[0].join()
+        planificador.cerrar()
+        assert planificador.num_trabajadores == 0
@@ -0,0 +1,51 @@
+import pytest
+
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.politicas import (
+    Politica,
+    PoliticaAleatoria,
+    PoliticaEsperanza,
+    crear_politica,
+    subidas_minimas,
+)
+
+
+class TestPoliticas:
+    def test_subidas_minimas_sin_apuesta_no_abre_con_ases(self):
+        candidatas = subidas_minimas(None, cantidad_dados=5)
+        assert all(a.get_pinta() != Pinta.AS for a in candidatas)
+        assert all(a.get_cantidad() == 1 for a in candidatas)
+
+    def test_subidas_minimas_son_validas(self):
+        anterior = Apuesta(4, Pinta.CUADRA)
+        candidatas = subidas_minimas(anterior, cantidad_dados=5)
+        assert len(candidatas) == 4
+        assert all(ValidadorApuesta.es_valida(anterior, a) for a in candidatas)
+        ases = [a for a in candidatas if a.get_pinta() == Pinta.AS][0]
+        assert ases.get_cantidad() == 3
+
+    def test_politica_aleatoria_apuesta_si_no_hay_apuesta(self):
+        gestor = GestorPartida(num_jugadores=2)
+        politica = PoliticaAleatoria(GeneradorAleatorio(1), prob_dudar=1.0)
+        accion = politica(gestor, 0)
+        assert accion["tipo"] == "apuesta"
+        assert gestor.elegir_accion(0, accion)["valida"] is True
+
+    def test_politica_esperanza_duda_apuesta_imposible(self):
+        gestor = GestorPartida(num_jugadores=2)
+        gestor.ultima_apuesta = Apuesta(10, Pinta.SEXTO)
+        assert PoliticaEsperanza()(gestor, 1) == {"tipo": "dudar"}
+
+    def test_crear_politica_desconocida(self):
+        with pytest.raises(ValueError):
+            crear_politica("no_existe")
+
+    def test_politica_sin_actuar_no_se_puede_crear(self):
+        class SinActuar(Politica):
+            pass
+
+        with pytest.raises(TypeError):
+            SinActuar()
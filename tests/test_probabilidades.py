@@ -0,0 +1,69 @@
+from fractions import Fraction
+from math import isclose
+
+from src.juego.arbitro_ronda import ArbitroRonda
+from src.juego.dado import Pinta
+from src.juego.probabilidades import (
+    PROB_PINTA,
+    PROB_PINTA_CON_COMODIN,
+    CalculadoraProbabilidades,
+    prob_al_menos,
+    prob_exacta,
+    probabilidad_exito,
+    tabla_acumulada,
+    tabla_binomial,
+)
+from src.juego.validador_apuesta import Apuesta
+
+
+class TestProbabilidades:
+    def test_probabilidad_exito_segun_comodin(self):
+        assert probabilidad_exito(Pinta.TREN) == Fraction(1, 3)
+        assert probabilidad_exito(Pinta.TREN, ases_comodin=False) == Fraction(1, 6)
+        assert probabilidad_exito(Pinta.AS) == Fraction(1, 6)
+
+    def test_tabla_binomial_suma_uno_y_es_exacta(self):
+        tabla = tabla_binomial(3, PROB_PINTA)
+        assert isclose(sum(tabla), 1.0)
+        assert isclose(tabla[3], 1 / 216)
+        assert isclose(tabla[0], (5 / 6) ** 3)
+
+    def test_tabla_acumulada_es_cola_de_la_binomial(self):
+        acumulada = tabla_acumulada(4, PROB_PINTA_CON_COMODIN)
+        binomial = tabla_binomial(4, PROB_PINTA_CON_COMODIN)
+        for k in range(5):
+            assert isclose(acumulada[k], sum(binomial[k:]))
+        assert acumulada[5] == 0.0
+
+    def test_bordes_fuera_de_rango(self):
+        assert prob_al_menos(0, 3, PROB_PINTA) == 1.0
+        assert prob_al_menos(-2, 3, PROB_PINTA) == 1.0
+        assert prob_al_menos(4, 3, PROB_PINTA) == 0.0
+        assert prob_exacta(4, 3, PROB_PINTA) == 0.0
+        assert prob_exacta(-1, 3, PROB_PINTA) == 0.0
+
+    def test_tablas_se_memorizan(self):
+        tabla_binomial.cache_clear()
+        prob_exacta(1, 7, PROB_PINTA)
+        prob_exacta(2, 7, PROB_PINTA)
+        info = tabla_binomial.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_calculadora_descuenta_dados_propios(self):
+        calculadora = CalculadoraProbabilidades()
+        propias = [Pinta.TREN, Pinta.AS, Pinta.QUINA]
+        # Con comodín se ven 2 trenes, faltan 1 de 2 ocultos con p = 1/3
+        p = calculadora.prob_al_menos(propias, 2, Pinta.TREN, 3)
+        assert isclose(p, 1 - (2 / 3) ** 2)
+        p = calculadora.prob_exacta(propias, 2, Pinta.TREN, 2)
+        assert isclose(p, (2 / 3) ** 2)
+
+    def test_calculadora_usa_regla_del_arbitro(self):
+        arbitro = ArbitroRonda()
+        calculadora = CalculadoraProbabilidades(arbitro)
+        apuesta = Apuesta(1, Pinta.TREN)
+        assert calculadora.prob_duda_exitosa([Pinta.AS], 0, apuesta) == 0.0
+        arbitro.set_ases_comodin(False)
+        assert calculadora.prob_duda_exitosa([Pinta.AS], 0, apuesta) == 1.0
+        assert calculadora.prob_calzar_exitoso([Pinta.AS], 0, apuesta) == 0.0
@@ -0,0 +1,50 @@
+import pytest
+
+from src.rendimiento import CASOS, cargar, comparar, ejecutar, guardar, main, medir
+
+
+def _metricas(ops, bytes_por_op=0.0):
+    return {"ops_por_segundo": ops, "bytes_por_op": bytes_por_op, "pico_bytes": 0}
+
+
+class TestRendimiento:
+    def test_medir_reporta_metricas(self):
+        metricas = medir(lambda: [0] * 100, tiempo_minimo=0.01, repeticiones=2)
+        assert metricas["ops_por_segundo"] > 0
+        # cada lista retenida ocupa al menos sus 100 referencias
+        assert metricas["bytes_por_op"] >= 800
+        assert metricas["pico_bytes"] > 0
+
+    def test_todos_los_casos_se_ejecutan(self):
+        resultados = ejecutar(tiempo_minimo=0.001, repeticiones=1)
+        assert set(resultados) == set(CASOS)
+
+    def test_guardar_y_cargar(self, tmp_path):
+        ruta = tmp_path / "base.json"
+        resultados = {"a": _metricas(100.0)}
+        guardar(resultados, ruta)
+        assert cargar(ruta) == resultados
+
+    def test_comparar_detecta_regresiones(self):
+        base = {"a": _metricas(1000.0), "b": _metricas(1000.0, 100.0)}
+        assert comparar(base, {"a": _metricas(850.0)}, umbral=0.2) == []
+        assert len(comparar(base, {"a": _metricas(700.0)}, umbral=0.2)) == 1
+        # la memoria retenida también cuenta, salvo diferencias pequeñas
+        assert comparar(base, {"b": _metricas(1000.0, 150.0)}) == []
+        assert len(comparar(base, {"b": _metricas(1000.0, 400.0)})) == 1
+
+    def test_main_falla_con_regresion(self, tmp_path):
+        ruta = tmp_path / "base.json"
+        guardar({"dado.crear": _metricas(1e12)}, ruta)
+        argumentos = [
+            "--casos",
+            "dado.crear",
+            "--tiempo",
+            "0.01",
+            "--repeticiones",
+            "1",
+        ]
+        with pytest.raises(SystemExit):
+            main(argumentos + ["--comparar", str(ruta)])
+        main(argumentos + ["--guardar", str(ruta)])
+        main(argumentos + ["--comparar", str(ruta), "--umbral", "0.9"])
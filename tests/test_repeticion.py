@@ -0,0 +1,82 @@
+import pytest
+
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.juego.validador_apuesta import Apuesta
+from src.servicios import diario
+from src.servicios.diario import EscritorDiario, archivos_diario, leer_diario
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.motor import jugar_partida
+from src.simulacion.politicas import crear_politica
+from src.simulacion.repeticion import repetir_corpus, repetir_registros
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    base = tmp_path / "diario"
+    with EscritorDiario(base, max_bytes_archivo=20000) as escritor:
+        for generador in GeneradorAleatorio(3).spawn(40):
+            dados, politicas = generador.spawn(2)
+            jugar_partida(
+                [
+                    crear_politica("esperanza", politicas),
+                    crear_politica("aleatoria", politicas),
+                    crear_politica("esperanza", politicas),
+                ],
+                dados,
+                dados_por_jugador=3,
+                diario=escritor,
+            )
+    return base
+
+
+class TestRepeticion:
+    def test_repite_sin_divergencias(self, corpus):
+        resultado = repetir_registros(leer_diario(corpus))
+        assert resultado.partidas == 40
+        assert resultado.total_divergencias == 0
+        assert resultado.partidas_con_divergencias == 0
+
+    def test_detecta_un_resultado_alterado(self, corpus):
+        registros = list(leer_diario(corpus))
+        i = next(i for i, r in enumerate(registros) if r.tipo == diario.DUDA)
+        alterado = 1 - registros[i].detalle
+        registros[i] = registros[i]._replace(detalle=alterado)
+        resultado = repetir_registros(iter(registros))
+        assert resultado.partidas_con_divergencias == 1
+        divergencia = resultado.divergencias[0]
+        assert divergencia.tipo == diario.DUDA
+        assert divergencia.registrado == diario.RESULTADOS[alterado]
+
+    def test_variante_de_reglas_cambia_resultados(self, corpus):
+        resultado = repetir_registros(leer_diario(corpus), "sin_comodines")
+        assert resultado.partidas == 40
+        assert resultado.partidas_con_divergencias > 0
+
+    def test_corpus_en_paralelo_igual_que_secuencial(self, corpus):
+        assert len(archivos_diario(corpus)) > 1
+        secuencial = repetir_corpus(corpus, "ases_siempre_comodin", num_procesos=1)
+        paralelo = repetir_corpus(corpus, "ases_siempre_comodin", num_procesos=2)
+        assert paralelo.partidas == secuencial.partidas == 40
+        assert paralelo.eventos == secuencial.eventos
+        assert paralelo.total_divergencias == secuencial.total_divergencias
+
+    def test_repite_una_ronda_obligada(self, tmp_path):
+        base = tmp_path / "obligar"
+        with EscritorDiario(base) as escritor:
+            gestor = GestorPartida(
+                num_jugadores=2, dados_por_jugador=2, generador=GeneradorAleatorio(5)
+            )
+            gestor.set_diario(escritor)
+            apuesta = {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.TREN)}
+            gestor.elegir_accion(0, apuesta)
+            gestor.elegir_accion(1, {"tipo": "dudar"})
+            jugador = next(i for i in range(2) if gestor.puede_obligar(i))
+            assert gestor.obligar(jugador, abierta=True)
+            # en la ronda obligada se puede partir con ases
+            apuesta = {"tipo": "apuesta", "apuesta": Apuesta(1, Pinta.AS)}
+            assert gestor.elegir_accion(jugador, apuesta)["valida"]
+            gestor.elegir_accion(1 - jugador, {"tipo": "dudar"})
+        registros = list(leer_diario(base))
+        assert any(r.tipo == diario.OBLIGAR for r in registros)
+        assert repetir_registros(iter(registros)).total_divergencias == 0
@@ -0,0 +1,121 @@
+import asyncio
+import json
+
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.servicios.servidor import ServidorDudo
+
+
+async def _conectar(servidor):
+    return await asyncio.open_connection("127.0.0.1", servidor.puerto)
+
+
+def _enviar(writer, mensaje):
+    writer.write(json.dumps(mensaje).encode() + b"\n")
+
+
+async def _recibir(reader, evento=None):
+    while True:
+        mensaje = json.loads(await asyncio.wait_for(reader.readline(), 2))
+        if evento is None or mensaje["evento"] == evento:
+            return mensaje
+
+
+async def _jugador_simple(servidor, mesa, dados=1):
+    """Abre con 1 TONTO o duda, hasta que termine la partida."""
+    reader, writer = await _conectar(servidor)
+    _enviar(writer, {"tipo": "unirse", "mesa": mesa, "jugadores": 2, "dados": dados})
+    while True:
+        mensaje = await _recibir(reader)
+        if mensaje["evento"] == "fin":
+            writer.close()
+            return mensaje["ganador"]
+        if mensaje["evento"] == "turno":
+            if mensaje["ultima_apuesta"] is None:
+                _enviar(writer, {"tipo": "apuesta", "cantidad": 1, "pinta": 2})
+            else:
+                _enviar(writer, {"tipo": "dudar"})
+
+
+def _ejecutar(prueba, **opciones):
+    async def principal():
+        async with ServidorDudo(generador=GeneradorAleatorio(1), **opciones) as s:
+            return await prueba(s)
+
+    return asyncio.run(principal())
+
+
+class TestServidor:
+    def test_turnos_y_errores(self):
+        async def prueba(servidor):
+            clientes = [await _conectar(servidor) for _ in range(2)]
+            for asiento, (reader, writer) in enumerate(clientes):
+                _enviar(writer, {"tipo": "unirse", "mesa": "a", "jugadores": 2})
+                assert (await _recibir(reader))["asiento"] == asiento
+            turno = await _recibir(
+                clientes[servidor.mesas["a"].gestor.jugador_actual][0], "turno"
+            )
+            reader, writer = clientes[turno["jugador"]]
+            otro_reader, otro_writer = clientes[1 - turno["jugador"]]
+            assert len(turno["dados"]) == 5 and turno["ultima_apuesta"] is None
+            _enviar(otro_writer, {"tipo": "dudar"})
+            assert (await _recibir(otro_reader, "error"))["mensaje"] == "No es tu turno"
+            _enviar(writer, {"tipo": "dudar"})
+            assert "apuesta previa" in (await _recibir(reader, "error"))["mensaje"]
+            _enviar(writer, {"tipo": "apuesta", "cantidad": 2, "pinta": 3})
+            for r in (reader, otro_reader):
+                accion = await _recibir(r, "accion")
+                assert (accion["cantidad"], accion["pinta"]) == (2, 3)
+            siguiente = await _recibir(otro_reader, "turno")
+            assert siguiente["ultima_apuesta"] == [2, 3]
+            _enviar(otro_writer, {"tipo": "apuesta", "cantidad": 1, "pinta": 2})
+            assert (await _recibir(otro_reader, "error"))[
+                "mensaje"
+            ] == "Apuesta inválida"
+            for _, w in clientes:
+                w.close()
+
+        _ejecutar(prueba)
+
+    def test_plazo_vencido_juega_por_el_jugador(self):
+        async def prueba(servidor):
+            clientes = [await _conectar(servidor) for _ in range(2)]
+            for _, writer in clientes:
+                _enviar(writer, {"tipo": "unirse", "mesa": "b", "dados": 1})
+            acciones = []
+            while True:
+                mensaje = await _recibir(clientes[0][0])
+                if mensaje["evento"] == "accion":
+                    acciones.append(mensaje)
+                if mensaje["evento"] == "fin":
+                    break
+            assert [a["tipo"] for a in acciones] == ["apuesta", "dudar"]
+            assert all(a["por_tiempo"] for a in acciones)
+            assert servidor.mesas == {}
+
+        _ejecutar(prueba, tiempo_turno=0.02)
+
+    def test_desconexion_no_espera_el_plazo(self):
+        async def prueba(servidor):
+            reader, writer = await _conectar(servidor)
+            _enviar(writer, {"tipo": "unirse", "mesa": "c", "dados": 1})
+            jugador = asyncio.ensure_future(_jugador_simple(servidor, "c"))
+            await _recibir(reader, "inicio")
+            writer.close()
+            # el servidor juega por el asiento 0 sin esperar los 60 segundos
+            assert await asyncio.wait_for(jugador, 2) in (0, 1)
+
+        _ejecutar(prueba, tiempo_turno=60)
+
+    def test_muchas_mesas_concurrentes(self):
+        async def prueba(servidor):
+            ganadores = await asyncio.gather(
+                *[
+                    _jugador_simple(servidor, f"mesa{i // 2}", dados=2)
+                    for i in range(200)
+                ]
+            )
+            assert len(ganadores) == 200
+            assert servidor.partidas_terminadas == 100
+            assert servidor.mesas == {}
+
+        _ejecutar(prueba, tiempo_turno=5)
@@ -0,0 +1,60 @@
+from src.juego.dado import Pinta
+from src.juego.gestor_partida import GestorPartida
+from src.servicios.generador_aleatorio import GeneradorAleatorio
+from src.simulacion.politicas import PoliticaAleatoria, PoliticaEsperanza
+from src.simulacion.ratings import Elo
+from src.simulacion.torneo import Torneo, jugar_cruce
+
+
+class TestElo:
+    def test_ganador_sube_y_perdedor_baja(self):
+        elo = Elo()
+        elo.registrar_partida(["a", "b"], "a")
+        assert elo.rating("a") > 1500 > elo.rating("b")
+        assert elo.rating("a") + elo.rating("b") == 3000
+        assert elo.clasificacion()[0][0] == "a"
+
+    def test_mesa_de_varios_reparte_el_ajuste(self):
+        elo = Elo(k=30)
+        elo.registrar_partida(["a", "b", "c"], "a")
+        assert round(elo.rating("a") - 1500, 6) == 15.0
+        assert round(elo.rating("b") - 1500, 6) == -7.5
+        assert elo.partidas == {"a": 1, "b": 1, "c": 1}
+
+
+class TestAgentes:
+    def test_preguntar_jugada_usa_el_agente_del_asiento(self):
+        gestor = GestorPartida(num_jugadores=2)
+        assert gestor.preguntar_jugada(0) is None
+        gestor.asignar_agentes([PoliticaEsperanza(), PoliticaAleatoria()])
+        accion = gestor.preguntar_jugada(0)
+        assert accion["tipo"] == "apuesta"
+        assert accion["apuesta"].get_pinta() != Pinta.AS
+
+
+class TestTorneo:
+    def test_cruce_rota_asientos(self):
+        resultados = jugar_cruce(
+            ["a", "b"],
+            [PoliticaEsperanza, PoliticaAleatoria],
+            4,
+            GeneradorAleatorio(semilla=1),
+        )
+        assert [asientos for asientos, _ in resultados] == [
+            ("a", "b"),
+            ("b", "a"),
+            ("a", "b"),
+            ("b", "a"),
+        ]
+
+    def test_torneo_reproducible_y_paralelo(self):
+        torneo = Torneo(partidas_por_cruce=6, semilla=4, num_procesos=1)
+        torneo.registrar("otra_aleatoria", PoliticaAleatoria)
+        assert len(torneo.cruces()) == 3
+        secuencial = torneo.jugar()
+        torneo.num_procesos = 2
+        paralelo = torneo.jugar()
+        assert secuencial.elo.ratings == paralelo.elo.ratings
+        assert sum(secuencial.partidas.values()) == 3 * 6 * 2
+        assert secuencial.elo.clasificacion()[0][0] == "esperanza"
+        assert secuencial.tasa_victoria("esperanza") > 0.5
@@ -0,0 +1,58 @@
+import pytest
+
+from src.juego.estado_mesa import EstadoMesa
+from src.juego.gestor_partida import GestorPartida
+from src.juego.turnos import ANTIHORARIO, HORARIO, AnilloTurnos
+
+
+def _anillo(cantidad, sentido=HORARIO):
+    estado = EstadoMesa([5] * cantidad)
+    return estado, AnilloTurnos(estado, sentido)
+
+
+class TestAnilloTurnos:
+    def test_avanza_en_ambos_sentidos(self):
+        _, anillo = _anillo(4)
+        assert [anillo.avanzar() for _ in range(4)] == [1, 2, 3, 0]
+        anillo.set_sentido(ANTIHORARIO)
+        assert [anillo.avanzar() for _ in range(4)] == [3, 2, 1, 0]
+        with pytest.raises(ValueError):
+            anillo.set_sentido(0)
+
+    def test_quitar_salta_asientos_eliminados(self):
+        estado, anillo = _anillo(5)
+        for asiento in (1, 2):
+            estado.set_activo(asiento, False)
+            anillo.quitar(asiento)
+        assert anillo.siguiente(0) == 3
+        # desde un asiento eliminado se llega al siguiente activo
+        assert anillo.siguiente(1) == 3
+        anillo.set_sentido(ANTIHORARIO)
+        assert anillo.siguiente(3) == 0
+        assert anillo.siguiente(2) == 0
+
+    def test_sigue_cambios_de_activos_sin_quitar(self):
+        estado, anillo = _anillo(3)
+        estado.set_activo(1, False)
+        assert anillo.siguiente(0) == 2
+        estado.set_activo(1, True)
+        assert anillo.siguiente(0) == 1
+        estado.activos = 0b100
+        assert anillo.siguiente(2) == 2
+
+    def test_ronda_la_inicia_el_siguiente_si_el_perdedor_salio(self):
+        estado, anillo = _anillo(3, ANTIHORARIO)
+        assert anillo.iniciar_ronda(1) == 1
+        estado.set_activo(1, False)
+        assert anillo.iniciar_ronda(1) == 0
+
+
+class TestTurnosGestor:
+    def test_siguiente_jugador_omite_eliminados(self):
+        gestor = GestorPartida(num_jugadores=4, dados_por_jugador=1)
+        gestor.quitar_dado(2)
+        gestor.set_jugador_inicial(1)
+        assert gestor.siguiente_jugador() == 3
+        gestor.set_sentido(ANTIHORARIO)
+        assert gestor.siguiente_jugador() == 1
+        assert gestor.iniciar_ronda_con(2) == 1
@@ -1,7 +1,12 @@
 import pytest
 
 from src.juego.dado import Pinta
-from src.juego.validador_apuesta import Apuesta, ValidadorApuesta
+from src.juego.validador_apuesta import (
+    Apuesta,
+    ValidadorApuesta,
+    apuesta_desde_ordinal,
+    ordinal,
+)
 
 
 class TestValidadorApuesta:
@@ -89,3 +94,129 @@ class TestValidadorApuesta:
         """Test menor que mínimo, inválido"""
         nueva = Apuesta(4, Pinta.QUINA)  # 4 < 5
         assert not ValidadorApuesta.es_valida(anterior, nueva)
+
+    def test_ordinal_ida_y_vuelta(self):
+        """Test que el ordinal ordena por cantidad y luego por pinta"""
+        assert ordinal(Apuesta(1, Pinta.AS)) == 0
+        assert ordinal(Apuesta(1, Pinta.SEXTO)) == 5
+        assert ordinal(Apuesta(2, Pinta.AS)) == 6
+        for valor in range(30):
+            assert ordinal(apuesta_desde_ordinal(valor)) == valor
+
+    def test_tabla_coincide_con_es_valida(self):
+        """Test que la tabla de transiciones aplica las mismas reglas"""
+        total = 6
+        for anterior in range(total * 6):
+            apuesta_anterior = apuesta_desde_ordinal(anterior)
+            for nuevo in range(total * 6):
+                esperado = ValidadorApuesta.es_valida(
+                    apuesta_anterior, apuesta_desde_ordinal(nuevo)
+                )
+                assert (
+                    ValidadorApuesta.es_valida_ordinal(anterior, nuevo, total)
+                    == esperado
+                )
+
+    def test_es_valida_ordinal_primera_apuesta(self):
+        """Test de aperturas: no se parte con ases salvo con un dado"""
+        as_ = ordinal(Apuesta(2, Pinta.AS))
+        tren = ordinal(Apuesta(2, Pinta.TREN))
+        assert ValidadorApuesta.es_valida_ordinal(None, tren, 10)
+        assert not ValidadorApuesta.es_valida_ordinal(None, as_, 10)
+        assert ValidadorApuesta.es_valida_ordinal(None, as_, 10, cantidad_dados=1)
+        assert not ValidadorApuesta.es_valida_ordinal(None, tren, 10, cantidad_dados=0)
+        assert not ValidadorApuesta.es_valida_ordinal(None, 60, 10)
+
+    def test_es_valida_ordinal_anterior_fuera_de_tabla(self):
+        """Test de anteriores sobre la cota y negativos"""
+        sobre_cota = ordinal(Apuesta(14, Pinta.TREN))
+        assert ValidadorApuesta.es_valida_ordinal(
+            sobre_cota, ordinal(Apuesta(8, Pinta.AS)), 12
+        )
+        assert not ValidadorApuesta.es_valida_ordinal(
+            sobre_cota, ordinal(Apuesta(7, Pinta.AS)), 12
+        )
+        with pytest.raises(ValueError):
+            ValidadorApuesta.es_valida_ordinal(-1, 0, 12)
+
+    def test_siguientes_validas(self):
+        """Test que enumera las subidas legales desde la tabla"""
+        siguientes = list(
+            ValidadorApuesta.siguientes_validas(Apuesta(2, Pinta.AS), total_dados=5)
+        )
+        assert [(a.get_cantidad(), a.get_pinta()) for a in siguientes] == [
+            (2, Pinta.TONTO),
+            (2, Pinta.TREN),
+            (2, Pinta.CUADRA),
+            (2, Pinta.QUINA),
+            (2, Pinta.SEXTO),
+            (3, Pinta.AS),
+            (4, Pinta.AS),
+            (5, Pinta.AS),
+            (5, Pinta.TONTO),
+            (5, Pinta.TREN),
+            (5, Pinta.CUADRA),
+            (5, Pinta.QUINA),
+            (5, Pinta.SEXTO),
+        ]
+        for apuesta in siguientes:
+            assert ValidadorApuesta.es_valida(Apuesta(2, Pinta.AS), apuesta)
+
+    def test_siguientes_validas_aperturas_y_tope(self):
+        """Test de aperturas y de apuestas fuera de la tabla"""
+        aperturas = list(ValidadorApuesta.siguientes_validas(None, total_dados=2))
+        assert len(aperturas) == 10
+        assert all(a.get_pinta() != Pinta.AS for a in aperturas)
+        tope = Apuesta(2, Pinta.SEXTO)
+        siguientes = list(ValidadorApuesta.siguientes_validas(tope, total_dados=2))
+        assert [(a.get_cantidad(), a.get_pinta()) for a in siguientes] == [
+            (2, Pinta.AS)
+        ]
+        fuera = Apuesta(7, Pinta.TREN)
+        assert list(ValidadorApuesta.siguientes_validas(fuera, total_dados=2)) == []
+        sobre_cota = Apuesta(14, Pinta.TREN)
+        siguientes = list(
+            ValidadorApuesta.siguientes_validas(sobre_cota, total_dados=12)
+        )
+        assert siguientes == [Apuesta(8, Pinta.AS)]
+        assert ValidadorApuesta.es_valida(sobre_cota, Apuesta(8, Pinta.AS))
+
+
+class TestApuesta:
+    def test_apuesta_es_valor_inmutable(self):
+        """Test que una apuesta no se puede modificar"""
+        apuesta = Apuesta(2, Pinta.TREN)
+        with pytest.raises(AttributeError):
+            apuesta.cantidad = 3
+        with pytest.raises(AttributeError):
+            del apuesta._Apuesta__pinta
+        assert not hasattr(apuesta, "__dict__")
+
+    def test_igualdad_hash_y_orden(self):
+        """Test que apuestas iguales sirven como la misma llave"""
+        assert Apuesta(2, Pinta.TREN) == Apuesta(2, Pinta.TREN)
+        assert Apuesta(2, Pinta.TREN) != Apuesta(2, Pinta.CUADRA)
+        tabla = {Apuesta(2, Pinta.TREN): "visto"}
+        assert tabla[Apuesta(2, Pinta.TREN)] == "visto"
+        assert Apuesta(2, Pinta.SEXTO) < Apuesta(3, Pinta.AS)
+        assert Apuesta(3, Pinta.TONTO) > Apuesta(3, Pinta.AS)
+        assert sorted([Apuesta(3, Pinta.AS), Apuesta(1, Pinta.QUINA)]) == [
+            Apuesta(1, Pinta.QUINA),
+            Apuesta(3, Pinta.AS),
+        ]
+
+    def test_obtener_retorna_instancias_compartidas(self):
+        """Test del constructor que interna apuestas"""
+        assert Apuesta.obtener(4, Pinta.QUINA) is Apuesta.obtener(4, Pinta.QUINA)
+        assert apuesta_desde_ordinal(9) is Apuesta.obtener(2, Pinta.CUADRA)
+        with pytest.raises(ValueError):
+            Apuesta.obtener(0, Pinta.TREN)
+
+    def test_apuesta_se_puede_serializar(self):
+        """Test que pickle y copy respetan la inmutabilidad"""
+        import copy
+        import pickle
+
+        apuesta = Apuesta.obtener(3, Pinta.SEXTO)
+        assert pickle.loads(pickle.dumps(apuesta)) is apuesta
+        assert copy.deepcopy(Apuesta(5, Pinta.TREN)) == Apuesta(5, Pinta.TREN)